@@ -7,6 +7,9 @@ import json
 from datetime import datetime
 from typing import Dict, List, Any
 import logging
+from waits import WaitStrategy
+from page_profile import PageProfile
+from table_extract import AIRPORTAL_SCHEDULE_TABLE, extract_records, parse_operating_days
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -15,22 +18,25 @@ class AirportalCrawler:
     def __init__(self):
         self.base_url = "https://www.airportal.go.kr/life/airinfo/RbHanFrmMain.jsp"
         self.schedule_data = {}
+        self.waits = WaitStrategy()
+        self.profile = PageProfile()
         
     async def get_all_schedules(self) -> Dict[str, Any]:
         """모든 한국 공항의 항공편 스케줄을 크롤링"""
         async with async_playwright() as p:
             browser = await p.chromium.launch(headless=True)
-            page = await browser.new_page()
+            page = await browser.new_page(**self.profile.context_options())
+            await self.profile.apply(page)
             
             try:
                 # 메인 페이지 접속
-                await page.goto(self.base_url)
-                await page.wait_for_load_state('networkidle')
+                await page.goto(self.base_url, wait_until='domcontentloaded')
                 
                 # 항공기 스케줄 조회 탭으로 이동
-                schedule_tab = await page.wait_for_selector('a:has-text("항공기스케줄조회")', timeout=10000)
+                schedule_tab = await self.waits.for_selector(
+                    page, 'a:has-text("항공기스케줄조회")', state='visible', label="schedule-tab"
+                )
                 await schedule_tab.click()
-                await page.wait_for_load_state('networkidle')
                 
                 # 모든 공항 리스트 가져오기
                 airports = await self._get_airport_list(page)
@@ -62,6 +68,7 @@ class AirportalCrawler:
                 raise
             finally:
                 await browser.close()
+                logger.info(f"Page resources: {self.profile.stats.snapshot()}")
                 
         return self.schedule_data
     
@@ -70,7 +77,7 @@ class AirportalCrawler:
         airports = {}
         
         # 출발공항 선택 드롭다운
-        await page.wait_for_selector('select[name="depArr"]')
+        await self.waits.for_selector(page, 'select[name="depArr"]', label="airport-select")
         
         # JavaScript로 모든 공항 옵션 가져오기
         airport_options = await page.evaluate('''
@@ -103,42 +110,35 @@ class AirportalCrawler:
             # 공항 선택
             await page.select_option('select[name="depArr"]', airport_code)
             
-            # 조회 버튼 클릭
-            search_button = await page.wait_for_selector('a[href*="go_search"]', timeout=5000)
-            await search_button.click()
+            # 조회 버튼 클릭 후 결과 테이블 행 안정화 대기
+            search_button = await self.waits.for_selector(
+                page, 'a[href*="go_search"]', timeout=5000, label="search-button"
+            )
+            await self.waits.for_results(
+                page, search_button.click, 'table.schedule_table tbody tr'
+            )
             
-            # 결과 대기
-            await page.wait_for_load_state('networkidle')
-            await asyncio.sleep(2)
+            # 스케줄 테이블을 한 번에 추출
+            records = await extract_records(
+                page, 'table.schedule_table tbody tr', AIRPORTAL_SCHEDULE_TABLE
+            )
             
-            # 스케줄 테이블 파싱
-            schedule_rows = await page.query_selector_all('table.schedule_table tbody tr')
-            
-            for row in schedule_rows:
-                try:
-                    # 각 행의 데이터 추출
-                    cells = await row.query_selector_all('td')
-                    if len(cells) < 7:
-                        continue
-                    
-                    flight_info = {
-                        "airline": await cells[0].inner_text(),
-                        "flightNo": await cells[1].inner_text(),
-                        "destination": await cells[2].inner_text() if direction == 'departure' else airport_code,
-                        "origin": airport_code if direction == 'departure' else await cells[2].inner_text(),
-                        "departureTime": await cells[3].inner_text(),
-                        "arrivalTime": await cells[4].inner_text(),
-                        "aircraft": await cells[5].inner_text(),
-                        "days": await self._parse_operation_days(cells[6])
-                    }
-                    
-                    # 유효한 항공편만 추가
-                    if flight_info["flightNo"] and flight_info["destination"]:
-                        flights.append(flight_info)
-                        
-                except Exception as e:
-                    logger.warning(f"Error parsing flight row: {e}")
-                    continue
+            for record in records:
+                other_airport = record.pop("destination")
+                flight_info = {
+                    "airline": record["airline"],
+                    "flightNo": record["flightNo"],
+                    "destination": other_airport if direction == 'departure' else airport_code,
+                    "origin": airport_code if direction == 'departure' else other_airport,
+                    "departureTime": record["departureTime"],
+                    "arrivalTime": record["arrivalTime"],
+                    "aircraft": record["aircraft"],
+                    "days": self._parse_operation_days(record["days"])
+                }
+                
+                # 유효한 항공편만 추가
+                if flight_info["flightNo"] and flight_info["destination"]:
+                    flights.append(flight_info)
             
             # 다음 페이지가 있으면 계속 크롤링
             next_button = await page.query_selector('a.next_page')
@@ -151,27 +151,9 @@ class AirportalCrawler:
             
         return flights
     
-    async def _parse_operation_days(self, days_cell) -> Dict[str, bool]:
+    def _parse_operation_days(self, days_text: str) -> Dict[str, bool]:
         """운항 요일 파싱"""
-        days_text = await days_cell.inner_text()
-        
-        # 요일 매핑
-        day_map = {
-            '월': 'mon', '화': 'tue', '수': 'wed', 
-            '목': 'thu', '금': 'fri', '토': 'sat', '일': 'sun'
-        }
-        
-        days = {
-            'mon': False, 'tue': False, 'wed': False,
-            'thu': False, 'fri': False, 'sat': False, 'sun': False
-        }
-        
-        # 운항 요일 체크
-        for kor_day, eng_day in day_map.items():
-            if kor_day in days_text:
-                days[eng_day] = True
-                
-        return days
+        return parse_operating_days(days_text)
     
     def save_to_file(self, filename: str = "korean_flight_schedules.json"):
         """크롤링 결과를 파일로 저장"""
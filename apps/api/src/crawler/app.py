@@ -2,7 +2,8 @@
 """
 항공편 크롤링 및 API 서버
 - 1일 1회: 전체 공항 스케줄 크롤링
-- 10분마다: 실시간 출도착 현황 크롤링
+- 실시간 출도착 현황: 공항별 변경률에 따라 2~30분 간격으로 크롤링
+- 실시간 변경분은 SSE(/api/live/stream) / WebSocket(/ws/live)으로 구독자에게 푸시
 - FastAPI로 간단한 REST API 제공
 """
 
@@ -11,18 +12,30 @@ import asyncio
 import logging
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
 
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import FastAPI, HTTPException, Query, Request, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, FileResponse
+from fastapi.responses import StreamingResponse
 import uvicorn
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
 from apscheduler.triggers.interval import IntervalTrigger
 
 from scraper import AirportScraper
+from browser_manager import BrowserManager
 from storage import Storage
+from response_cache import ResponseCache
+from single_flight import SingleFlight
+from crawl_queue import CrawlQueue, CrawlJobError, PRIORITY_LIVE, PRIORITY_SCHEDULE
+from live_diff import count_changes, diff_live_status
+from live_polling import AdaptiveLivePoller
+from live_broadcast import LiveBroadcaster, parse_codes
+from flight_record import Flight
+from timetable import RouteTimetable
+from schedule_query import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, page_response, wants_page
+from export_stream import EXPORT_KINDS, ExportError, export_response, parse_range
+from excel_ingest import ExcelFormatError, compare_schedules, load_schedules
 from config import settings
 
 # 로깅 설정
@@ -45,9 +58,24 @@ app.add_middleware(
 )
 
 # 전역 변수
+browser_manager: Optional[BrowserManager] = None
 scraper: Optional[AirportScraper] = None
 storage: Optional[Storage] = None
 scheduler: Optional[AsyncIOScheduler] = None
+crawl_queue: Optional[CrawlQueue] = None
+live_poller: Optional[AdaptiveLivePoller] = None
+
+# 직렬화된 JSON 응답 캐시 (공항 데이터가 바뀔 때만 해당 키 무효화)
+response_cache = ResponseCache()
+
+# 스케줄 페이지 조회용 공항별 (데이터 버전, 시간표, 응답 머리) (스케줄이 바뀐 공항만 다시 생성)
+schedule_timetables: Dict[str, Tuple[str, RouteTimetable, Dict]] = {}
+
+# 실시간 변경분 구독자 (SSE / WebSocket)
+live_broadcaster = LiveBroadcaster()
+
+# 크롤링 작업 (종류별로 동시에 하나만 실행, 수동 트리거와 정기 실행이 합쳐짐)
+crawl_jobs = SingleFlight()
 
 # 크롤링 상태
 crawl_status = {
@@ -55,121 +83,258 @@ crawl_status = {
     "last_live_crawl": None,
     "last_schedule_status": "pending",
     "last_live_status": "pending",
-    "failed_airports": []
+    "failed_airports": [],
+    "last_schedule_resources": None,
+    "last_excel_ingest": None,
+    "last_live_resources": None
 }
 
 
+# 정상 스케줄로 보는 최소 항공편 수
+MIN_SCHEDULE_FLIGHTS = 10
+
+
+async def crawl_airport_schedule(airport_code: str):
+    """단일 공항 스케줄 크롤링 (큐 작업, 실패하면 예외를 던져 재시도)"""
+    logger.info(f"Crawling schedule for {airport_code}")
+    
+    # 스케줄 크롤링
+    schedule_data = await scraper.crawl_schedule(airport_code)
+    
+    if not schedule_data or len(schedule_data.get("flights", [])) < MIN_SCHEDULE_FLIGHTS:
+        raise CrawlJobError(f"Insufficient data for {airport_code}")
+    
+    save_airport_schedule(airport_code, schedule_data)
+
+
+def save_airport_schedule(airport_code: str, schedule_data: Dict):
+    """공항 스케줄 저장 (변경이 없으면 확인 시각만 갱신)"""
+    if storage.save_schedule(airport_code, schedule_data):
+        response_cache.invalidate(("schedule", airport_code))
+        schedule_timetables.pop(airport_code, None)
+        logger.info(f"Saved {len(schedule_data['flights'])} flights for {airport_code}")
+    else:
+        logger.info(f"Schedule unchanged for {airport_code}")
+
+
+async def crawl_airport_live_status(airport_code: str):
+    """단일 공항 실시간 현황 크롤링 (큐 작업, 실패하면 예외를 던져 재시도)"""
+    logger.info(f"Crawling live status for {airport_code}")
+    
+    # 실시간 현황 크롤링
+    live_data = await scraper.crawl_live_status(airport_code)
+    
+    if not live_data:
+        raise CrawlJobError(f"No live data for {airport_code}")
+    
+    # 이전 결과 대비 바뀐 항공편 수로 이 공항의 다음 조회 간격 조정
+    previous = storage.db.get_live_status(airport_code)
+    diff = diff_live_status(previous, live_data)
+    changes = count_changes(diff)
+    live_poller.record(airport_code, changes)
+    
+    # 데이터 저장 (변경이 없으면 확인 시각만 갱신)
+    if storage.save_live_status(airport_code, live_data):
+        response_cache.invalidate(("live", airport_code))
+        logger.info(f"Saved live status for {airport_code}")
+    else:
+        logger.info(f"Live status unchanged for {airport_code}")
+    crawl_status["last_live_crawl"] = datetime.now().isoformat()
+    
+    # 바뀐 항공편만 구독자에게 푸시
+    if changes:
+        live_broadcaster.publish(airport_code, diff, crawl_status["last_live_crawl"])
+
+
+async def ingest_excel_schedules() -> List[str]:
+    """항공포털 Excel 한 파일로 전체 공항 스케줄 반영 (검증을 통과해 저장한 공항 목록 반환)
+    
+    - 매일 EXCEL_VERIFY_AIRPORTS개 공항(돌아가며)은 직접 크롤링해 Excel 결과와 비교하고, 다르거나
+      검증 크롤링이 하나도 성공하지 못하면 Excel 전체를 쓰지 않음
+    - 나머지 공항은 저장된 스케줄과 (편명, 출발시간) 일치율이 EXCEL_MIN_MATCH 이상일 때만 사용
+    - 저장된 스케줄이 없는 공항, Excel에 없는 공항은 기존처럼 페이지 크롤링
+    """
+    excel_path = await scraper.download_excel()
+    if not excel_path:
+        return []
+    
+    try:
+        if not settings.EXCEL_SCHEDULE_SOURCE:
+            return []
+        schedules, stats = await asyncio.to_thread(load_schedules, excel_path, settings.AIRPORTS)
+        candidates = [
+            code for code, schedule in schedules.items()
+            if len(schedule["flights"]) >= MIN_SCHEDULE_FLIGHTS
+        ]
+        report = {"file": excel_path.name, **stats, "airports": {}, "verified": {}}
+        crawl_status["last_excel_ingest"] = report
+        
+        # 직접 크롤링한 결과와 비교 (공항은 날짜별로 돌아가며 선택)
+        references = {}
+        offset = datetime.now().toordinal()
+        verify = [
+            candidates[(offset + i) % len(candidates)]
+            for i in range(min(settings.EXCEL_VERIFY_AIRPORTS, len(candidates)))
+        ]
+        for airport_code in verify:
+            try:
+                scraped = await asyncio.wait_for(scraper.crawl_schedule(airport_code), settings.CRAWL_JOB_TIMEOUT)
+            except asyncio.TimeoutError:
+                logger.warning(f"Excel verification crawl timed out for {airport_code}")
+                continue
+            except Exception as e:
+                logger.warning(f"Excel verification crawl failed for {airport_code}: {str(e)}")
+                continue
+            result = compare_schedules(schedules[airport_code], scraped, settings.EXCEL_MIN_MATCH)
+            report["verified"][airport_code] = result
+            if not result["ok"]:
+                logger.warning(f"Excel schedule does not match crawl for {airport_code}: {result}")
+                return []
+            references[airport_code] = scraped
+        if not references:
+            # 저장된 스케줄이 이전 Excel에서 온 것일 수 있으므로 DB 비교만으로는 받아들이지 않음
+            logger.warning("Excel schedule rejected: no verification crawl succeeded")
+            return []
+        
+        accepted = []
+        for airport_code in candidates:
+            reference = references.get(airport_code) or storage.db.get_schedule(airport_code)
+            result = compare_schedules(schedules[airport_code], reference, settings.EXCEL_MIN_MATCH)
+            report["airports"][airport_code] = result
+            if result["ok"]:
+                save_airport_schedule(airport_code, schedules[airport_code])
+                accepted.append(airport_code)
+        logger.info(f"Excel schedule used for {len(accepted)}/{len(settings.AIRPORTS)} airports")
+        return accepted
+    
+    except ExcelFormatError as e:
+        logger.error(f"Unreadable Excel schedule: {str(e)}")
+        return []
+    finally:
+        storage.archive_excel(excel_path)
+
+
 async def crawl_all_schedules():
     """전체 공항 스케줄 크롤링 (1일 1회)"""
     global crawl_status
     logger.info("Starting daily schedule crawl")
     crawl_status["last_schedule_status"] = "running"
     crawl_status["failed_airports"] = []
+    resources_before = browser_manager.profile.stats.snapshot()
     
     try:
-        await scraper.init_browser()
-        
-        for airport_code in settings.AIRPORTS:
-            try:
-                logger.info(f"Crawling schedule for {airport_code}")
-                
-                # 스케줄 크롤링
-                schedule_data = await scraper.crawl_schedule(airport_code)
-                
-                if schedule_data and len(schedule_data.get("flights", [])) >= 10:
-                    # 데이터 저장
-                    storage.save_schedule(airport_code, schedule_data)
-                    logger.info(f"Saved {len(schedule_data['flights'])} flights for {airport_code}")
-                else:
-                    logger.warning(f"Insufficient data for {airport_code}")
-                    crawl_status["failed_airports"].append(airport_code)
-                
-                # 요청 간 대기
-                await asyncio.sleep(1.0)
-                
-            except Exception as e:
-                logger.error(f"Failed to crawl {airport_code}: {str(e)}")
-                crawl_status["failed_airports"].append(airport_code)
-        
-        # Excel 다운로드 시도
+        # Excel 한 번 내려받아 검증을 통과한 공항은 페이지 조회 생략
         try:
-            excel_path = await scraper.download_excel()
-            if excel_path:
-                storage.archive_excel(excel_path)
-                logger.info("Excel file downloaded and archived")
+            excel_airports = await ingest_excel_schedules()
         except Exception as e:
-            logger.error(f"Failed to download Excel: {str(e)}")
+            logger.error(f"Failed to ingest Excel: {str(e)}")
+            excel_airports = []
+        
+        # 나머지 공항별 작업을 큐에 넣고 재시도까지 끝날 때까지 대기 (실시간 작업이 먼저 실행됨)
+        jobs = crawl_queue.enqueue_many(
+            "schedule", [code for code in settings.AIRPORTS if code not in excel_airports],
+            PRIORITY_SCHEDULE, settings.SCHEDULE_JOB_DEADLINE
+        )
+        results = await crawl_queue.wait(jobs)
+        crawl_status["failed_airports"] = [
+            job.airport for job in jobs if results[job.key] != "done"
+        ]
         
         crawl_status["last_schedule_crawl"] = datetime.now().isoformat()
+        crawl_status["last_schedule_resources"] = browser_manager.profile.stats.since(resources_before)
         crawl_status["last_schedule_status"] = "success" if not crawl_status["failed_airports"] else "partial"
         
     except Exception as e:
         logger.error(f"Schedule crawl failed: {str(e)}")
         crawl_status["last_schedule_status"] = "failed"
-    finally:
-        await scraper.close_browser()
+
+
+async def run_schedule_crawl():
+    """전체 스케줄 크롤링 (이미 실행 중이면 그 작업을 기다림)"""
+    await crawl_jobs.run("schedule", crawl_all_schedules)
+
+
+async def poll_due_live_status():
+    """조회 시각이 된 공항만 실시간 현황 작업으로 추가 (1분마다 확인, 간격은 공항별로 조정)"""
+    due = live_poller.due()
+    if not due:
+        return
+    intervals = live_poller.intervals()
+    for airport_code in due:
+        # 기한은 그 공항의 다음 조회 시각까지
+        crawl_queue.enqueue("live", airport_code, PRIORITY_LIVE, intervals[airport_code] * 60)
 
 
 async def crawl_live_status():
-    """실시간 출도착 현황 크롤링 (10분마다)"""
+    """전체 공항 실시간 출도착 현황 크롤링 (수동 트리거)"""
     global crawl_status
     logger.info("Starting live status crawl")
     crawl_status["last_live_status"] = "running"
+    resources_before = browser_manager.profile.stats.snapshot()
     
     try:
-        await scraper.init_browser()
-        
-        for airport_code in settings.AIRPORTS:
-            try:
-                logger.info(f"Crawling live status for {airport_code}")
-                
-                # 실시간 현황 크롤링
-                live_data = await scraper.crawl_live_status(airport_code)
-                
-                if live_data:
-                    # 데이터 저장
-                    storage.save_live_status(airport_code, live_data)
-                    logger.info(f"Saved live status for {airport_code}")
-                
-                # 요청 간 대기
-                await asyncio.sleep(0.5)
-                
-            except Exception as e:
-                logger.error(f"Failed to crawl live status for {airport_code}: {str(e)}")
+        # 공항별 작업을 우선순위 높게 큐에 넣고 대기 (기한은 다음 주기까지)
+        jobs = crawl_queue.enqueue_many(
+            "live", settings.AIRPORTS, PRIORITY_LIVE, settings.LIVE_JOB_DEADLINE
+        )
+        results = await crawl_queue.wait(jobs)
+        failed = [job.airport for job in jobs if results[job.key] != "done"]
         
         crawl_status["last_live_crawl"] = datetime.now().isoformat()
-        crawl_status["last_live_status"] = "success"
+        crawl_status["last_live_resources"] = browser_manager.profile.stats.since(resources_before)
+        crawl_status["last_live_status"] = "success" if not failed else "partial"
         
     except Exception as e:
         logger.error(f"Live crawl failed: {str(e)}")
         crawl_status["last_live_status"] = "failed"
-    finally:
-        await scraper.close_browser()
 
 
 @app.on_event("startup")
 async def startup_event():
     """앱 시작 시 초기화"""
-    global scraper, storage, scheduler
+    global browser_manager, scraper, storage, scheduler, crawl_queue, live_poller
     
-    # 초기화
-    scraper = AirportScraper()
+    # 초기화 (브라우저는 앱 수명 동안 유지하고 작업 간에 공유)
+    browser_manager = BrowserManager()
+    scraper = AirportScraper(browser_manager)
     storage = Storage()
     scheduler = AsyncIOScheduler()
     
+    # 크롤링 작업 큐 (이전 실행에서 남은 작업이 있으면 이어서 실행)
+    crawl_queue = CrawlQueue(
+        {"schedule": crawl_airport_schedule, "live": crawl_airport_live_status},
+        state_path=Path(settings.CRAWL_QUEUE_STATE),
+        workers=settings.CRAWL_CONCURRENCY,
+        priority_workers=settings.CRAWL_PRIORITY_WORKERS,
+        max_retry=settings.MAX_RETRY,
+        timeout=settings.CRAWL_JOB_TIMEOUT,
+        base_delay=settings.CRAWL_RETRY_BASE_DELAY,
+        max_delay=settings.CRAWL_RETRY_MAX_DELAY
+    )
+    crawl_queue.start()
+    
+    live_poller = AdaptiveLivePoller(
+        settings.AIRPORTS,
+        base_interval=settings.LIVE_BASE_INTERVAL,
+        min_interval=settings.LIVE_MIN_INTERVAL,
+        max_interval=settings.LIVE_MAX_INTERVAL,
+        target_changes=settings.LIVE_TARGET_CHANGES,
+        state_path=Path(settings.LIVE_POLL_STATE)
+    )
+    
     # 스케줄 작업 등록
     # 1일 1회 (오전 3시)
     scheduler.add_job(
-        crawl_all_schedules,
+        run_schedule_crawl,
         CronTrigger(hour=3, minute=0),
         id="daily_schedule",
         replace_existing=True
     )
     
-    # 10분마다
+    # 실시간 현황: 1분마다 조회 시각이 된 공항만 크롤링 (공항/시간대별 변경률로 간격 조정)
     scheduler.add_job(
-        crawl_live_status,
-        IntervalTrigger(minutes=10),
+        poll_due_live_status,
+        IntervalTrigger(minutes=1),
         id="live_status",
         replace_existing=True
     )
@@ -177,7 +342,7 @@ async def startup_event():
     # 개발 모드에서는 즉시 실행
     if settings.DEV_MODE:
         scheduler.add_job(
-            crawl_all_schedules,
+            run_schedule_crawl,
             id="initial_schedule",
             replace_existing=True
         )
@@ -191,8 +356,13 @@ async def shutdown_event():
     """앱 종료 시 정리"""
     if scheduler:
         scheduler.shutdown()
+    live_broadcaster.close_all()
+    if crawl_queue:
+        await crawl_queue.stop()
     if scraper:
-        await scraper.close_browser()
+        await scraper.http.aclose()
+    if browser_manager:
+        await browser_manager.stop()
 
 
 @app.get("/health")
@@ -201,48 +371,241 @@ async def health_check():
     return {
         "status": "healthy",
         "crawl_status": crawl_status,
+        "crawl_queue": crawl_queue.snapshot() if crawl_queue else {},
+        "live_polling": live_poller.snapshot() if live_poller else {},
+        "browser": browser_manager.stats() if browser_manager else {},
+        "wait_stats": scraper.waits.stats.summary() if scraper else {},
+        "response_cache": response_cache.stats,
+        "live_stream": {"subscribers": live_broadcaster.subscribers, **live_broadcaster.stats},
         "timestamp": datetime.now().isoformat()
     }
 
 
+def _schedule_timetable(airport: str) -> Tuple[str, RouteTimetable, Dict]:
+    """공항 스케줄 시간표 (DB에서 한 번 읽어 두고 새 스케줄이 저장될 때까지 재사용)"""
+    entry = schedule_timetables.get(airport)
+    if entry is None:
+        data = storage.db.get_schedule(airport)
+        if data is None:
+            raise HTTPException(status_code=404, detail="Schedule data not found")
+        timetable = RouteTimetable(Flight.from_dict(flight) for flight in data.get("flights", []))
+        header = {"airport": airport, "crawledAt": data.get("crawledAt"), "totalFlights": len(timetable)}
+        entry = (str(data.get("crawledAt")), timetable, header)
+        schedule_timetables[airport] = entry
+    return entry
+
+
 @app.get("/api/schedule/{airport}")
 async def get_schedule(
     airport: str,
-    format: str = Query("json", regex="^(json|csv)$")
+    request: Request,
+    format: str = Query("json", regex="^(json|csv|ndjson|xlsx)$"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="페이지 크기"),
+    cursor: Optional[str] = Query(None, description="이전 응답의 nextCursor"),
+    fields: Optional[str] = Query(None, description="응답 필드 (쉼표 구분, 예: flightNo,destination,departureTime)"),
+    airline: Optional[str] = Query(None, description="항공사 (쉼표 구분)"),
+    destination: Optional[str] = Query(None, description="도착 공항 (쉼표 구분)"),
+    departure_from: Optional[str] = Query(None, alias="departureFrom", description="출발시간 HH:MM 이후"),
+    departure_to: Optional[str] = Query(None, alias="departureTo", description="출발시간 HH:MM 이전"),
+    weekday: Optional[str] = Query(None, description="운항 요일 (mon~sun)")
 ):
-    """공항별 스케줄 조회"""
+    """공항별 스케줄 조회 (JSON은 조회 조건이 있으면 필터/필드 선택/커서 페이지, csv/ndjson/xlsx는 내보내기)"""
     airport = airport.upper()
     if airport not in settings.AIRPORTS:
         raise HTTPException(status_code=404, detail="Airport not found")
     
-    file_path = storage.get_latest_schedule_path(airport, format)
-    if not file_path or not file_path.exists():
-        raise HTTPException(status_code=404, detail="Schedule data not found")
+    if format == "json" and wants_page(request.query_params):
+        version, timetable, header = _schedule_timetable(airport)
+        return page_response(
+            timetable, version, header,
+            limit=limit, cursor=cursor, fields=fields, airline=airline, destination=destination,
+            departure_from=departure_from, departure_to=departure_to, weekday=weekday
+        )
     
     if format == "json":
-        return JSONResponse(content=storage.load_json(file_path))
-    else:
-        return FileResponse(file_path, media_type="text/csv")
+        def build():
+            data = storage.db.get_schedule(airport)
+            if data is None:
+                raise HTTPException(status_code=404, detail="Schedule data not found")
+            return data
+        return response_cache.respond(request, ("schedule", airport), build)
+    
+    if not storage.db.has_airport(airport):
+        raise HTTPException(status_code=404, detail="Schedule data not found")
+    return export_response(storage, "schedule", [airport], format)
+
+
+def _subscription_codes(airports: Optional[str], flights: Optional[str]):
+    """구독 대상 검증 (공항은 지원 공항만, 공항/편명 중 하나는 필요)"""
+    airport_codes = [code.strip().upper() for code in parse_codes(airports)]
+    unknown = [code for code in airport_codes if code not in settings.AIRPORTS]
+    if unknown:
+        raise HTTPException(status_code=404, detail=f"Airport not found: {','.join(unknown)}")
+    flight_codes = parse_codes(flights)
+    if not airport_codes and not flight_codes:
+        raise HTTPException(status_code=400, detail="airports or flights is required")
+    return airport_codes, flight_codes
+
+
+@app.get("/api/live/stream")
+async def stream_live_status(
+    request: Request,
+    airports: Optional[str] = Query(None, description="구독 공항 (쉼표 구분)"),
+    flights: Optional[str] = Query(None, description="구독 편명 (쉼표 구분)")
+):
+    """실시간 변경분 스트림 (Server-Sent Events)"""
+    airport_codes, flight_codes = _subscription_codes(airports, flights)
+    subscription = live_broadcaster.subscribe(airport_codes, flight_codes)
+    
+    async def events():
+        try:
+            yield b"retry: 5000\n\n"
+            while not subscription.closed or not subscription.queue.empty():
+                message = await subscription.next(settings.LIVE_STREAM_KEEPALIVE)
+                if await request.is_disconnected():
+                    break
+                if message is None:
+                    # 프록시가 유휴 연결을 끊지 않도록 주석 줄 전송
+                    yield b": ping\n\n"
+                    continue
+                yield message.frame
+                if message.closing:
+                    break
+        finally:
+            live_broadcaster.unsubscribe(subscription)
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+def _code_list(request: Dict, key: str) -> List[str]:
+    """구독 메시지의 코드 목록 (문자열 배열이 아니면 ValueError)"""
+    codes = request.get(key, [])
+    if not isinstance(codes, list) or not all(isinstance(code, str) for code in codes):
+        raise ValueError(f"{key} must be a list of strings")
+    return codes
+
+
+@app.websocket("/ws/live")
+async def live_websocket(websocket: WebSocket, airports: Optional[str] = None, flights: Optional[str] = None):
+    """실시간 변경분 WebSocket
+    연결 후 {"action": "subscribe"|"unsubscribe", "airports": [...], "flights": [...]} 메시지로 구독 변경"""
+    await websocket.accept()
+    airport_codes = [code for code in parse_codes(airports) if code.strip().upper() in settings.AIRPORTS]
+    subscription = live_broadcaster.subscribe(airport_codes, parse_codes(flights))
+    
+    async def send():
+        while True:
+            message = await subscription.next(settings.LIVE_STREAM_KEEPALIVE)
+            if message is None:
+                await websocket.send_text('{"type":"ping"}')
+                continue
+            await websocket.send_text(message.text)
+            if message.closing:
+                return
+    
+    async def receive():
+        while True:
+            try:
+                request = await websocket.receive_json()
+                action = request.get("action")
+                if action not in ("subscribe", "unsubscribe"):
+                    raise ValueError(f"unknown action: {action}")
+                airport_codes = _code_list(request, "airports")
+                flight_codes = _code_list(request, "flights")
+                live_broadcaster.update(
+                    subscription,
+                    [code for code in airport_codes if code.strip().upper() in settings.AIRPORTS],
+                    flight_codes,
+                    remove=action == "unsubscribe"
+                )
+            except (ValueError, AttributeError, TypeError) as e:
+                await websocket.send_json({"type": "error", "detail": str(e)})
+                continue
+            await websocket.send_json({
+                "type": "subscribed",
+                "airports": sorted(subscription.airports),
+                "flights": sorted(subscription.flights)
+            })
+    
+    tasks = [asyncio.create_task(send()), asyncio.create_task(receive())]
+    try:
+        await websocket.send_json({
+            "type": "subscribed",
+            "airports": sorted(subscription.airports),
+            "flights": sorted(subscription.flights)
+        })
+        # 어느 한쪽이 끝나면 (연결 종료 / 느린 구독자 정리) 연결 종료
+        done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            if task.exception() and not isinstance(task.exception(), WebSocketDisconnect):
+                logger.warning(f"Live websocket closed: {str(task.exception())}")
+    except WebSocketDisconnect:
+        pass
+    finally:
+        # 취소되어도 구독은 남지 않도록 await 전에 해제
+        live_broadcaster.unsubscribe(subscription)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        try:
+            await websocket.close()
+        except RuntimeError:
+            pass
 
 
 @app.get("/api/live/{airport}")
 async def get_live_status(
     airport: str,
-    format: str = Query("json", regex="^(json|csv)$")
+    request: Request,
+    format: str = Query("json", regex="^(json|csv|ndjson|xlsx)$")
 ):
-    """공항별 실시간 현황 조회"""
+    """공항별 실시간 현황 조회 (csv/ndjson/xlsx는 내보내기)"""
     airport = airport.upper()
     if airport not in settings.AIRPORTS:
         raise HTTPException(status_code=404, detail="Airport not found")
     
-    file_path = storage.get_latest_live_path(airport, format)
-    if not file_path or not file_path.exists():
+    if format == "json":
+        def build():
+            data = storage.db.get_live_status(airport)
+            if data is None:
+                raise HTTPException(status_code=404, detail="Live data not found")
+            return data
+        return response_cache.respond(request, ("live", airport), build)
+    
+    if not storage.db.has_live_status(airport):
         raise HTTPException(status_code=404, detail="Live data not found")
+    return export_response(storage, "live", [airport], format)
+
+
+@app.get("/api/export/{kind}")
+async def export_data(
+    kind: str,
+    format: str = Query("csv", regex="^(csv|ndjson|xlsx)$"),
+    airports: Optional[str] = Query(None, description="공항 (쉼표 구분, 생략하면 전체)"),
+    start: Optional[str] = Query(None, alias="from", description="기간 시작 (YYYY-MM-DD 또는 ISO 시각, 생략하면 최신 데이터)"),
+    end: Optional[str] = Query(None, alias="to", description="기간 끝 (생략하면 현재까지)")
+):
+    """여러 공항 / 기간 내보내기 (스트리밍, 기간 조회는 컬럼 아카이브에서)"""
+    if kind not in EXPORT_KINDS:
+        raise HTTPException(status_code=404, detail="Unknown export kind")
     
-    if format == "json":
-        return JSONResponse(content=storage.load_json(file_path))
-    else:
-        return FileResponse(file_path, media_type="text/csv")
+    airport_codes = [code.strip().upper() for code in parse_codes(airports)] or list(settings.AIRPORTS)
+    unknown = [code for code in airport_codes if code not in settings.AIRPORTS]
+    if unknown:
+        raise HTTPException(status_code=404, detail=f"Airport not found: {','.join(unknown)}")
+    
+    try:
+        start_at, end_at = parse_range(start, end)
+    except ExportError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if start_at is not None and storage.columnar is None:
+        raise HTTPException(status_code=400, detail="Date range export requires ARCHIVE_FORMAT=columnar")
+    
+    return export_response(storage, kind, airport_codes, format, start_at, end_at)
 
 
 @app.get("/api/airports")
@@ -256,16 +619,33 @@ async def get_airports():
 
 @app.post("/api/crawl/schedule")
 async def trigger_schedule_crawl():
-    """수동으로 스케줄 크롤링 트리거"""
-    asyncio.create_task(crawl_all_schedules())
-    return {"message": "Schedule crawl started"}
+    """수동으로 스케줄 크롤링 트리거 (실행 중이면 그 작업을 반환)"""
+    job = crawl_jobs.start("schedule", crawl_all_schedules)
+    message = "Schedule crawl started" if job.waiters == 1 else "Schedule crawl already running"
+    return {"message": message, **job.to_dict()}
 
 
 @app.post("/api/crawl/live")
 async def trigger_live_crawl():
-    """수동으로 실시간 크롤링 트리거"""
-    asyncio.create_task(crawl_live_status())
-    return {"message": "Live crawl started"}
+    """수동으로 실시간 크롤링 트리거 (실행 중이면 그 작업을 반환)"""
+    job = crawl_jobs.start("live", crawl_live_status)
+    message = "Live crawl started" if job.waiters == 1 else "Live crawl already running"
+    return {"message": message, **job.to_dict()}
+
+
+@app.get("/api/crawl/jobs")
+async def list_crawl_jobs():
+    """최근 크롤링 작업 목록"""
+    return {"jobs": crawl_jobs.jobs(), "stats": crawl_jobs.stats}
+
+
+@app.get("/api/crawl/jobs/{job_id}")
+async def get_crawl_job(job_id: str):
+    """크롤링 작업 상태"""
+    job = crawl_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.to_dict()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+항공편 메모리 사용량 비교 (dict vs Flight 레코드)
+korean_flight_schedules.json의 항공편을 N배로 복제해 tracemalloc으로 측정
+
+사용법: python bench_flight_memory.py [복제 배수]
+"""
+
+import gc
+import json
+import sys
+import tracemalloc
+from pathlib import Path
+
+from flight_record import Flight
+
+
+def load_flights(scale: int):
+    """원본 항공편을 편명만 바꿔 scale배로 복제한 JSON 문자열 목록"""
+    data_file = Path(__file__).parent / "korean_flight_schedules.json"
+    with open(data_file, 'r', encoding='utf-8') as f:
+        schedules = json.load(f)
+
+    flights = [flight for data in schedules.values() for flight in data.get('flights', [])]
+    return [
+        json.dumps({**flight, "flightNo": f"{flight['flightNo']}{i}"}, ensure_ascii=False)
+        for i in range(scale)
+        for flight in flights
+    ]
+
+
+def measure(build, raw_flights):
+    gc.collect()
+    tracemalloc.start()
+    result = build(raw_flights)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current
+
+
+def main():
+    scale = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    raw_flights = load_flights(scale)
+    print(f"항공편 {len(raw_flights):,}건")
+
+    dicts, dict_bytes = measure(lambda raws: [json.loads(raw) for raw in raws], raw_flights)
+    records, record_bytes = measure(
+        lambda raws: [Flight.from_dict(json.loads(raw)) for raw in raws], raw_flights
+    )
+
+    # 무손실 변환 확인
+    assert all(record.to_dict() == flight for record, flight in zip(records, dicts))
+
+    print(f"dict:   {dict_bytes / 1024 / 1024:8.1f} MB ({dict_bytes / len(dicts):6.0f} B/편)")
+    print(f"Flight: {record_bytes / 1024 / 1024:8.1f} MB ({record_bytes / len(records):6.0f} B/편)")
+    print(f"감소:   {(1 - record_bytes / dict_bytes) * 100:8.1f} %")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+환승 경로 탐색 속도 측정
+korean_flight_schedules.json의 항공편을 시간을 조금씩 옮겨 N배로 복제해 전국 규모 스케줄을 만들고
+날짜별 연결 배열 생성 시간과 공항 쌍별 탐색 시간을 측정
+
+사용법: python bench_itinerary.py [복제 배수]
+"""
+
+import json
+import sys
+import time
+from datetime import date
+from pathlib import Path
+
+from flight_record import compact_schedule, format_minutes, parse_minutes
+from itinerary import search
+from route_index import RouteIndex
+
+QUERIES = (("PUS", "HND"), ("CJU", "NRT"), ("PUS", "LAX"), ("CJU", "BKK"), ("GMP", "KIX"))
+
+
+def shifted(value: str, minutes: int) -> str:
+    parsed = parse_minutes(value)
+    if type(parsed) is not int:
+        return value
+    return format_minutes((parsed + minutes) % 1440)
+
+
+def load_index(scale: int) -> RouteIndex:
+    data_file = Path(__file__).parent / "korean_flight_schedules.json"
+    with open(data_file, 'r', encoding='utf-8') as f:
+        schedules = json.load(f)
+
+    # 복제본마다 7분씩 옮겨 하루 전체에 퍼지도록
+    return RouteIndex({
+        code: compact_schedule({
+            **data,
+            "flights": [
+                {
+                    **flight,
+                    "flightNo": f"{flight['flightNo']}{i}",
+                    "departureTime": shifted(flight["departureTime"], i * 7),
+                    "arrivalTime": shifted(flight["arrivalTime"], i * 7)
+                }
+                for i in range(scale)
+                for flight in data["flights"]
+            ]
+        })
+        for code, data in schedules.items()
+    }).warm()
+
+
+def main():
+    scale = int(sys.argv[1]) if len(sys.argv) > 1 else 30
+    index = load_index(scale)
+    day = date.today()
+
+    began = time.perf_counter()
+    graph = index.connections(day)
+    build_ms = (time.perf_counter() - began) * 1000
+    print(f"항공편 {index.statistics['total_flights']:,}건 -> 연결 {len(graph):,}개 (2일), 생성 {build_ms:.1f} ms")
+
+    repeat = 20
+    for origin, destination in QUERIES:
+        for max_legs in (2, 3):
+            began = time.perf_counter()
+            for _ in range(repeat):
+                itineraries = search(graph, origin, destination, max_legs)
+            elapsed = (time.perf_counter() - began) / repeat * 1000
+            print(f"{origin}->{destination} 최대 {max_legs}구간: {elapsed:7.2f} ms ({len(itineraries)}개 경로)")
+
+
+if __name__ == "__main__":
+    main()
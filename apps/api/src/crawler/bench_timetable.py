@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+노선 시간표 일자별 전개 속도 측정
+korean_flight_schedules.json의 항공편을 한 노선에 N배로 복제해 기간별 전개 시간을 측정
+
+사용법: python bench_timetable.py [복제 배수]
+"""
+
+import json
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+from flight_record import Flight
+from timetable import RouteTimetable
+
+
+def load_route(scale: int) -> RouteTimetable:
+    data_file = Path(__file__).parent / "korean_flight_schedules.json"
+    with open(data_file, 'r', encoding='utf-8') as f:
+        schedules = json.load(f)
+
+    flights = [flight for data in schedules.values() for flight in data.get('flights', [])]
+    return RouteTimetable(
+        Flight.from_dict({**flight, "flightNo": f"{flight['flightNo']}{i}"})
+        for i in range(scale)
+        for flight in flights
+    )
+
+
+def measure(route: RouteTimetable, days: int, repeat: int = 20) -> float:
+    start = date.today()
+    end = start + timedelta(days=days - 1)
+    began = time.perf_counter()
+    for _ in range(repeat):
+        route.expand(start, end)
+    return (time.perf_counter() - began) / repeat * 1000
+
+
+def main():
+    scale = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    route = load_route(scale)
+    print(f"노선 항공편 {len(route):,}건")
+
+    for days in (1, 14, 31, 92):
+        total = len(route.expand(date.today(), date.today() + timedelta(days=days - 1)))
+        print(f"{days:3d}일: {measure(route, days):8.2f} ms ({total:,}편)")
+
+
+if __name__ == "__main__":
+    main()
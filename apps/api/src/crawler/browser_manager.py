@@ -0,0 +1,147 @@
+"""
+장기 실행 브라우저 관리자
+앱 수명 동안 Chromium 하나를 유지하고 컨텍스트 풀을 관리
+- 브라우저 비정상 종료 시 자동 재시작
+- 컨텍스트당 N 페이지 사용 후 재생성하여 메모리 상한 유지
+- 여러 작업이 동시에 사용해도 서로의 브라우저를 닫지 않음
+"""
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional
+
+from playwright.async_api import async_playwright, Browser, BrowserContext, Page, Playwright
+from config import settings
+from page_profile import PageProfile
+
+logger = logging.getLogger(__name__)
+
+
+class _ContextSlot:
+    """풀의 한 자리 (컨텍스트 1개 + 페이지 1개)"""
+
+    def __init__(self):
+        self.context: Optional[BrowserContext] = None
+        self.page: Optional[Page] = None
+        self.generation = -1
+        self.uses = 0
+
+
+class BrowserManager:
+    def __init__(self, pool_size: Optional[int] = None, recycle_after: Optional[int] = None):
+        self.pool_size = max(1, pool_size or settings.CRAWL_CONCURRENCY)
+        self.recycle_after = recycle_after or settings.BROWSER_RECYCLE_PAGES
+
+        self.playwright: Optional[Playwright] = None
+        self.browser: Optional[Browser] = None
+        self.profile = PageProfile()
+
+        # 브라우저를 새로 띄울 때마다 증가 (이전 세대 컨텍스트는 재생성)
+        self._generation = 0
+        self._lock = asyncio.Lock()
+        self._slots: asyncio.Queue = asyncio.Queue()
+        for _ in range(self.pool_size):
+            self._slots.put_nowait(_ContextSlot())
+
+        self.stats_counters = {
+            "browser_launches": 0,
+            "browser_restarts": 0,
+            "context_recycles": 0,
+            "pages_served": 0
+        }
+
+    async def start(self):
+        """Playwright 시작 및 브라우저 실행 (이미 실행 중이면 무시)"""
+        await self._ensure_browser()
+
+    async def stop(self):
+        """앱 종료 시에만 호출"""
+        async with self._lock:
+            if self.browser:
+                try:
+                    await self.browser.close()
+                except Exception as e:
+                    logger.warning(f"Failed to close browser: {str(e)}")
+            if self.playwright:
+                await self.playwright.stop()
+            self.browser = None
+            self.playwright = None
+            self._generation += 1
+
+    def is_healthy(self) -> bool:
+        return self.browser is not None and self.browser.is_connected()
+
+    async def _ensure_browser(self) -> Browser:
+        """브라우저 상태 확인 후 필요하면 (재)실행"""
+        async with self._lock:
+            if self.is_healthy():
+                return self.browser
+
+            if self.browser is not None:
+                logger.warning("Browser disconnected, restarting")
+                self.stats_counters["browser_restarts"] += 1
+
+            if self.playwright is None:
+                self.playwright = await async_playwright().start()
+
+            self.browser = await self.playwright.chromium.launch(
+                headless=settings.HEADLESS,
+                args=['--no-sandbox', '--disable-setuid-sandbox']
+            )
+            self._generation += 1
+            self.stats_counters["browser_launches"] += 1
+            logger.info(f"Browser launched (generation {self._generation})")
+            return self.browser
+
+    async def _close_slot(self, slot: _ContextSlot):
+        if slot.context is not None:
+            try:
+                await slot.context.close()
+            except Exception as e:
+                logger.debug(f"Failed to close context: {str(e)}")
+        slot.context = None
+        slot.page = None
+        slot.uses = 0
+
+    async def _prepare_slot(self, slot: _ContextSlot):
+        """슬롯의 컨텍스트가 현재 브라우저 세대이고 재사용 한도 이내인지 확인"""
+        browser = await self._ensure_browser()
+
+        expired = slot.uses >= self.recycle_after
+        stale = slot.generation != self._generation
+        crashed = slot.page is not None and slot.page.is_closed()
+
+        if slot.context is not None and not (expired or stale or crashed):
+            return
+
+        if slot.context is not None and expired:
+            self.stats_counters["context_recycles"] += 1
+        await self._close_slot(slot)
+
+        slot.context = await browser.new_context(**self.profile.context_options())
+        await self.profile.apply(slot.context)
+        slot.page = await slot.context.new_page()
+        slot.generation = self._generation
+
+    @asynccontextmanager
+    async def page(self) -> AsyncIterator[Page]:
+        """풀에서 페이지를 빌려 사용 후 반납 (풀 크기만큼만 동시 실행)"""
+        slot = await self._slots.get()
+        try:
+            await self._prepare_slot(slot)
+            slot.uses += 1
+            self.stats_counters["pages_served"] += 1
+            yield slot.page
+        finally:
+            self._slots.put_nowait(slot)
+
+    def stats(self) -> Dict:
+        return {
+            **self.stats_counters,
+            "healthy": self.is_healthy(),
+            "pool_size": self.pool_size,
+            "idle_slots": self._slots.qsize(),
+            "recycle_after": self.recycle_after,
+            "resources": self.profile.stats.snapshot()
+        }
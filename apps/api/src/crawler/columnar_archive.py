@@ -0,0 +1,210 @@
+"""
+컬럼 기반 압축 아카이브
+크롤링 결과를 공항/일자별 파티션에 컬럼 단위로 추가 기록하고 필요한 컬럼만 읽어 조회
+
+디렉토리 구조:
+    archive/columns/<kind>/<airport>/<YYYYmmdd>/
+        _batches.jsonl.gz     크롤링 1회(배치)당 한 줄: {"crawledAt": ..., "rows": n}
+        <column>.jsonl.gz     배치당 한 줄: 해당 컬럼 값 배열
+        <column>.dict.json    사전 인코딩 컬럼의 값 목록 (컬럼 파일에는 인덱스만 기록)
+
+각 줄은 gzip 멤버로 이어 붙이므로 기존 파일을 다시 쓰지 않고 추가만 함
+배치 중간에 쓰기가 실패하면 컬럼/배치 파일을 추가 전 크기로 잘라 줄 위치가 어긋나지 않게 함
+사전 파일은 다른 프로세스(크롤러)가 갱신할 수 있으므로 캐시는 파일 수정 시각이 바뀌면 다시 읽음
+"""
+
+import gzip
+import json
+import os
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence
+
+from table_extract import days_to_mask, mask_to_days
+
+# 컬럼 인코딩: "dict" = 사전 인코딩, "plain" = 값 그대로, "days" = 요일 비트마스크
+SCHEDULE_SCHEMA = {
+    "airline": "dict",
+    "flightNo": "plain",
+    "destination": "dict",
+    "departureTime": "dict",
+    "arrivalTime": "dict",
+    "days": "days"
+}
+
+LIVE_SCHEMA = {
+    "section": "dict",
+    "airline": "dict",
+    "flightNo": "plain",
+    "destination": "dict",
+    "scheduledTime": "dict",
+    "estimatedTime": "dict",
+    "status": "dict"
+}
+
+SCHEMAS = {"schedule": SCHEDULE_SCHEMA, "live": LIVE_SCHEMA}
+
+BATCH_FILE = "_batches.jsonl.gz"
+
+# 메모리에 유지할 파티션 사전 수
+MAX_CACHED_PARTITIONS = 64
+
+
+def _dumps(value) -> bytes:
+    return (json.dumps(value, ensure_ascii=False, separators=(',', ':')) + "\n").encode('utf-8')
+
+
+class ColumnarArchive:
+    def __init__(self, root: Path):
+        self.root = root
+        self.root.mkdir(parents=True, exist_ok=True)
+        # 파티션 경로 -> 컬럼 -> 사전 (값 목록, 값 -> 인덱스, 읽은 파일의 수정 시각)
+        self._dictionaries: Dict[Path, Dict[str, Dict]] = {}
+
+    def _partition(self, kind: str, airport_code: str, day: date) -> Path:
+        return self.root / kind / airport_code / day.strftime("%Y%m%d")
+
+    @staticmethod
+    def _mtime(path: Path) -> Optional[int]:
+        try:
+            return path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def _dictionary(self, partition: Path, column: str, reload: bool = False) -> Dict:
+        if partition not in self._dictionaries and len(self._dictionaries) >= MAX_CACHED_PARTITIONS:
+            # 가장 먼저 읽은 파티션 사전부터 버림
+            self._dictionaries.pop(next(iter(self._dictionaries)))
+        cached = self._dictionaries.setdefault(partition, {})
+        path = partition / f"{column}.dict.json"
+        mtime = self._mtime(path)
+        dictionary = cached.get(column)
+        if dictionary is None or reload or dictionary["mtime"] != mtime:
+            # 다른 프로세스가 값을 추가했으면 파일에서 다시 읽음
+            values = json.loads(path.read_text(encoding='utf-8')) if mtime is not None else []
+            dictionary = {"values": values, "index": {v: i for i, v in enumerate(values)}, "mtime": mtime}
+            cached[column] = dictionary
+        return dictionary
+
+    def _save_dictionary(self, partition: Path, column: str):
+        path = partition / f"{column}.dict.json"
+        tmp_path = path.with_name(f".{path.name}.tmp")
+        dictionary = self._dictionaries[partition][column]
+        tmp_path.write_text(json.dumps(dictionary["values"], ensure_ascii=False), encoding='utf-8')
+        os.replace(tmp_path, path)
+        dictionary["mtime"] = self._mtime(path)
+
+    def _encode(self, partition: Path, column: str, encoding: str, values: List) -> List:
+        if encoding == "days":
+            return [days_to_mask(v or {}) for v in values]
+        if encoding != "dict":
+            return values
+
+        dictionary = self._dictionary(partition, column)
+        codes = []
+        changed = False
+        for value in values:
+            code = dictionary["index"].get(value)
+            if code is None:
+                code = len(dictionary["values"])
+                dictionary["values"].append(value)
+                dictionary["index"][value] = code
+                changed = True
+            codes.append(code)
+
+        if changed:
+            self._save_dictionary(partition, column)
+        return codes
+
+    def append(self, kind: str, airport_code: str, crawled_at: datetime, rows: List[Dict]):
+        """크롤링 결과 한 배치를 해당 일자 파티션에 추가"""
+        schema = SCHEMAS[kind]
+        partition = self._partition(kind, airport_code, crawled_at.date())
+        partition.mkdir(parents=True, exist_ok=True)
+
+        # 읽을 때 배치와 컬럼 줄을 줄 번호로 맞추므로 실패하면 모든 파일을 추가 전 크기로 되돌림
+        paths = [partition / f"{column}.jsonl.gz" for column in schema] + [partition / BATCH_FILE]
+        sizes = {path: path.stat().st_size if path.exists() else 0 for path in paths}
+        try:
+            # 컬럼 파일을 먼저 쓰고 배치 목록을 마지막에 기록
+            for column, encoding in schema.items():
+                values = [row.get(column, "") for row in rows]
+                encoded = self._encode(partition, column, encoding, values)
+                with gzip.open(partition / f"{column}.jsonl.gz", 'ab') as f:
+                    f.write(_dumps(encoded))
+
+            with gzip.open(partition / BATCH_FILE, 'ab') as f:
+                f.write(_dumps({"crawledAt": crawled_at.isoformat(), "rows": len(rows)}))
+        except BaseException:
+            self._truncate(sizes)
+            raise
+
+    @staticmethod
+    def _truncate(sizes: Dict[Path, int]):
+        """실패한 배치에서 추가된 부분 제거 (사전에 추가된 값은 쓰이지 않을 뿐이므로 그대로 둠)"""
+        for path, size in sizes.items():
+            if path.exists() and path.stat().st_size != size:
+                with open(path, 'r+b') as f:
+                    f.truncate(size)
+
+    def query(self, kind: str, airport_code: str, start: datetime, end: datetime,
+              columns: Optional[Sequence[str]] = None) -> Iterator[Dict]:
+        """start <= crawledAt <= end 인 배치의 행을 요청한 컬럼만 읽어 순차 반환"""
+        schema = SCHEMAS[kind]
+        columns = [c for c in (columns or schema) if c in schema]
+
+        day = start.date()
+        while day <= end.date():
+            partition = self._partition(kind, airport_code, day)
+            if (partition / BATCH_FILE).exists():
+                yield from self._read_partition(partition, schema, columns, start, end)
+            day += timedelta(days=1)
+
+    def _read_partition(self, partition: Path, schema: Dict[str, str], columns: List[str],
+                        start: datetime, end: datetime) -> Iterator[Dict]:
+        streams = {}
+        try:
+            for column in columns:
+                path = partition / f"{column}.jsonl.gz"
+                streams[column] = gzip.open(path, 'rb') if path.exists() else None
+            dictionaries = {
+                column: self._dictionary(partition, column)["values"]
+                for column in columns if schema[column] == "dict"
+            }
+
+            def decode(column: str, codes: List) -> List:
+                values = dictionaries[column]
+                if any(code is not None and code >= len(values) for code in codes):
+                    # 읽는 도중 추가된 배치의 새 값: 사전을 다시 읽음
+                    values = dictionaries[column] = self._dictionary(partition, column, reload=True)["values"]
+                return [values[code] if code is not None else None for code in codes]
+
+            with gzip.open(partition / BATCH_FILE, 'rb') as batches:
+                for batch_line in batches:
+                    batch = json.loads(batch_line)
+                    crawled_at = datetime.fromisoformat(batch["crawledAt"])
+                    in_range = start <= crawled_at <= end
+
+                    # 범위 밖 배치도 줄은 읽어서 건너뛰어야 다음 배치와 위치가 맞음
+                    lines = {c: s.readline() if s else None for c, s in streams.items()}
+                    if not in_range:
+                        continue
+
+                    decoded = {}
+                    for column in columns:
+                        values = json.loads(lines[column]) if lines[column] else [None] * batch["rows"]
+                        if schema[column] == "dict":
+                            values = decode(column, values)
+                        elif schema[column] == "days":
+                            values = [mask_to_days(v) if v is not None else None for v in values]
+                        decoded[column] = values
+
+                    for i in range(batch["rows"]):
+                        row = {"crawledAt": batch["crawledAt"]}
+                        for column in columns:
+                            row[column] = decoded[column][i]
+                        yield row
+        finally:
+            for stream in streams.values():
+                if stream:
+                    stream.close()
@@ -19,6 +19,13 @@ class Settings:
     # 출력 디렉토리
     OUTPUT_DIR: str = os.getenv("OUTPUT_DIR", "./out")
     
+    # 항공편 SQLite 저장소 경로 (API 조회용)
+    FLIGHT_DB_PATH: str = os.getenv("FLIGHT_DB_PATH", os.path.join(OUTPUT_DIR, "flights.db"))
+    
+    # 아카이브 형식 (json: 시각별 JSON 변경분, columnar: 공항/일자별 컬럼 압축 파일)
+    # columnar는 변경될 때마다 전체 스냅샷을 저장하므로 기간 조회/기간 내보내기가 필요할 때만 지정
+    ARCHIVE_FORMAT: str = os.getenv("ARCHIVE_FORMAT", "json")
+    
     # 브라우저 설정
     HEADLESS: bool = os.getenv("HEADLESS", "true").lower() == "true"
     
@@ -30,6 +37,76 @@ class Settings:
     
     # 타임아웃 (초)
     TIMEOUT: int = int(os.getenv("TIMEOUT", "30"))
+    
+    # 크롤링 작업 큐: 작업 1개 제한 시간 (초), 재시도 백오프 (초), 우선 작업 전용 워커 수
+    CRAWL_JOB_TIMEOUT: float = float(os.getenv("CRAWL_JOB_TIMEOUT", str(TIMEOUT * 4)))
+    CRAWL_RETRY_BASE_DELAY: float = float(os.getenv("CRAWL_RETRY_BASE_DELAY", "5"))
+    CRAWL_RETRY_MAX_DELAY: float = float(os.getenv("CRAWL_RETRY_MAX_DELAY", "300"))
+    CRAWL_PRIORITY_WORKERS: int = int(os.getenv("CRAWL_PRIORITY_WORKERS", "1"))
+    
+    # 작업 기한 (초): 실시간 현황은 다음 주기 전까지, 스케줄은 다음 날 크롤링 전까지
+    LIVE_JOB_DEADLINE: float = float(os.getenv("LIVE_JOB_DEADLINE", "600"))
+    SCHEDULE_JOB_DEADLINE: float = float(os.getenv("SCHEDULE_JOB_DEADLINE", "86400"))
+    
+    # 실시간 현황 조회 간격 (분): 기본(고정 주기 기준 부하), 최소/최대, 조회 1회당 목표 변경 항공편 수
+    LIVE_BASE_INTERVAL: float = float(os.getenv("LIVE_BASE_INTERVAL", "10"))
+    LIVE_MIN_INTERVAL: float = float(os.getenv("LIVE_MIN_INTERVAL", "2"))
+    LIVE_MAX_INTERVAL: float = float(os.getenv("LIVE_MAX_INTERVAL", "30"))
+    LIVE_TARGET_CHANGES: float = float(os.getenv("LIVE_TARGET_CHANGES", "3"))
+    
+    # 공항/시간대별 변경률 상태 파일
+    LIVE_POLL_STATE: str = os.getenv("LIVE_POLL_STATE", os.path.join(OUTPUT_DIR, "latest", "_live_polling.json"))
+    
+    # 실시간 변경분 스트림(SSE/WebSocket) keepalive 간격 (초)
+    LIVE_STREAM_KEEPALIVE: float = float(os.getenv("LIVE_STREAM_KEEPALIVE", "15"))
+    
+    # 크롤링 큐 상태 파일 (재시작 후 남은 작업 복원)
+    CRAWL_QUEUE_STATE: str = os.getenv("CRAWL_QUEUE_STATE", os.path.join(OUTPUT_DIR, "latest", "_queue.json"))
+    
+    # 항공포털 Excel 스케줄 우선 사용 (검증을 통과한 공항은 페이지 조회 생략)
+    EXCEL_SCHEDULE_SOURCE: bool = os.getenv("EXCEL_SCHEDULE_SOURCE", "true").lower() == "true"
+    
+    # Excel 스케줄 검증: 기존 스케줄과의 (편명, 출발시간) 최소 일치율, 매일 직접 크롤링해 비교할 공항 수
+    EXCEL_MIN_MATCH: float = float(os.getenv("EXCEL_MIN_MATCH", "0.8"))
+    EXCEL_VERIFY_AIRPORTS: int = int(os.getenv("EXCEL_VERIFY_AIRPORTS", "1"))
+    
+    # 항공포털 주소 (로컬 스텁 서버로 교체 가능)
+    AIRPORTAL_BASE_URL: str = os.getenv("AIRPORTAL_BASE_URL", "https://www.airportal.go.kr")
+    
+    # HTTP 직접 조회 우선 사용 (실패 시 Playwright로 대체)
+    HTTP_FETCH: bool = os.getenv("HTTP_FETCH", "true").lower() == "true"
+    
+    # HTTP 커넥션 풀 크기
+    HTTP_MAX_CONNECTIONS: int = int(os.getenv("HTTP_MAX_CONNECTIONS", "10"))
+    
+    # 동시 크롤링 수 (브라우저 컨텍스트 풀 크기)
+    CRAWL_CONCURRENCY: int = int(os.getenv("CRAWL_CONCURRENCY", "3"))
+    
+    # 경량 페이지 프로필 (불필요한 리소스 차단, 작은 뷰포트)
+    LIGHT_PAGE_PROFILE: bool = os.getenv("LIGHT_PAGE_PROFILE", "true").lower() == "true"
+    BLOCKED_RESOURCE_TYPES: List[str] = os.getenv(
+        "BLOCKED_RESOURCE_TYPES",
+        "image,media,font,stylesheet"
+    ).split(",")
+    ALLOWED_HOSTS: List[str] = os.getenv(
+        "ALLOWED_HOSTS",
+        "airportal.go.kr,localhost,127.0.0.1"
+    ).split(",")
+    VIEWPORT_WIDTH: int = int(os.getenv("VIEWPORT_WIDTH", "800"))
+    VIEWPORT_HEIGHT: int = int(os.getenv("VIEWPORT_HEIGHT", "600"))
+    
+    # 컨텍스트 재생성 주기 (컨텍스트당 사용 페이지 수)
+    BROWSER_RECYCLE_PAGES: int = int(os.getenv("BROWSER_RECYCLE_PAGES", "50"))
+    
+    # 호스트별 최소 요청 간격 (초)
+    CRAWL_MIN_INTERVAL: float = float(os.getenv("CRAWL_MIN_INTERVAL", "0.5"))
+    
+    # 조건 대기 상한 (밀리초)
+    WAIT_TIMEOUT_MS: int = int(os.getenv("WAIT_TIMEOUT_MS", "15000"))
+    
+    # 행 수 안정화 확인 간격 (밀리초) 및 연속 확인 횟수
+    WAIT_POLL_MS: int = int(os.getenv("WAIT_POLL_MS", "200"))
+    WAIT_STABLE_CHECKS: int = int(os.getenv("WAIT_STABLE_CHECKS", "2"))
 
 
 settings = Settings()
\ No newline at end of file
@@ -0,0 +1,328 @@
+"""
+크롤링 작업 큐
+공항 x 종류(schedule/live) 하나가 작업 1개
+- 우선순위: 숫자가 작을수록 먼저 (실시간 현황이 전체 스케줄 크롤링보다 앞섬)
+- 우선 작업 전용 워커를 따로 두어 스케줄 작업이 워커를 모두 차지해도 실시간 작업은 바로 시작
+- 작업별 제한 시간, 실패 시 지수 백오프(지터 포함)로 MAX_RETRY번까지 재시도
+- 기한(deadline)이 지난 작업은 실행하지 않음 (다음 주기 작업으로 대체)
+- 큐 상태를 JSON 파일로 저장해 재시작 후에도 남은 작업을 이어서 실행
+"""
+
+import asyncio
+import heapq
+import itertools
+import json
+import logging
+import os
+import random
+import time
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_LIVE = 0
+PRIORITY_SCHEDULE = 10
+
+# 작업 최종 상태
+FINAL_STATUSES = ("done", "failed", "expired")
+
+# 상태 파일에 남기는 최종 실패 작업 수
+FAILED_HISTORY_SIZE = 50
+
+
+class CrawlJobError(Exception):
+    """크롤링 결과가 쓸 수 없는 경우 (재시도 대상)"""
+
+
+class CrawlJob:
+    """큐 작업 1개 (시각은 재시작 후에도 비교할 수 있도록 time.time() 기준)"""
+
+    __slots__ = ("kind", "airport", "priority", "deadline", "attempts", "next_run_at",
+                 "status", "last_error", "enqueued_at", "seq", "_done")
+
+    def __init__(self, kind: str, airport: str, priority: int, deadline: float):
+        self.kind = kind
+        self.airport = airport
+        self.priority = priority
+        self.deadline = deadline
+        self.attempts = 0
+        self.next_run_at = 0.0
+        self.status = "queued"
+        self.last_error: Optional[str] = None
+        self.enqueued_at = time.time()
+        self.seq = 0
+        self._done: Optional[asyncio.Future] = None
+
+    @property
+    def key(self) -> str:
+        return f"{self.kind}:{self.airport}"
+
+    def done(self) -> asyncio.Future:
+        """작업이 끝나면 최종 상태(done/failed/expired)가 설정되는 future"""
+        if self._done is None:
+            self._done = asyncio.get_running_loop().create_future()
+            if self.status in FINAL_STATUSES:
+                self._done.set_result(self.status)
+        return self._done
+
+    def to_dict(self) -> Dict:
+        return {
+            "kind": self.kind,
+            "airport": self.airport,
+            "priority": self.priority,
+            "deadline": self.deadline,
+            "attempts": self.attempts,
+            "nextRunAt": self.next_run_at,
+            "status": self.status,
+            "lastError": self.last_error,
+            "enqueuedAt": self.enqueued_at
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "CrawlJob":
+        job = cls(data["kind"], data["airport"], data["priority"], data["deadline"])
+        job.attempts = data.get("attempts", 0)
+        job.next_run_at = data.get("nextRunAt", 0.0)
+        # 실행 도중 종료된 작업은 다시 대기열로
+        job.status = "queued"
+        job.last_error = data.get("lastError")
+        job.enqueued_at = data.get("enqueuedAt", job.enqueued_at)
+        return job
+
+
+Handler = Callable[[str], Awaitable[object]]
+
+
+class CrawlQueue:
+    def __init__(self, handlers: Dict[str, Handler], state_path: Optional[Path] = None,
+                 workers: int = 3, priority_workers: int = 1, max_retry: int = 2,
+                 timeout: float = 120, base_delay: float = 5, max_delay: float = 300):
+        self.handlers = handlers
+        self.state_path = Path(state_path) if state_path else None
+        self.workers = workers
+        self.priority_workers = priority_workers
+        self.max_retry = max_retry
+        self.timeout = timeout
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+        self._jobs: Dict[str, CrawlJob] = {}
+        # 바로 실행할 수 있는 작업 (우선순위, 순번, 키) / 재시도 대기 작업 (실행 시각, 순번, 키)
+        self._ready: List[Tuple[int, int, str]] = []
+        self._delayed: List[Tuple[float, int, str]] = []
+        self._seq = itertools.count(1)
+        self._wakeup = asyncio.Event()
+        self._tasks: List[asyncio.Task] = []
+        self.failed: List[Dict] = []
+        self.stats = {"succeeded": 0, "retried": 0, "failed": 0, "expired": 0, "timeouts": 0}
+
+        self._load()
+
+    # 상태 파일
+
+    def _load(self):
+        if self.state_path is None or not self.state_path.exists():
+            return
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Crawl queue state ignored: {str(e)}")
+            return
+        for data in state.get("jobs", []):
+            self._push(CrawlJob.from_dict(data))
+        self.failed = state.get("failed", [])[-FAILED_HISTORY_SIZE:]
+        if self._jobs:
+            logger.info(f"Restored {len(self._jobs)} crawl jobs from {self.state_path}")
+
+    def _save(self):
+        if self.state_path is None:
+            return
+        state = {
+            "jobs": [job.to_dict() for job in self._jobs.values()],
+            "failed": self.failed[-FAILED_HISTORY_SIZE:]
+        }
+        tmp_path = self.state_path.with_name(f".{self.state_path.name}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.state_path)
+
+    # 큐 조작
+
+    def _push(self, job: CrawlJob):
+        self._jobs[job.key] = job
+        job.seq = next(self._seq)
+        if job.next_run_at > time.time():
+            heapq.heappush(self._delayed, (job.next_run_at, job.seq, job.key))
+        else:
+            heapq.heappush(self._ready, (job.priority, job.seq, job.key))
+        self._wakeup.set()
+
+    def enqueue(self, kind: str, airport: str, priority: int, deadline_seconds: float) -> CrawlJob:
+        """작업 추가 (같은 작업이 이미 있으면 우선순위/기한만 올리고 기존 작업 반환)"""
+        deadline = time.time() + deadline_seconds
+        job = self._jobs.get(f"{kind}:{airport}")
+        if job is not None:
+            job.deadline = max(job.deadline, deadline)
+            if priority < job.priority:
+                job.priority = priority
+                if job.status == "queued":
+                    # 이전 항목은 순번이 달라져 꺼낼 때 무시됨
+                    self._push(job)
+            self._save()
+            return job
+
+        job = CrawlJob(kind, airport, priority, deadline)
+        self._push(job)
+        self._save()
+        return job
+
+    def enqueue_many(self, kind: str, airports: Iterable[str], priority: int,
+                     deadline_seconds: float) -> List[CrawlJob]:
+        return [self.enqueue(kind, airport, priority, deadline_seconds) for airport in airports]
+
+    async def wait(self, jobs: List[CrawlJob]) -> Dict[str, str]:
+        """작업들이 끝날 때까지 대기 ({키: 최종 상태})"""
+        statuses = await asyncio.gather(*(asyncio.shield(job.done()) for job in jobs))
+        return {job.key: status for job, status in zip(jobs, statuses)}
+
+    def _current(self, seq: int, key: str) -> Optional[CrawlJob]:
+        job = self._jobs.get(key)
+        if job is None or job.seq != seq or job.status != "queued":
+            return None
+        return job
+
+    def _promote_delayed(self, now: float):
+        while self._delayed and self._delayed[0][0] <= now:
+            _, seq, key = heapq.heappop(self._delayed)
+            job = self._current(seq, key)
+            if job is not None:
+                job.seq = next(self._seq)
+                heapq.heappush(self._ready, (job.priority, job.seq, key))
+
+    def _next_ready(self, priority_only: bool) -> Optional[CrawlJob]:
+        now = time.time()
+        self._promote_delayed(now)
+        while self._ready:
+            priority, seq, key = self._ready[0]
+            job = self._current(seq, key)
+            if job is None:
+                heapq.heappop(self._ready)
+                continue
+            if priority_only and priority > PRIORITY_LIVE:
+                return None
+            heapq.heappop(self._ready)
+            if job.deadline < now:
+                self._finish(job, "expired")
+                continue
+            return job
+        return None
+
+    def _seconds_to_next(self) -> Optional[float]:
+        if not self._delayed:
+            return None
+        return max(0.0, self._delayed[0][0] - time.time())
+
+    def _backoff(self, attempts: int) -> float:
+        """지수 백오프 (절반은 고정, 절반은 무작위)"""
+        delay = min(self.max_delay, self.base_delay * 2 ** (attempts - 1))
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    def _finish(self, job: CrawlJob, status: str):
+        job.status = status
+        self._jobs.pop(job.key, None)
+        if status == "done":
+            self.stats["succeeded"] += 1
+        elif status == "expired":
+            self.stats["expired"] += 1
+            logger.warning(f"Crawl job {job.key} expired before it could run")
+        else:
+            self.stats["failed"] += 1
+            self.failed.append({**job.to_dict(), "failedAt": time.time()})
+            self.failed = self.failed[-FAILED_HISTORY_SIZE:]
+            logger.error(f"Crawl job {job.key} failed after {job.attempts} attempts: {job.last_error}")
+        if job._done is not None and not job._done.done():
+            job._done.set_result(status)
+        self._save()
+
+    # 실행
+
+    async def _execute(self, job: CrawlJob):
+        job.status = "running"
+        job.attempts += 1
+        self._save()
+        try:
+            await asyncio.wait_for(self.handlers[job.kind](job.airport), self.timeout)
+        except asyncio.CancelledError:
+            # 종료 시 중단된 작업은 대기 상태로 저장 (재시작 후 다시 실행)
+            job.status = "queued"
+            job.attempts -= 1
+            self._save()
+            raise
+        except Exception as e:
+            if isinstance(e, asyncio.TimeoutError):
+                self.stats["timeouts"] += 1
+                job.last_error = f"timed out after {self.timeout}s"
+            else:
+                job.last_error = str(e) or type(e).__name__
+            if job.attempts > self.max_retry:
+                self._finish(job, "failed")
+                return
+            delay = self._backoff(job.attempts)
+            self.stats["retried"] += 1
+            logger.warning(f"Crawl job {job.key} failed ({job.last_error}), retry in {delay:.1f}s")
+            job.status = "queued"
+            job.next_run_at = time.time() + delay
+            self._push(job)
+            self._save()
+        else:
+            self._finish(job, "done")
+
+    async def _worker(self, priority_only: bool):
+        while True:
+            job = self._next_ready(priority_only)
+            if job is None:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self._seconds_to_next())
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            try:
+                await self._execute(job)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Crawl queue worker error on {job.key}: {str(e)}")
+
+    def start(self):
+        """워커 시작 (일반 워커 + 우선 작업 전용 워커)"""
+        if self._tasks:
+            return
+        self._tasks = [
+            asyncio.create_task(self._worker(priority_only=False)) for _ in range(self.workers)
+        ] + [
+            asyncio.create_task(self._worker(priority_only=True)) for _ in range(self.priority_workers)
+        ]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._save()
+
+    def snapshot(self) -> Dict:
+        """/health용 큐 상태"""
+        jobs = list(self._jobs.values())
+        return {
+            "queued": sum(1 for job in jobs if job.status == "queued"),
+            "running": [job.key for job in jobs if job.status == "running"],
+            "retrying": [
+                {"job": job.key, "attempts": job.attempts, "lastError": job.last_error}
+                for job in jobs if job.status == "queued" and job.attempts
+            ],
+            "recent_failures": self.failed[-10:],
+            "stats": self.stats
+        }
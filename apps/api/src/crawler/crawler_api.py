@@ -1,7 +1,7 @@
 """
 향상된 크롤러 API - 실제 airportal 데이터 사용
 """
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+from fastapi import FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
 from datetime import datetime, timedelta
 import json
@@ -11,6 +11,14 @@ from typing import List, Dict, Any, Optional
 from pathlib import Path
 import logging
 from airportal_crawler import AirportalCrawler
+from flight_db import FlightDB
+from data_source import FlightDataSource
+from response_cache import ResponseCache
+from schedule_query import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, index_page_response, wants_page
+from single_flight import SingleFlight
+from itinerary import DEFAULT_MAX_LEGS, MAX_LEGS, search as search_itineraries
+from search_index import DEFAULT_LIMIT, MAX_LIMIT, TYPES as SEARCH_TYPES
+from timetable import MAX_RANGE_DAYS
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -29,58 +37,80 @@ app.add_middleware(
 # 데이터 저장 경로
 DATA_DIR = Path("flight_data")
 DATA_DIR.mkdir(exist_ok=True)
+DATA_FILE = DATA_DIR / "korean_flight_schedules.json"
 
-# 전역 변수로 캐시된 데이터
-cached_data = {}
+# 항공편 DB (크롤링 결과를 SQLite로 가져와 인덱스로 조회)
+flight_db = FlightDB(Path(os.getenv("FLIGHT_DB_PATH", str(DATA_DIR / "flights.db"))))
 last_crawl_time = None
 
+# 직렬화된 응답 캐시 (데이터를 새로 불러올 때만 무효화)
+response_cache = ResponseCache()
+
+# 데이터 로드/크롤링 작업 (동시에 여러 요청이 와도 한 번만 실행)
+crawl_jobs = SingleFlight()
+LOAD_JOB = "load_or_crawl"
+
+# 데이터 파일 감시 (파일이 바뀌면 백그라운드에서 DB/노선 색인 스냅샷 교체)
+data_source = FlightDataSource(
+    DATA_FILE, flight_db,
+    on_reload=lambda snapshot: response_cache.publish(snapshot.version)
+)
+
 async def load_or_crawl_data():
     """저장된 데이터를 로드하거나 없으면 크롤링"""
-    global cached_data, last_crawl_time
+    global last_crawl_time
     
     # 최근 크롤링 데이터 파일 확인
-    data_file = DATA_DIR / "korean_flight_schedules.json"
+    data_file = DATA_FILE
     
-    # 파일이 있고 24시간 이내면 로드
+    # 파일이 있고 24시간 이내면 로드 (이미 반영된 파일이면 다시 읽지 않음)
     if data_file.exists():
         file_time = datetime.fromtimestamp(data_file.stat().st_mtime)
         if datetime.now() - file_time < timedelta(hours=24):
-            with open(data_file, 'r', encoding='utf-8') as f:
-                cached_data = json.load(f)
-                last_crawl_time = file_time
-                logger.info(f"Loaded cached data from {file_time}")
-                return
+            data_source.reload()
+            last_crawl_time = file_time
+            logger.info(f"Loaded cached data from {file_time}")
+            return
     
     # 새로 크롤링
     logger.info("Starting new crawl...")
     crawler = AirportalCrawler()
-    cached_data = await crawler.get_all_schedules()
+    schedules = await crawler.get_all_schedules()
     
-    # 파일로 저장
-    with open(data_file, 'w', encoding='utf-8') as f:
-        json.dump(cached_data, f, ensure_ascii=False, indent=2)
+    # 파일로 저장 (감시 스레드가 쓰는 도중의 파일을 읽지 않도록 교체 방식으로 기록)
+    tmp_file = data_file.with_name(f".{data_file.name}.tmp")
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(schedules, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_file, data_file)
+    data_source.reload()
     
     last_crawl_time = datetime.now()
     logger.info("Crawling completed and saved")
 
 @app.on_event("startup")
 async def startup_event():
-    """앱 시작시 데이터 로드"""
-    await load_or_crawl_data()
+    """앱 시작시 데이터 로드 후 파일 감시 시작"""
+    await crawl_jobs.run(LOAD_JOB, load_or_crawl_data)
+    data_source.start()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    data_source.stop()
 
 @app.get("/health")
 async def health():
     """헬스 체크"""
+    stats = data_source.snapshot.index.statistics
     return {
         "status": "healthy",
         "crawl_status": {
             "last_schedule_crawl": last_crawl_time.isoformat() if last_crawl_time else None,
             "last_live_crawl": None,
-            "last_schedule_status": "success" if cached_data else "pending",
+            "last_schedule_status": "success" if stats["total_airports"] else "pending",
             "last_live_status": "not_implemented",
             "failed_airports": [],
-            "total_airports": len(cached_data),
-            "total_flights": sum(len(data.get('flights', [])) for data in cached_data.values())
+            "total_airports": stats["total_airports"],
+            "total_flights": stats["total_flights"]
         },
         "timestamp": datetime.now().isoformat()
     }
@@ -88,13 +118,7 @@ async def health():
 @app.get("/api/airports")
 async def get_airports():
     """지원 공항 목록"""
-    airports = []
-    for code, data in cached_data.items():
-        airports.append({
-            "code": code,
-            "name": data.get("airportName", code),
-            "totalFlights": data.get("totalFlights", 0)
-        })
+    airports = data_source.snapshot.index.airports
     
     return {
         "airports": airports,
@@ -102,90 +126,193 @@ async def get_airports():
     }
 
 @app.get("/api/schedule/{airport_code}")
-async def get_schedule(airport_code: str):
-    """특정 공항의 전체 항공편 스케줄"""
+async def get_schedule(
+    airport_code: str,
+    request: Request,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="페이지 크기"),
+    cursor: Optional[str] = Query(None, description="이전 응답의 nextCursor"),
+    fields: Optional[str] = Query(None, description="응답 필드 (쉼표 구분, 예: flightNo,destination,departureTime)"),
+    airline: Optional[str] = Query(None, description="항공사 (쉼표 구분)"),
+    destination: Optional[str] = Query(None, description="도착 공항 (쉼표 구분)"),
+    departure_from: Optional[str] = Query(None, alias="departureFrom", description="출발시간 HH:MM 이후"),
+    departure_to: Optional[str] = Query(None, alias="departureTo", description="출발시간 HH:MM 이전"),
+    weekday: Optional[str] = Query(None, description="운항 요일 (mon~sun)")
+):
+    """특정 공항의 항공편 스케줄 (조회 조건이 없으면 전체 문서, 있으면 필터/필드 선택/커서 페이지)"""
     airport_code = airport_code.upper()
     
-    if airport_code not in cached_data:
-        # 캐시에 없으면 다시 로드 시도
-        await load_or_crawl_data()
-        
-    if airport_code not in cached_data:
-        raise HTTPException(status_code=404, detail=f"Airport {airport_code} not found")
+    if not data_source.snapshot.index.has_airport(airport_code):
+        # DB에 없으면 다시 로드 시도 (진행 중인 로드/크롤링이 있으면 그 결과를 함께 기다림)
+        await crawl_jobs.run(LOAD_JOB, load_or_crawl_data)
     
-    return cached_data[airport_code]
+    if wants_page(request.query_params):
+        # 조회 조건이 있으면 메모리 색인에서 해당 페이지만 스트리밍
+        snapshot = data_source.snapshot
+        return index_page_response(
+            snapshot.index, snapshot.version, airport_code,
+            limit=limit, cursor=cursor, fields=fields, airline=airline, destination=destination,
+            departure_from=departure_from, departure_to=departure_to, weekday=weekday
+        )
+    
+    def build():
+        schedule = data_source.get_schedule(airport_code)
+        if schedule is None:
+            raise HTTPException(status_code=404, detail=f"Airport {airport_code} not found")
+        return schedule
+    
+    return response_cache.respond(request, ("schedule", airport_code), build)
 
 @app.get("/api/schedule/{airport_code}/destinations")
 async def get_destinations(airport_code: str):
     """특정 공항에서 갈 수 있는 모든 도착지 목록"""
     airport_code = airport_code.upper()
     
-    if airport_code not in cached_data:
+    destinations = data_source.snapshot.index.destinations(airport_code)
+    if destinations is None:
         raise HTTPException(status_code=404, detail=f"Airport {airport_code} not found")
     
-    destinations = set()
-    for flight in cached_data[airport_code].get('flights', []):
-        if flight.get('destination'):
-            destinations.add(flight['destination'])
-    
     return {
         "airport": airport_code,
-        "destinations": sorted(list(destinations)),
+        "destinations": list(destinations),
         "total": len(destinations)
     }
 
 @app.get("/api/schedule/{departure_code}/{arrival_code}")
-async def get_route_schedule(departure_code: str, arrival_code: str):
-    """특정 노선의 항공편 스케줄"""
+async def get_route_schedule(
+    departure_code: str,
+    arrival_code: str,
+    request: Request,
+    date: Optional[str] = Query(None, description="운항일 YYYY-MM-DD (지정하면 해당 날짜부터 일자별로 전개)"),
+    days: int = Query(1, ge=1, le=MAX_RANGE_DAYS, description="date부터 조회할 일수")
+):
+    """특정 노선의 항공편 스케줄 (date 지정 시 운항일 기준 일자별 목록)"""
     departure_code = departure_code.upper()
     arrival_code = arrival_code.upper()
     
-    if departure_code not in cached_data:
+    index = data_source.snapshot.index
+    if not index.has_airport(departure_code):
         raise HTTPException(status_code=404, detail=f"Departure airport {departure_code} not found")
+    if not index.has_route(departure_code, arrival_code):
+        # 없는 노선은 캐시하지 않음 (임의의 도착 코드마다 캐시 항목이 생기지 않도록)
+        raise HTTPException(status_code=404, detail=f"Route {departure_code}-{arrival_code} not found")
     
-    # 해당 노선의 항공편만 필터링
-    route_flights = []
-    for flight in cached_data[departure_code].get('flights', []):
-        if flight.get('destination') == arrival_code:
-            route_flights.append(flight)
+    if date is not None:
+        try:
+            start = datetime.strptime(date, "%Y-%m-%d").date()
+        except ValueError:
+            raise HTTPException(status_code=400, detail="date must be YYYY-MM-DD")
+        try:
+            end = start + timedelta(days=days - 1)
+        except OverflowError:
+            raise HTTPException(status_code=400, detail="date range exceeds the supported calendar")
+        
+        def build_dated():
+            # 요일 마스크/유효기간 배열로 기간 전체를 한 번에 필터
+            dated_flights = index.timetable(departure_code, arrival_code).expand(start, end)
+            return {
+                "departure": departure_code,
+                "arrival": arrival_code,
+                "crawledAt": index.crawled_at(departure_code),
+                "date": start.isoformat(),
+                "endDate": end.isoformat(),
+                "totalFlights": len(dated_flights),
+                "flights": [dated.to_dict() for dated in dated_flights]
+            }
+        
+        return response_cache.respond(request, ("route", departure_code, arrival_code, start, days), build_dated)
     
-    return {
-        "departure": departure_code,
-        "arrival": arrival_code,
-        "crawledAt": cached_data[departure_code].get('crawledAt'),
-        "totalFlights": len(route_flights),
-        "flights": route_flights
-    }
+    def build():
+        # 미리 만든 노선 색인에서 조회
+        route_flights = index.route(departure_code, arrival_code)
+        return {
+            "departure": departure_code,
+            "arrival": arrival_code,
+            "crawledAt": index.crawled_at(departure_code),
+            "totalFlights": len(route_flights),
+            "flights": [flight.to_dict() for flight in route_flights]
+        }
+    
+    return response_cache.respond(request, ("route", departure_code, arrival_code), build)
+
+@app.get("/api/itineraries")
+async def get_itineraries(
+    request: Request,
+    origin: str = Query(..., alias="from", description="출발 공항"),
+    destination: str = Query(..., alias="to", description="도착 공항"),
+    date: Optional[str] = Query(None, description="출발일 YYYY-MM-DD (기본 오늘)"),
+    max_legs: int = Query(DEFAULT_MAX_LEGS, ge=1, le=MAX_LEGS, description="최대 구간 수"),
+    min_connection: Optional[int] = Query(None, ge=0, le=1440, description="최소 환승 시간(분), 기본은 공항별 값")
+):
+    """환승 경로 탐색 (출발시각/도착시각/구간 수 기준 파레토 최적 경로)"""
+    origin = origin.upper()
+    destination = destination.upper()
+    
+    index = data_source.snapshot.index
+    if not index.has_airport(origin):
+        raise HTTPException(status_code=404, detail=f"Departure airport {origin} not found")
+    
+    try:
+        day = datetime.strptime(date, "%Y-%m-%d").date() if date else datetime.now().date()
+    except ValueError:
+        raise HTTPException(status_code=400, detail="date must be YYYY-MM-DD")
+    
+    def build():
+        # 날짜별 연결 배열은 노선 색인에서 재사용
+        itineraries = search_itineraries(index.connections(day), origin, destination, max_legs, min_connection)
+        return {
+            "from": origin,
+            "to": destination,
+            "date": day.isoformat(),
+            "maxLegs": max_legs,
+            "totalItineraries": len(itineraries),
+            "itineraries": [itinerary.to_dict() for itinerary in itineraries]
+        }
+    
+    return response_cache.respond(
+        request, ("itineraries", origin, destination, day, max_legs, min_connection), build
+    )
 
 @app.post("/api/crawl/schedule")
-async def trigger_schedule_crawl(background_tasks: BackgroundTasks):
-    """수동으로 스케줄 크롤링 트리거"""
-    background_tasks.add_task(load_or_crawl_data)
+async def trigger_schedule_crawl():
+    """수동으로 스케줄 크롤링 트리거 (실행 중인 작업이 있으면 그 작업을 반환)"""
+    job = crawl_jobs.start(LOAD_JOB, load_or_crawl_data)
     return {
-        "message": "Schedule crawl triggered",
+        "message": "Schedule crawl triggered" if job.waiters == 1 else "Schedule crawl already running",
+        **job.to_dict(),
         "timestamp": datetime.now().isoformat()
     }
 
+@app.get("/api/crawl/jobs/{job_id}")
+async def get_crawl_job(job_id: str):
+    """크롤링 작업 상태"""
+    job = crawl_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return job.to_dict()
+
+@app.get("/api/search")
+async def search(
+    q: str = Query(..., min_length=1, max_length=50, description="검색어 (코드/편명/이름, 초성 가능)"),
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    types: Optional[str] = Query(None, description="결과 종류 (airport,airline,flight 중 쉼표 구분)")
+):
+    """공항/항공사/편명 자동완성"""
+    type_filter = [t.strip() for t in types.split(",") if t.strip()] if types else None
+    if type_filter and any(t not in SEARCH_TYPES for t in type_filter):
+        raise HTTPException(status_code=400, detail=f"types must be within {','.join(SEARCH_TYPES)}")
+    
+    results = data_source.snapshot.index.search_index.search(q, limit, type_filter)
+    return {
+        "query": q,
+        "total": len(results),
+        "results": results
+    }
+
 @app.get("/api/statistics")
 async def get_statistics():
     """전체 통계"""
-    total_flights = 0
-    routes = set()
-    airlines = set()
-    
-    for airport_data in cached_data.values():
-        for flight in airport_data.get('flights', []):
-            total_flights += 1
-            if flight.get('destination'):
-                routes.add(f"{airport_data['airport']}-{flight['destination']}")
-            if flight.get('airline'):
-                airlines.add(flight['airline'])
-    
     return {
-        "total_airports": len(cached_data),
-        "total_flights": total_flights,
-        "total_routes": len(routes),
-        "total_airlines": len(airlines),
+        **data_source.snapshot.index.statistics,
         "last_update": last_crawl_time.isoformat() if last_crawl_time else None
     }
 
@@ -0,0 +1,216 @@
+"""
+항공편 데이터 소스 (파일 감시 + 스냅샷 교체)
+korean_flight_schedules.json 파일 또는 out/latest/ 디렉토리를 백그라운드 스레드에서 감시하고
+바뀌면 새로 읽어 검증한 뒤 서빙 스냅샷을 한 번에 교체
+- 요청 처리 중에는 파일을 읽지 않음 (스냅샷 참조만 가져감)
+- 처리 중인 요청은 시작할 때 가져간 이전 스냅샷을 그대로 사용
+- 검증에 실패한 데이터는 반영하지 않고 이전 스냅샷 유지
+- 지연 모드(FLIGHT_DATA_LAZY=true): 공항별 위치만 찾아 바로 서빙을 시작하고
+  각 공항은 처음 요청될 때 파싱, DB 적재는 백그라운드에서 공항 단위로 진행
+"""
+
+import hashlib
+import logging
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Mapping, NamedTuple, Optional, Tuple
+
+from flight_db import FlightDB
+from flight_record import Flight, compact_schedule, schedule_to_json
+from route_index import RouteIndex
+from schedule_loader import LazySchedules, parse_section
+
+logger = logging.getLogger(__name__)
+
+# 파일 변경 확인 간격 (초)
+DEFAULT_POLL_INTERVAL = float(os.getenv("DATA_RELOAD_INTERVAL", "2"))
+
+# 공항별 파싱을 첫 요청 시점까지 미룸
+DEFAULT_LAZY = os.getenv("FLIGHT_DATA_LAZY", "false").lower() == "true"
+
+# 디렉토리 감시 시 읽는 파일 (storage.py가 쓰는 latest/schedule_<공항>.json)
+SCHEDULE_GLOB = "schedule_*.json"
+
+
+class DataValidationError(Exception):
+    """스케줄 데이터 형식 오류"""
+
+
+class Snapshot(NamedTuple):
+    version: str
+    index: RouteIndex
+    loaded_at: datetime
+    # DB 적재 완료 여부 (지연 모드에서는 백그라운드 적재가 끝나면 설정)
+    db_ready: threading.Event
+
+
+def validate_airport(airport_code: str, data) -> Dict:
+    """공항 1개 스케줄이 {"flights": [...]} 형식인지 확인"""
+    if not isinstance(data, dict) or not isinstance(data.get("flights"), list):
+        raise DataValidationError(f"{airport_code}: missing flights list")
+    for flight in data["flights"]:
+        flight_no = flight.flight_no if isinstance(flight, Flight) else \
+            flight.get("flightNo") if isinstance(flight, dict) else None
+        if not flight_no:
+            raise DataValidationError(f"{airport_code}: flight without flightNo")
+    return data
+
+
+def validate_schedules(schedules) -> Mapping:
+    """{공항코드: {"flights": [...]}} 형식인지 확인"""
+    if not isinstance(schedules, Mapping) or not schedules:
+        raise DataValidationError("Schedule data must be a non-empty object keyed by airport code")
+    for airport_code, data in schedules.items():
+        validate_airport(airport_code, data)
+    return schedules
+
+
+def _ready() -> threading.Event:
+    event = threading.Event()
+    event.set()
+    return event
+
+
+class FlightDataSource:
+    def __init__(self, path: Optional[Path], db: FlightDB,
+                 on_reload: Optional[Callable[[Snapshot], None]] = None,
+                 poll_interval: float = DEFAULT_POLL_INTERVAL, lazy: bool = DEFAULT_LAZY):
+        self.path = Path(path) if path else None
+        self.db = db
+        self.on_reload = on_reload
+        self.poll_interval = poll_interval
+        self.lazy = lazy
+
+        self.snapshot = Snapshot("empty", RouteIndex({}), datetime.now(), _ready())
+        self._import_lock = threading.Lock()
+        self._signature: Optional[Tuple] = None
+        self._reload_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _files(self):
+        if self.path is None or not self.path.exists():
+            return []
+        if self.path.is_dir():
+            return sorted(self.path.glob(SCHEDULE_GLOB))
+        return [self.path]
+
+    def _current_signature(self) -> Tuple:
+        signature = []
+        for file in self._files():
+            try:
+                stat = file.stat()
+            except FileNotFoundError:
+                continue
+            signature.append((file.name, stat.st_mtime_ns, stat.st_size))
+        return tuple(signature)
+
+    def _read(self) -> Mapping:
+        if self.path.is_dir():
+            schedules = {}
+            for file in self._files():
+                with open(file, 'rb') as f:
+                    data = parse_section(f.read())
+                schedules[data.get("airport") or file.stem.split("_", 1)[1]] = data
+            return schedules
+        # 공항별 위치만 찾고 파싱은 공항 단위로 (한 번에 json.load 하지 않음)
+        return LazySchedules(self.path)
+
+    def publish(self, schedules: Mapping, version: Optional[str] = None) -> Snapshot:
+        """검증된 데이터를 DB에 반영하고 새 스냅샷으로 교체"""
+        lazy = self.lazy and isinstance(schedules, LazySchedules)
+        if lazy:
+            if not schedules:
+                raise DataValidationError("Schedule data has no airports")
+            index = RouteIndex(schedules)
+            db_ready = threading.Event()
+        else:
+            validate_schedules(schedules)
+            if not isinstance(schedules, LazySchedules):
+                # 직접 넘겨받은 dict 데이터도 Flight 레코드로 보관
+                schedules = {code: compact_schedule(data) for code, data in schedules.items()}
+            self.db.import_schedules(schedules)
+            index = RouteIndex(schedules).warm()
+            db_ready = _ready()
+
+        snapshot = Snapshot(version or datetime.now().isoformat(), index, datetime.now(), db_ready)
+        # 참조 대입 한 번으로 교체 (읽는 쪽은 이전/새 스냅샷 중 하나만 봄)
+        self.snapshot = snapshot
+        if self.on_reload:
+            self.on_reload(snapshot)
+
+        if lazy:
+            threading.Thread(
+                target=self._import_lazy, args=(snapshot, schedules),
+                name="flight-data-import", daemon=True
+            ).start()
+        return snapshot
+
+    def _import_lazy(self, snapshot: Snapshot, schedules: LazySchedules):
+        """지연 모드 DB 적재 (공항 단위로 파싱해 적재 후 바로 버림)"""
+        with self._import_lock:
+            if self.snapshot is not snapshot:
+                return
+            try:
+                self.db.import_schedules(
+                    (code, validate_airport(code, data)) for code, data in schedules.streaming()
+                )
+            except (OSError, ValueError, DataValidationError) as e:
+                logger.error(f"Flight data import failed: {str(e)}")
+                return
+            snapshot.db_ready.set()
+            logger.info(f"Flight data imported into DB ({len(schedules)} airports)")
+
+    def get_schedule(self, airport_code: str) -> Optional[Dict]:
+        """공항 스케줄 (DB 적재 전이면 해당 공항만 파싱해 반환)"""
+        snapshot = self.snapshot
+        if snapshot.db_ready.is_set():
+            return self.db.get_schedule(airport_code)
+        return schedule_to_json(snapshot.index.schedule(airport_code))
+
+    def reload(self, force: bool = False) -> bool:
+        """파일이 바뀌었으면 다시 읽어 반영 (반영 여부 반환)"""
+        if self.path is None:
+            return False
+        with self._reload_lock:
+            signature = self._current_signature()
+            if not signature or (signature == self._signature and not force):
+                return False
+            try:
+                schedules = self._read()
+                snapshot = self.publish(schedules, version=hashlib.sha1(repr(signature).encode()).hexdigest()[:16])
+            except (OSError, ValueError, DataValidationError) as e:
+                # 쓰는 도중의 파일이거나 형식이 잘못된 경우: 이전 스냅샷 유지, 파일이 다시 바뀌면 재시도
+                logger.warning(f"Flight data reload skipped: {str(e)}")
+                self._signature = signature
+                return False
+            self._signature = signature
+            # 통계는 전체 파싱이 필요하므로 지연 모드에서는 공항 수만 기록
+            detail = f"{len(schedules)} airports" if not snapshot.db_ready.is_set() \
+                else f"{snapshot.index.statistics['total_flights']} flights"
+            logger.info(f"Flight data reloaded from {self.path} ({detail})")
+            return True
+
+    def _watch(self):
+        while not self._stop.wait(self.poll_interval):
+            try:
+                self.reload()
+            except Exception as e:
+                logger.error(f"Flight data watcher error: {str(e)}")
+
+    def start(self):
+        """최초 로드 후 감시 스레드 시작"""
+        self.reload()
+        if self.path is None or self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._watch, name="flight-data-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.poll_interval + 1)
+            self._thread = None
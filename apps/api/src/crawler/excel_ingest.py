@@ -0,0 +1,375 @@
+"""
+항공포털 Excel 스케줄 가져오기
+download_excel로 받은 .xlsx 한 파일에서 전체 공항 스케줄을 읽어 크롤링 결과와 같은 형식으로 정규화
+- XLSX(ZIP 안의 XML)를 iterparse로 행 단위로 읽고 읽은 행은 바로 버림 (메모리는 공유 문자열 표 + 행 1개)
+- 헤더 행은 컬럼 이름으로 찾음 (열 순서가 바뀌어도 동작, 필수 컬럼이 없으면 ExcelFormatError)
+- 공항명은 공항 코드로, Excel 숫자 시각/날짜는 HH:MM / YYYY-MM-DD로 변환
+- compare_schedules로 기존(크롤링) 스케줄과 편명/출발시간이 충분히 겹치는지 확인한 뒤에만 사용
+"""
+
+import re
+import zipfile
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from xml.etree.ElementTree import iterparse
+
+from search_index import AIRPORT_NAMES
+from table_extract import DAY_KEYS, FLIGHT_NO_PATTERN, TIME_PATTERN, parse_operating_days
+
+# 컬럼 이름 (공백/괄호 설명을 뺀 값으로 비교)
+HEADER_ALIASES = {
+    "airline": ("항공사", "항공사명"),
+    "flightNo": ("편명", "항공편", "항공편명", "운항편명"),
+    "origin": ("출발공항", "출발지", "출발공항코드"),
+    "destination": ("도착공항", "도착지", "목적지", "도착공항코드"),
+    "departureTime": ("출발시간", "출발시각"),
+    "arrivalTime": ("도착시간", "도착시각"),
+    "aircraft": ("기종",),
+    "days": ("운항요일", "요일"),
+    "validFrom": ("시작일", "운항시작일", "운항시작", "유효시작일"),
+    "validTo": ("종료일", "운항종료일", "운항종료", "유효종료일")
+}
+DAY_HEADERS = dict(zip(("월", "화", "수", "목", "금", "토", "일"), DAY_KEYS))
+
+REQUIRED_COLUMNS = ("flightNo", "origin", "destination", "departureTime")
+
+# 헤더 행을 찾을 때 살펴볼 앞쪽 행 수 (제목/조회 조건 행 건너뜀)
+HEADER_SEARCH_ROWS = 20
+
+# 요일 컬럼에서 운항으로 보는 표시 (요일 글자 자체를 적은 경우 포함)
+DAY_MARKS = {"O", "○", "●", "◯", "V", "Y", "1", "TRUE", *DAY_HEADERS}
+
+# Excel 날짜 일련번호 기준일 (1900 날짜 체계)
+EXCEL_EPOCH = date(1899, 12, 30)
+
+TIME_TEXT = re.compile(r'^(\d{1,2}):?(\d{2})(?::\d{2})?$')
+DATE_TEXT = re.compile(r'^(\d{4})[-./]?(\d{1,2})[-./]?(\d{1,2})')
+
+Cell = Optional[object]
+
+
+class ExcelFormatError(ValueError):
+    """읽을 수 없는 Excel 파일 (시트/헤더를 찾지 못함)"""
+
+
+def _local(tag: str) -> str:
+    # 일반/엄격(strict) OOXML 네임스페이스를 모두 받도록 태그 이름만 비교
+    return tag.rpartition('}')[2]
+
+
+@lru_cache(maxsize=None)
+def _column_index(letters: str) -> int:
+    index = 0
+    for letter in letters:
+        index = index * 26 + ord(letter) - 64
+    return index - 1
+
+
+def _text(element, ns: str) -> str:
+    """<si>/<is> 안의 텍스트 (서식이 나뉜 조각 <r><t> 포함, 윗주 <rPh> 제외)"""
+    plain = element.find(f"{ns}t")
+    if plain is not None:
+        return plain.text or ""
+    return "".join(t.text or "" for t in element.iterfind(f"{ns}r/{ns}t"))
+
+
+def _namespace(tag: str) -> str:
+    return tag[:tag.index('}') + 1] if tag.startswith('{') else ""
+
+
+def _shared_strings(archive: zipfile.ZipFile) -> List[str]:
+    if "xl/sharedStrings.xml" not in archive.namelist():
+        return []
+    strings = []
+    with archive.open("xl/sharedStrings.xml") as f:
+        for _, element in iterparse(f):
+            if _local(element.tag) == "si":
+                strings.append(_text(element, _namespace(element.tag)))
+                element.clear()
+    return strings
+
+
+def _first_sheet(archive: zipfile.ZipFile) -> str:
+    """통합 문서의 첫 번째 시트 파일 경로"""
+    names = set(archive.namelist())
+    try:
+        with archive.open("xl/workbook.xml") as f:
+            sheet = next(e for _, e in iterparse(f) if _local(e.tag) == "sheet")
+        relation_id = next(v for k, v in sheet.attrib.items() if _local(k) == "id")
+        with archive.open("xl/_rels/workbook.xml.rels") as f:
+            target = next(
+                e.get("Target") for _, e in iterparse(f)
+                if _local(e.tag) == "Relationship" and e.get("Id") == relation_id
+            )
+    except (KeyError, StopIteration):
+        target = "worksheets/sheet1.xml"
+    path = target.lstrip("/") if target.startswith("/") else f"xl/{target}"
+    if path not in names:
+        raise ExcelFormatError("worksheet not found")
+    return path
+
+
+def _cell_value(cell, shared: List[str], ns: str) -> Cell:
+    kind = cell.get("t")
+    if kind == "inlineStr":
+        inline = cell.find(f"{ns}is")
+        return _text(inline, ns) if inline is not None else None
+    value = cell.findtext(f"{ns}v")
+    if value is None:
+        return None
+    if kind == "s":
+        return shared[int(value)]
+    if kind in ("str", "d"):
+        return value
+    if kind == "b":
+        return value == "1"
+    if kind == "e":
+        return None
+    number = float(value)
+    return int(number) if number.is_integer() else number
+
+
+def iter_rows(path: Path) -> Iterator[List[Cell]]:
+    """첫 번째 시트의 행 (빈 셀은 None, 읽은 행은 XML 트리에서 바로 제거)"""
+    try:
+        archive = zipfile.ZipFile(path)
+    except zipfile.BadZipFile:
+        raise ExcelFormatError(f"not an xlsx file: {path}")
+
+    with archive:
+        shared = _shared_strings(archive)
+        with archive.open(_first_sheet(archive)) as f:
+            ns = None
+            row_tag = cell_tag = None
+            sheet_data = None
+            for event, element in iterparse(f, events=("start", "end")):
+                if event == "start":
+                    if ns is None:
+                        # 루트(worksheet) 태그의 네임스페이스로 태그 이름을 한 번만 만듦
+                        ns = _namespace(element.tag)
+                        row_tag, cell_tag = f"{ns}row", f"{ns}c"
+                    elif sheet_data is None and element.tag == f"{ns}sheetData":
+                        sheet_data = element
+                    continue
+                if element.tag != row_tag:
+                    continue
+
+                row: List[Cell] = []
+                for position, cell in enumerate(element.iterfind(cell_tag)):
+                    reference = cell.get("r")
+                    index = _column_index(reference.rstrip("0123456789")) if reference else position
+                    if index >= len(row):
+                        row.extend([None] * (index + 1 - len(row)))
+                    row[index] = _cell_value(cell, shared, ns)
+                # 처리한 행을 부모에서 떼어 내 트리가 커지지 않도록
+                (sheet_data if sheet_data is not None else element).clear()
+                yield row
+
+
+# 값 정규화
+
+def _normalize_header(value: Cell) -> str:
+    text = str(value or "")
+    return re.sub(r'\s+', '', text.split("(")[0])
+
+
+def _header_columns(row: List[Cell]) -> Dict[str, int]:
+    """헤더 행이면 {필드: 컬럼 위치}, 요일 컬럼은 'day:mon' 형식 키"""
+    columns = {}
+    for index, value in enumerate(row):
+        header = _normalize_header(value)
+        if not header:
+            continue
+        for field, aliases in HEADER_ALIASES.items():
+            if header in aliases and field not in columns:
+                columns[field] = index
+        if header in DAY_HEADERS:
+            columns[f"day:{DAY_HEADERS[header]}"] = index
+    return columns
+
+
+def _airport_codes() -> Dict[str, str]:
+    """공항명/줄인 이름/도시명 -> 공항 코드 (도시에 공항이 여럿이면 도시명은 제외)"""
+    names: Dict[str, str] = {}
+    cities: Dict[str, List[str]] = {}
+    for code, (name, city) in AIRPORT_NAMES.items():
+        names[name] = code
+        names[re.sub(r'(국제)?공항$', '', name)] = code
+        cities.setdefault(city, []).append(code)
+    for city, codes in cities.items():
+        if len(codes) == 1:
+            names.setdefault(city, codes[0])
+    return names
+
+
+AIRPORT_CODES = _airport_codes()
+
+
+def airport_code(value: Cell) -> str:
+    """공항 코드 (이름이면 코드로, 모르는 이름은 원문)"""
+    text = str(value or "").strip()
+    if re.fullmatch(r'[A-Za-z]{3}', text):
+        return text.upper()
+    # "김해(PUS)" 같은 표기
+    inner = re.search(r'\(([A-Za-z]{3})\)', text)
+    if inner:
+        return inner.group(1).upper()
+    return AIRPORT_CODES.get(re.sub(r'\s+', '', text), text)
+
+
+def time_text(value: Cell) -> str:
+    """HH:MM (Excel 시각은 하루의 비율, 일시 일련번호면 시각 부분만)"""
+    if isinstance(value, bool) or value is None:
+        return ""
+    if isinstance(value, int) and 0 < value < 2400 and value % 100 < 60:
+        # 숫자 서식으로 적은 0705 / 1430
+        return f"{value // 100:02d}:{value % 100:02d}"
+    if isinstance(value, (int, float)):
+        minutes = round((value % 1) * 1440) % 1440
+        return f"{minutes // 60:02d}:{minutes % 60:02d}"
+    text = str(value).strip()
+    match = TIME_TEXT.match(text)
+    if match and int(match.group(1)) < 24 and int(match.group(2)) < 60:
+        return f"{int(match.group(1)):02d}:{match.group(2)}"
+    return text
+
+
+def date_text(value: Cell) -> Optional[str]:
+    """YYYY-MM-DD (Excel 날짜 일련번호 또는 2025-07-01 / 2025.07.01 / 20250701)"""
+    if isinstance(value, bool) or value is None:
+        return None
+    try:
+        if isinstance(value, (int, float)):
+            return (EXCEL_EPOCH + timedelta(days=int(value))).isoformat()
+        match = DATE_TEXT.match(str(value).strip())
+        if match:
+            return date(*(int(part) for part in match.groups())).isoformat()
+    except (ValueError, OverflowError):
+        pass
+    return None
+
+
+def days_value(text: Cell) -> Dict[str, bool]:
+    """운항 요일 ('월화수목금' 또는 숫자 표기 '1234567', 1=월요일)"""
+    text = str(text or "")
+    if any(char.isdigit() for char in text):
+        return {key: str(number) in text for number, key in enumerate(DAY_KEYS, start=1)}
+    return parse_operating_days(text)
+
+
+def _cell(row: List[Cell], columns: Dict[str, int], field: str) -> Cell:
+    index = columns.get(field)
+    return row[index] if index is not None and index < len(row) else None
+
+
+def _flight(row: List[Cell], columns: Dict[str, int]) -> Optional[Tuple[str, Dict]]:
+    """데이터 행 -> (출발 공항, 크롤링 결과와 같은 형식의 항공편), 항공편 행이 아니면 None"""
+    flight_no = re.sub(r'\s+', '', str(_cell(row, columns, "flightNo") or "")).upper()
+    if not FLIGHT_NO_PATTERN.match(flight_no):
+        return None
+    origin = airport_code(_cell(row, columns, "origin"))
+    departure = time_text(_cell(row, columns, "departureTime"))
+    if not origin or not TIME_PATTERN.match(departure):
+        return None
+
+    flight = {
+        "airline": str(_cell(row, columns, "airline") or "").strip(),
+        "flightNo": flight_no,
+        "destination": airport_code(_cell(row, columns, "destination")),
+        "departureTime": departure,
+        "arrivalTime": time_text(_cell(row, columns, "arrivalTime"))
+    }
+    if "days" in columns:
+        flight["days"] = days_value(_cell(row, columns, "days"))
+    elif any(f"day:{key}" in columns for key in DAY_KEYS):
+        flight["days"] = {
+            key: str(_cell(row, columns, f"day:{key}") or "").strip().upper() in DAY_MARKS
+            for key in DAY_KEYS
+        }
+    aircraft = str(_cell(row, columns, "aircraft") or "").strip()
+    if aircraft:
+        flight["aircraft"] = aircraft
+    for field in ("validFrom", "validTo"):
+        value = date_text(_cell(row, columns, field))
+        if value:
+            flight[field] = value
+    return origin, flight
+
+
+def iter_flights(path: Path, stats: Optional[Dict[str, int]] = None) -> Iterator[Tuple[str, Dict]]:
+    """(출발 공항, 항공편) 순회 (stats를 주면 rows/flights/skipped 개수 기록)"""
+    if stats is None:
+        stats = {}
+    stats.update(rows=0, flights=0, skipped=0)
+
+    rows = iter_rows(path)
+    columns = None
+    for _, row in zip(range(HEADER_SEARCH_ROWS), rows):
+        found = _header_columns(row)
+        if all(field in found for field in REQUIRED_COLUMNS):
+            columns = found
+            break
+    if columns is None:
+        raise ExcelFormatError(f"header row not found (required: {', '.join(REQUIRED_COLUMNS)})")
+
+    for row in rows:
+        if not any(value not in (None, "") for value in row):
+            continue
+        stats["rows"] += 1
+        parsed = _flight(row, columns)
+        if parsed is None:
+            stats["skipped"] += 1
+            continue
+        stats["flights"] += 1
+        yield parsed
+
+
+def load_schedules(path: Path, airports: Iterable[str],
+                   crawled_at: Optional[str] = None) -> Tuple[Dict[str, Dict], Dict[str, int]]:
+    """airports 공항의 스케줄 ({공항코드: 크롤링 결과 형식}, 읽기 통계)"""
+    wanted = set(airports)
+    crawled_at = crawled_at or datetime.now().isoformat()
+    stats: Dict[str, int] = {}
+    flights: Dict[str, List[Dict]] = {}
+    for origin, flight in iter_flights(path, stats):
+        if origin in wanted:
+            flights.setdefault(origin, []).append(flight)
+
+    schedules = {}
+    for airport_code in (code for code in airports if code in flights):
+        schedules[airport_code] = {
+            "airport": airport_code,
+            "crawledAt": crawled_at,
+            "totalFlights": len(flights[airport_code]),
+            "flights": flights[airport_code]
+        }
+    return schedules, stats
+
+
+def _flight_keys(schedule: Dict) -> set:
+    return {
+        (str(flight.get("flightNo") or "").replace(" ", "").upper(), flight.get("departureTime"))
+        for flight in schedule.get("flights", [])
+    }
+
+
+def compare_schedules(candidate: Dict, reference: Optional[Dict], min_match: float) -> Dict:
+    """Excel 스케줄과 기준(크롤링) 스케줄의 (편명, 출발시간) 일치율
+    기준의 min_match 이상을 포함하고, Excel 쪽도 min_match 이상이 기준에 있어야 ok"""
+    keys = _flight_keys(candidate)
+    if reference is None:
+        return {"flights": len(keys), "reference": 0, "matched": 0, "ok": False}
+    reference_keys = _flight_keys(reference)
+    matched = len(keys & reference_keys)
+    coverage = matched / len(reference_keys) if reference_keys else 0.0
+    precision = matched / len(keys) if keys else 0.0
+    return {
+        "flights": len(keys),
+        "reference": len(reference_keys),
+        "matched": matched,
+        "coverage": round(coverage, 3),
+        "precision": round(precision, 3),
+        "ok": coverage >= min_match and precision >= min_match
+    }
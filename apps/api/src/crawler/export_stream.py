@@ -0,0 +1,306 @@
+"""
+스케줄 / 실시간 현황 내보내기 (CSV / NDJSON / XLSX 스트리밍)
+크롤링마다 파일을 미리 써 두지 않고 요청이 올 때 저장소에서 한 행씩 읽어 바로 인코딩
+- 기간을 주지 않으면 SQLite 저장소(flight_db.py)의 최신 데이터, 주면 컬럼 아카이브(columnar_archive.py)의 기간 데이터
+- 여러 공항을 한 파일로 내보낼 수 있음 (공항 컬럼 추가)
+- 응답은 일정 크기 조각으로 나눠 보내므로 (chunked 전송) 메모리 사용량이 내보내는 행 수와 무관
+- XLSX는 ZIP을 앞에서부터 쓰는 방식(데이터 디스크립터)으로 직접 생성, 시트 최대 행 수를 넘으면 다음 시트로
+"""
+
+import csv
+import io
+import json
+import re
+import zipfile
+from datetime import datetime, time
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from xml.sax.saxutils import escape, quoteattr
+
+from fastapi.responses import StreamingResponse
+
+from table_extract import DAY_KEYS
+
+EXPORT_KINDS = ("schedule", "live")
+
+MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+}
+
+# 응답 조각 크기 (바이트)
+CHUNK_SIZE = 64 * 1024
+
+# XLSX 시트당 최대 행 수 (Excel 제한, 머리 행 포함)
+MAX_SHEET_ROWS = 1048576
+
+DAY_LABELS = ("월", "화", "수", "목", "금", "토", "일")
+SECTION_LABELS = {"departures": "출발", "arrivals": "도착"}
+
+Column = Tuple[str, Callable[[Dict], str]]
+
+
+class ExportError(ValueError):
+    """잘못된 내보내기 조건 (400)"""
+
+
+def _field(key: str) -> Callable[[Dict], str]:
+    return lambda row: row.get(key) or ''
+
+
+def _day(key: str) -> Callable[[Dict], str]:
+    return lambda row: 'O' if (row.get("days") or {}).get(key) else ''
+
+
+SCHEDULE_COLUMNS: List[Column] = [
+    ("항공사", _field("airline")),
+    ("편명", _field("flightNo")),
+    ("도착지", _field("destination")),
+    ("출발시간", _field("departureTime")),
+    ("도착시간", _field("arrivalTime")),
+    *((label, _day(key)) for label, key in zip(DAY_LABELS, DAY_KEYS))
+]
+
+LIVE_COLUMNS: List[Column] = [
+    ("구분", lambda row: SECTION_LABELS.get(row.get("section"), row.get("section") or '')),
+    ("항공사", _field("airline")),
+    ("편명", _field("flightNo")),
+    ("도착지/출발지", _field("destination")),
+    ("예정시간", _field("scheduledTime")),
+    ("예상시간", _field("estimatedTime")),
+    ("상태", _field("status"))
+]
+
+
+def columns(kind: str, multi_airport: bool, archived: bool) -> List[Column]:
+    """표 형식(CSV/XLSX) 컬럼 (여러 공항이면 공항, 기간 조회면 수집 시각 컬럼 추가)"""
+    prefix: List[Column] = []
+    if multi_airport:
+        prefix.append(("공항", _field("airport")))
+    if archived:
+        prefix.append(("수집시각", _field("crawledAt")))
+    return prefix + (SCHEDULE_COLUMNS if kind == "schedule" else LIVE_COLUMNS)
+
+
+def parse_range(start: Optional[str], end: Optional[str]) -> Tuple[Optional[datetime], Optional[datetime]]:
+    """기간 (YYYY-MM-DD 또는 ISO 시각). 날짜만 준 종료일은 그날 끝까지, 종료를 생략하면 현재까지"""
+    if start is None:
+        if end is not None:
+            raise ExportError("from is required when to is given")
+        return None, None
+
+    def parse(value: str, name: str) -> datetime:
+        try:
+            parsed = datetime.fromisoformat(value)
+        except ValueError:
+            raise ExportError(f"{name} must be YYYY-MM-DD or an ISO datetime")
+        if parsed.tzinfo is not None:
+            # 아카이브 수집 시각은 서버 현지 시각
+            parsed = parsed.astimezone().replace(tzinfo=None)
+        return parsed
+
+    start_at = parse(start, "from")
+    end_at = datetime.now() if end is None else parse(end, "to")
+    if end is not None and len(end) == 10:
+        end_at = datetime.combine(end_at.date(), time.max)
+    if start_at > end_at:
+        raise ExportError("from must not be later than to")
+    return start_at, end_at
+
+
+def export_rows(storage, kind: str, airport_codes: Sequence[str],
+                start: Optional[datetime] = None, end: Optional[datetime] = None) -> Iterator[Dict]:
+    """내보낼 행 (공항 순, 각 행에 airport 포함)"""
+    if start is None:
+        source = storage.db.iter_schedules if kind == "schedule" else storage.db.iter_live_status
+        for airport_code, row in source(airport_codes):
+            yield {"airport": airport_code, **row}
+        return
+
+    for airport_code in airport_codes:
+        for row in storage.query(airport_code, start, end, kind=kind):
+            yield {"airport": airport_code, **row}
+
+
+# 인코딩
+
+def encode_csv(table: List[Column], rows: Iterable[Dict]) -> Iterator[bytes]:
+    """CSV (Excel에서 한글이 깨지지 않도록 BOM 포함)"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    buffer.write('\ufeff')
+    writer.writerow([header for header, _ in table])
+    getters = [getter for _, getter in table]
+    for row in rows:
+        writer.writerow([getter(row) for getter in getters])
+        if buffer.tell() >= CHUNK_SIZE:
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode('utf-8')
+
+
+def encode_ndjson(rows: Iterable[Dict]) -> Iterator[bytes]:
+    """한 줄에 행 하나 (저장소 필드 그대로)"""
+    chunk = []
+    size = 0
+    for row in rows:
+        line = json.dumps(row, ensure_ascii=False, separators=(',', ':')).encode('utf-8') + b"\n"
+        chunk.append(line)
+        size += len(line)
+        if size >= CHUNK_SIZE:
+            yield b"".join(chunk)
+            chunk.clear()
+            size = 0
+    yield b"".join(chunk)
+
+
+class _ChunkSink:
+    """ZipFile 출력 대상 (쓴 바이트를 모아 두었다가 조각으로 꺼냄, seek 불가라 ZIP은 앞에서부터 기록)"""
+
+    def __init__(self):
+        self.chunks: List[bytes] = []
+        self.size = 0
+
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        self.size += len(data)
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks.clear()
+        self.size = 0
+        return data
+
+
+# XML 1.0에서 허용하지 않는 제어 문자
+_INVALID_XML = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+XLSX_MAIN_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+XLSX_REL_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+XML_HEADER = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+
+
+def _column_letter(index: int) -> str:
+    letters = ""
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+
+def _xlsx_row(number: int, letters: Sequence[str], values: Sequence[str]) -> str:
+    cells = []
+    for letter, value in zip(letters, values):
+        if not value:
+            continue
+        value = _INVALID_XML.sub('', str(value))
+        space = ' xml:space="preserve"' if value != value.strip() else ''
+        cells.append(f'<c r="{letter}{number}" t="inlineStr"><is><t{space}>{escape(value)}</t></is></c>')
+    return f'<row r="{number}">{"".join(cells)}</row>'
+
+
+def _xlsx_parts(sheet_count: int) -> Dict[str, str]:
+    """시트 외 통합 문서 구성 파일 (시트 수는 다 쓴 뒤에 알 수 있으므로 ZIP 끝에 기록)"""
+    numbers = range(1, sheet_count + 1)
+    overrides = "".join(
+        f'<Override PartName="/xl/worksheets/sheet{n}.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        for n in numbers
+    )
+    sheets = "".join(
+        f'<sheet name={quoteattr("Sheet" + str(n))} sheetId="{n}" r:id="rId{n}"/>' for n in numbers
+    )
+    relationships = "".join(
+        f'<Relationship Id="rId{n}" Type="{XLSX_REL_NS}/worksheet" Target="worksheets/sheet{n}.xml"/>'
+        for n in numbers
+    )
+    return {
+        "xl/workbook.xml": (
+            f'{XML_HEADER}<workbook xmlns="{XLSX_MAIN_NS}" xmlns:r="{XLSX_REL_NS}"><sheets>{sheets}</sheets></workbook>'
+        ),
+        "xl/_rels/workbook.xml.rels": (
+            f'{XML_HEADER}<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            f'{relationships}</Relationships>'
+        ),
+        "_rels/.rels": (
+            f'{XML_HEADER}<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            f'<Relationship Id="rId1" Type="{XLSX_REL_NS}/officeDocument" Target="xl/workbook.xml"/>'
+            '</Relationships>'
+        ),
+        "[Content_Types].xml": (
+            f'{XML_HEADER}<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/xl/workbook.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+            f'{overrides}</Types>'
+        )
+    }
+
+
+def encode_xlsx(table: List[Column], rows: Iterable[Dict]) -> Iterator[bytes]:
+    """XLSX (인라인 문자열 셀, 시트마다 머리 행 반복)"""
+    headers = [header for header, _ in table]
+    getters = [getter for _, getter in table]
+    letters = [_column_letter(i) for i in range(len(table))]
+
+    sink = _ChunkSink()
+    archive = zipfile.ZipFile(sink, 'w', compression=zipfile.ZIP_DEFLATED)
+    sheet_count = 0
+    sheet = None
+    number = 0
+
+    def open_sheet():
+        nonlocal sheet, sheet_count, number
+        sheet_count += 1
+        # 크기를 미리 알 수 없으므로 4GB를 넘어도 되도록 ZIP64로 기록
+        sheet = archive.open(f"xl/worksheets/sheet{sheet_count}.xml", 'w', force_zip64=True)
+        sheet.write(f'{XML_HEADER}<worksheet xmlns="{XLSX_MAIN_NS}"><sheetData>'.encode('utf-8'))
+        number = 1
+        sheet.write(_xlsx_row(number, letters, headers).encode('utf-8'))
+
+    def close_sheet():
+        sheet.write(b'</sheetData></worksheet>')
+        sheet.close()
+
+    open_sheet()
+    for row in rows:
+        if number == MAX_SHEET_ROWS:
+            close_sheet()
+            open_sheet()
+        number += 1
+        sheet.write(_xlsx_row(number, letters, [getter(row) for getter in getters]).encode('utf-8'))
+        if sink.size >= CHUNK_SIZE:
+            yield sink.drain()
+    close_sheet()
+
+    for name, content in _xlsx_parts(sheet_count).items():
+        archive.writestr(name, content)
+    archive.close()
+    yield sink.drain()
+
+
+def export_response(storage, kind: str, airport_codes: Sequence[str], format: str,
+                    start: Optional[datetime] = None, end: Optional[datetime] = None) -> StreamingResponse:
+    """내보내기 스트리밍 응답 (첨부 파일)"""
+    rows = export_rows(storage, kind, airport_codes, start, end)
+    if format == "ndjson":
+        body = encode_ndjson(rows)
+    else:
+        table = columns(kind, len(airport_codes) > 1, start is not None)
+        body = (encode_csv if format == "csv" else encode_xlsx)(table, rows)
+
+    filename = f"{kind}_{'-'.join(airport_codes)}"
+    if start is not None:
+        filename += f"_{start:%Y%m%d}-{end:%Y%m%d}"
+    return StreamingResponse(
+        body,
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{format}"'}
+    )
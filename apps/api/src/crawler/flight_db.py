@@ -0,0 +1,354 @@
+"""
+SQLite 항공편 저장소
+WAL 모드로 크롤러가 쓰는 동안에도 API가 동시에 읽을 수 있음
+- crawl_runs:   크롤링 실행 기록
+- airports:     공항별 최신 스케줄 메타데이터
+- flights:      스케줄 항공편 (origin, destination, flightNo, airline, 출발시간 인덱스)
+- flight_days:  항공편 운항 요일 (0=월 ... 6=일)
+- live_status:  공항별 최신 실시간 출도착 현황
+"""
+
+import json
+import sqlite3
+import threading
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from flight_record import Flight
+from table_extract import DAY_KEYS, mask_to_days
+
+LIVE_FIELDS = ("airline", "flightNo", "destination", "scheduledTime", "estimatedTime", "status")
+LIVE_SECTIONS = ("departures", "arrivals")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS crawl_runs (
+    id INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL,
+    airport TEXT NOT NULL,
+    crawled_at TEXT,
+    flight_count INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS airports (
+    code TEXT PRIMARY KEY,
+    name TEXT,
+    crawled_at TEXT,
+    run_id INTEGER REFERENCES crawl_runs(id),
+    extra TEXT
+);
+
+CREATE TABLE IF NOT EXISTS flights (
+    id INTEGER PRIMARY KEY,
+    origin TEXT NOT NULL,
+    destination TEXT,
+    airline TEXT,
+    flight_no TEXT,
+    departure_time TEXT,
+    arrival_time TEXT,
+    has_days INTEGER NOT NULL DEFAULT 1,
+    extra TEXT,
+    run_id INTEGER REFERENCES crawl_runs(id)
+);
+
+CREATE TABLE IF NOT EXISTS flight_days (
+    flight_id INTEGER NOT NULL REFERENCES flights(id) ON DELETE CASCADE,
+    weekday INTEGER NOT NULL,
+    PRIMARY KEY (flight_id, weekday)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS live_status (
+    id INTEGER PRIMARY KEY,
+    airport TEXT NOT NULL,
+    section TEXT NOT NULL,
+    airline TEXT,
+    flight_no TEXT,
+    destination TEXT,
+    scheduled_time TEXT,
+    estimated_time TEXT,
+    status TEXT,
+    run_id INTEGER REFERENCES crawl_runs(id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_flights_route ON flights(origin, destination);
+CREATE INDEX IF NOT EXISTS idx_flights_flight_no ON flights(flight_no);
+CREATE INDEX IF NOT EXISTS idx_flights_airline ON flights(airline);
+CREATE INDEX IF NOT EXISTS idx_flights_departure ON flights(origin, departure_time);
+CREATE INDEX IF NOT EXISTS idx_live_airport ON live_status(airport, section);
+CREATE INDEX IF NOT EXISTS idx_live_flight_no ON live_status(flight_no);
+CREATE INDEX IF NOT EXISTS idx_crawl_runs_airport ON crawl_runs(airport, kind);
+"""
+
+# 자주 쓰는 조회 (sqlite3 모듈이 문장 단위로 준비된 구문을 캐시)
+SELECT_FLIGHTS = """
+SELECT f.origin, f.destination, f.airline, f.flight_no, f.departure_time, f.arrival_time,
+       f.has_days, f.extra, COALESCE(SUM(1 << d.weekday), 0) AS days_mask
+FROM flights f
+LEFT JOIN flight_days d ON d.flight_id = f.id
+WHERE {where}
+GROUP BY f.id
+ORDER BY f.id
+"""
+SELECT_AIRPORT = "SELECT code, name, crawled_at, extra FROM airports WHERE code = ?"
+SELECT_AIRPORTS = """
+SELECT a.code, a.name, COUNT(f.id)
+FROM airports a LEFT JOIN flights f ON f.origin = a.code
+GROUP BY a.code ORDER BY a.rowid
+"""
+SELECT_DESTINATIONS = """
+SELECT DISTINCT destination FROM flights
+WHERE origin = ? AND destination IS NOT NULL AND destination != ''
+ORDER BY destination
+"""
+SELECT_LIVE = """
+SELECT section, airline, flight_no, destination, scheduled_time, estimated_time, status
+FROM live_status WHERE airport = ? ORDER BY id
+"""
+SELECT_LIVE_RUN = """
+SELECT crawled_at FROM crawl_runs WHERE airport = ? AND kind = 'live' ORDER BY id DESC LIMIT 1
+"""
+
+
+class FlightDB:
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+
+        with self._connection() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        """스레드별 연결 (sqlite3 연결은 스레드 간 공유하지 않음)"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, cached_statements=256)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            self._local.conn = conn
+        return conn
+
+    # 쓰기
+
+    def _insert_run(self, conn: sqlite3.Connection, kind: str, airport_code: str,
+                    crawled_at: Optional[str], count: int) -> int:
+        cursor = conn.execute(
+            "INSERT INTO crawl_runs (kind, airport, crawled_at, flight_count) VALUES (?, ?, ?, ?)",
+            (kind, airport_code, crawled_at, count)
+        )
+        return cursor.lastrowid
+
+    def _replace_schedule(self, conn: sqlite3.Connection, airport_code: str, data: Dict):
+        flights = data.get("flights", [])
+        run_id = self._insert_run(conn, "schedule", airport_code, data.get("crawledAt"), len(flights))
+
+        airport_extra = {
+            k: v for k, v in data.items()
+            if k not in ("airport", "airportName", "crawledAt", "totalFlights", "flights")
+        }
+        conn.execute(
+            "INSERT OR REPLACE INTO airports (code, name, crawled_at, run_id, extra) VALUES (?, ?, ?, ?, ?)",
+            (airport_code, data.get("airportName"), data.get("crawledAt"), run_id,
+             json.dumps(airport_extra, ensure_ascii=False) if airport_extra else None)
+        )
+        conn.execute("DELETE FROM flights WHERE origin = ?", (airport_code,))
+
+        # id를 직접 배정해 항공편/요일을 각각 executemany 한 번으로 기록 (같은 트랜잭션 안이라 안전)
+        next_id = conn.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM flights").fetchone()[0]
+        flight_rows = []
+        day_rows = []
+        for flight_id, flight in enumerate(flights, start=next_id):
+            record = flight if isinstance(flight, Flight) else Flight.from_dict(flight)
+            # 유효기간은 extra 컬럼에 함께 보관 (읽을 때 원래 키로 복원)
+            extra = {**record.validity(), **record.extra_dict()}
+            flight_rows.append(
+                (flight_id, airport_code, record.destination, record.airline, record.flight_no,
+                 record.departure_time, record.arrival_time, int(record.days_mask is not None),
+                 json.dumps(extra, ensure_ascii=False) if extra else None, run_id)
+            )
+            mask = record.days_mask or 0
+            day_rows.extend((flight_id, weekday) for weekday in range(len(DAY_KEYS)) if mask >> weekday & 1)
+
+        conn.executemany(
+            """INSERT INTO flights
+               (id, origin, destination, airline, flight_no, departure_time, arrival_time, has_days, extra, run_id)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+            flight_rows
+        )
+        conn.executemany("INSERT INTO flight_days (flight_id, weekday) VALUES (?, ?)", day_rows)
+
+    def replace_schedule(self, airport_code: str, data: Dict):
+        """공항 스케줄 전체 교체 (한 트랜잭션)"""
+        conn = self._connection()
+        with conn:
+            self._replace_schedule(conn, airport_code, data)
+
+    def import_schedules(self, schedules: Union[Mapping, Iterable[Tuple[str, Dict]]], replace_all: bool = True):
+        """{공항코드: 스케줄} 또는 (공항코드, 스케줄) 순회를 한 트랜잭션으로 반영
+        (replace_all이면 목록에 없는 공항은 삭제)"""
+        items = schedules.items() if isinstance(schedules, Mapping) else schedules
+        conn = self._connection()
+        with conn:
+            if replace_all:
+                conn.execute("DELETE FROM flights")
+                conn.execute("DELETE FROM airports")
+            for airport_code, data in items:
+                self._replace_schedule(conn, airport_code, data)
+
+    def import_json_file(self, path: Path) -> Dict[str, Dict]:
+        """korean_flight_schedules.json 형식 파일을 DB로 가져오기 (읽은 스케줄 반환)"""
+        with open(path, 'r', encoding='utf-8') as f:
+            schedules = json.load(f)
+        self.import_schedules(schedules)
+        return schedules
+
+    def replace_live_status(self, airport_code: str, data: Dict):
+        """공항 실시간 현황 전체 교체 (한 트랜잭션)"""
+        flights = [
+            (section, flight)
+            for section in LIVE_SECTIONS
+            for flight in data.get(section, [])
+        ]
+
+        conn = self._connection()
+        with conn:
+            run_id = self._insert_run(conn, "live", airport_code, data.get("crawledAt"), len(flights))
+            conn.execute("DELETE FROM live_status WHERE airport = ?", (airport_code,))
+            conn.executemany(
+                """INSERT INTO live_status
+                   (airport, section, airline, flight_no, destination, scheduled_time, estimated_time, status, run_id)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                [
+                    (airport_code, section, flight.get("airline"), flight.get("flightNo"),
+                     flight.get("destination"), flight.get("scheduledTime"), flight.get("estimatedTime"),
+                     flight.get("status"), run_id)
+                    for section, flight in flights
+                ]
+            )
+
+    # 읽기
+
+    @staticmethod
+    def _flight_dict(row: tuple) -> Dict:
+        origin, destination, airline, flight_no, dep, arr, has_days, extra, mask = row
+        flight = {
+            "airline": airline,
+            "flightNo": flight_no,
+            "destination": destination,
+            "departureTime": dep,
+            "arrivalTime": arr
+        }
+        if has_days:
+            flight["days"] = mask_to_days(mask)
+        if extra:
+            flight.update(json.loads(extra))
+        return flight
+
+    def _flights(self, where: str, params: tuple) -> List[Dict]:
+        return [
+            self._flight_dict(row)
+            for row in self._connection().execute(SELECT_FLIGHTS.format(where=where), params)
+        ]
+
+    def has_airport(self, airport_code: str) -> bool:
+        return self._connection().execute(SELECT_AIRPORT, (airport_code,)).fetchone() is not None
+
+    def get_schedule(self, airport_code: str) -> Optional[Dict]:
+        """공항 스케줄 (JSON 파일과 같은 형식)"""
+        row = self._connection().execute(SELECT_AIRPORT, (airport_code,)).fetchone()
+        if row is None:
+            return None
+
+        code, name, crawled_at, extra = row
+        flights = self._flights("f.origin = ?", (airport_code,))
+        schedule = {"airport": code}
+        if name is not None:
+            schedule["airportName"] = name
+        schedule["crawledAt"] = crawled_at
+        if extra:
+            schedule.update(json.loads(extra))
+        schedule["totalFlights"] = len(flights)
+        schedule["flights"] = flights
+        return schedule
+
+    def get_route(self, origin: str, destination: str) -> List[Dict]:
+        return self._flights("f.origin = ? AND f.destination = ?", (origin, destination))
+
+    def get_flights_by_number(self, flight_no: str) -> List[Dict]:
+        return self._flights("f.flight_no = ?", (flight_no,))
+
+    def get_destinations(self, origin: str) -> List[str]:
+        return [row[0] for row in self._connection().execute(SELECT_DESTINATIONS, (origin,))]
+
+    def list_airports(self) -> List[Dict]:
+        return [
+            {"code": code, "name": name or code, "totalFlights": total}
+            for code, name, total in self._connection().execute(SELECT_AIRPORTS)
+        ]
+
+    def get_crawled_at(self, airport_code: str) -> Optional[str]:
+        row = self._connection().execute(SELECT_AIRPORT, (airport_code,)).fetchone()
+        return row[2] if row else None
+
+    def has_live_status(self, airport_code: str) -> bool:
+        return self._connection().execute(SELECT_LIVE_RUN, (airport_code,)).fetchone() is not None
+
+    def get_live_status(self, airport_code: str) -> Optional[Dict]:
+        """공항 실시간 현황 (JSON 파일과 같은 형식)"""
+        conn = self._connection()
+        run = conn.execute(SELECT_LIVE_RUN, (airport_code,)).fetchone()
+        if run is None:
+            return None
+
+        live = {"airport": airport_code, "crawledAt": run[0], "departures": [], "arrivals": []}
+        for section, *values in conn.execute(SELECT_LIVE, (airport_code,)):
+            live[section].append(dict(zip(LIVE_FIELDS, values)))
+        return live
+
+    # 스트리밍 읽기 (내보내기용)
+
+    def _reader(self) -> sqlite3.Connection:
+        """내보내기 전용 읽기 연결
+        응답 생성기는 조각마다 다른 스레드에서 이어 실행될 수 있으므로 스레드별 연결을 쓰지 않고
+        한 읽기 트랜잭션 안에서 여러 공항을 같은 시점으로 읽음"""
+        conn = sqlite3.connect(f"{self.path.resolve().as_uri()}?mode=ro", uri=True, timeout=30,
+                               check_same_thread=False)
+        conn.execute("BEGIN")
+        return conn
+
+    def iter_schedules(self, airport_codes: Sequence[str]) -> Iterator[Tuple[str, Dict]]:
+        """(공항코드, 항공편) 순회 (커서에서 한 행씩 읽어 전체 목록을 만들지 않음)"""
+        conn = self._reader()
+        try:
+            for airport_code in airport_codes:
+                for row in conn.execute(SELECT_FLIGHTS.format(where="f.origin = ?"), (airport_code,)):
+                    yield airport_code, self._flight_dict(row)
+        finally:
+            conn.close()
+
+    def iter_live_status(self, airport_codes: Sequence[str]) -> Iterator[Tuple[str, Dict]]:
+        """(공항코드, 출도착 항공편) 순회 (항공편에 section 포함)"""
+        conn = self._reader()
+        try:
+            for airport_code in airport_codes:
+                for section, *values in conn.execute(SELECT_LIVE, (airport_code,)):
+                    yield airport_code, {"section": section, **dict(zip(LIVE_FIELDS, values))}
+        finally:
+            conn.close()
+
+    def statistics(self) -> Dict:
+        conn = self._connection()
+        total_airports, = conn.execute("SELECT COUNT(*) FROM airports").fetchone()
+        total_flights, total_routes, total_airlines = conn.execute(
+            """SELECT COUNT(*),
+                      COUNT(DISTINCT CASE WHEN destination != '' THEN origin || '-' || destination END),
+                      COUNT(DISTINCT NULLIF(airline, ''))
+               FROM flights"""
+        ).fetchone()
+        return {
+            "total_airports": total_airports,
+            "total_flights": total_flights,
+            "total_routes": total_routes,
+            "total_airlines": total_airlines
+        }
@@ -0,0 +1,196 @@
+"""
+항공편 레코드 (메모리 절약형)
+메모리에 오래 두는 항공편은 dict 대신 __slots__ 클래스로 보관
+- 항공사/공항 코드는 sys.intern으로 공유
+- 시간은 자정 기준 분(int), HH:MM 형식이 아닌 값은 원문 문자열 그대로
+- 운항 요일은 7비트 마스크 (bit0 = 월요일)
+- 유효기간(validFrom/validTo, YYYY-MM-DD)은 date 서수(int)
+to_dict()는 기존 JSON 형식과 같은 dict를 돌려줌 (from_dict -> to_dict 무손실)
+"""
+
+import sys
+from datetime import date
+from typing import Dict, Optional, Tuple, Union
+
+from table_extract import DAY_KEYS, days_to_mask, mask_to_days
+
+# 레코드 필드로 저장하는 키 (나머지 키는 extra에 보관)
+CORE_FIELDS = ("airline", "flightNo", "destination", "departureTime", "arrivalTime")
+TIME_FIELDS = ("departureTime", "arrivalTime")
+VALIDITY_FIELDS = ("validFrom", "validTo")
+# 크롤러/Excel이 함께 기록하는 부가 키 (extra로 보관)
+EXTRA_FIELDS = ("origin", "aircraft", "status")
+# to_dict()가 돌려줄 수 있는 키
+FLIGHT_FIELDS = CORE_FIELDS + ("days",) + VALIDITY_FIELDS + EXTRA_FIELDS
+
+Time = Union[int, str]
+
+
+def parse_minutes(text: str) -> Time:
+    """"HH:MM" -> 자정 기준 분 (다른 형식은 그대로 반환)"""
+    if len(text) == 5 and text[2] == ":" and text[:2].isdigit() and text[3:].isdigit():
+        hours, minutes = int(text[:2]), int(text[3:])
+        if hours < 24 and minutes < 60:
+            return hours * 60 + minutes
+    return text
+
+
+def format_minutes(value: Optional[Time]) -> Optional[str]:
+    if type(value) is int:
+        return f"{value // 60:02d}:{value % 60:02d}"
+    return value
+
+
+def parse_date_ordinal(text: str) -> Optional[int]:
+    """"YYYY-MM-DD" -> date 서수 (다른 형식은 None)"""
+    if len(text) != 10 or text[4] != "-" or text[7] != "-":
+        return None
+    try:
+        return date.fromisoformat(text).toordinal()
+    except ValueError:
+        return None
+
+
+def format_date_ordinal(value: Optional[int]) -> Optional[str]:
+    return date.fromordinal(value).isoformat() if value is not None else None
+
+
+def _is_day_map(days) -> bool:
+    return (
+        isinstance(days, dict)
+        and len(days) == len(DAY_KEYS)
+        and all(type(days.get(key)) is bool for key in DAY_KEYS)
+    )
+
+
+class Flight:
+    """스케줄 항공편 1건 (None인 필드는 원본에 없던 키)"""
+
+    __slots__ = ("airline", "flight_no", "destination", "departure", "arrival", "days_mask",
+                 "valid_from", "valid_to", "extra")
+
+    def __init__(self, airline: Optional[str], flight_no: Optional[str], destination: Optional[str],
+                 departure: Optional[Time], arrival: Optional[Time], days_mask: Optional[int] = None,
+                 extra: Optional[Tuple[Tuple[str, object], ...]] = None,
+                 valid_from: Optional[int] = None, valid_to: Optional[int] = None):
+        self.airline = airline
+        self.flight_no = flight_no
+        self.destination = destination
+        self.departure = departure
+        self.arrival = arrival
+        self.days_mask = days_mask
+        self.valid_from = valid_from
+        self.valid_to = valid_to
+        self.extra = extra
+
+    @classmethod
+    def from_dict(cls, flight: Dict) -> "Flight":
+        core = {}
+        extra = []
+        for key, value in flight.items():
+            if key in CORE_FIELDS and type(value) is str:
+                if key in TIME_FIELDS:
+                    value = parse_minutes(value)
+                elif key != "flightNo":
+                    value = sys.intern(value)
+                core[key] = value
+            elif key == "days" and _is_day_map(value):
+                core[key] = days_to_mask(value)
+            elif key in VALIDITY_FIELDS and type(value) is str and parse_date_ordinal(value) is not None:
+                core[key] = parse_date_ordinal(value)
+            else:
+                extra.append((key, value))
+
+        return cls(
+            core.get("airline"),
+            core.get("flightNo"),
+            core.get("destination"),
+            core.get("departureTime"),
+            core.get("arrivalTime"),
+            core.get("days"),
+            tuple(extra) or None,
+            core.get("validFrom"),
+            core.get("validTo")
+        )
+
+    def to_dict(self) -> Dict:
+        flight = {}
+        for key, value in (
+            ("airline", self.airline),
+            ("flightNo", self.flight_no),
+            ("destination", self.destination),
+            ("departureTime", format_minutes(self.departure)),
+            ("arrivalTime", format_minutes(self.arrival))
+        ):
+            if value is not None:
+                flight[key] = value
+        if self.days_mask is not None:
+            flight["days"] = mask_to_days(self.days_mask)
+        flight.update(self.validity())
+        if self.extra:
+            flight.update(self.extra)
+        return flight
+
+    @property
+    def departure_time(self) -> Optional[str]:
+        return format_minutes(self.departure)
+
+    @property
+    def arrival_time(self) -> Optional[str]:
+        return format_minutes(self.arrival)
+
+    @property
+    def days(self) -> Optional[Dict[str, bool]]:
+        return mask_to_days(self.days_mask) if self.days_mask is not None else None
+
+    def validity(self) -> Dict[str, str]:
+        """유효기간 키 (원본에 있던 것만)"""
+        period = {}
+        if self.valid_from is not None:
+            period["validFrom"] = format_date_ordinal(self.valid_from)
+        if self.valid_to is not None:
+            period["validTo"] = format_date_ordinal(self.valid_to)
+        return period
+
+    def operates_on(self, day: date) -> bool:
+        """해당 날짜 운항 여부 (요일 정보가 없으면 매일, 유효기간이 없으면 무제한)"""
+        if self.days_mask is not None and not self.days_mask >> day.weekday() & 1:
+            return False
+        ordinal = day.toordinal()
+        if self.valid_from is not None and ordinal < self.valid_from:
+            return False
+        return self.valid_to is None or ordinal <= self.valid_to
+
+    def extra_dict(self) -> Dict:
+        return dict(self.extra) if self.extra else {}
+
+    def _key(self) -> Tuple:
+        return (self.airline, self.flight_no, self.destination, self.departure, self.arrival,
+                self.days_mask, self.valid_from, self.valid_to, self.extra)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Flight) and self._key() == other._key()
+
+    def __repr__(self) -> str:
+        return f"Flight({self.flight_no} {self.airline} -> {self.destination} {self.departure_time})"
+
+
+def compact_schedule(data: Dict) -> Dict:
+    """스케줄 dict의 flights를 Flight 레코드로 변환 (이미 변환된 항목은 그대로)"""
+    flights = data.get("flights")
+    if not isinstance(flights, list):
+        return data
+    return {
+        **data,
+        "flights": [Flight.from_dict(f) if isinstance(f, dict) else f for f in flights]
+    }
+
+
+def schedule_to_json(data: Optional[Dict]) -> Optional[Dict]:
+    """Flight 레코드를 담은 스케줄을 기존 JSON 형식 dict로"""
+    if data is None:
+        return None
+    return {
+        **data,
+        "flights": [f.to_dict() if isinstance(f, Flight) else f for f in data.get("flights", [])]
+    }
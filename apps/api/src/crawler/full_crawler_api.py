@@ -1,14 +1,21 @@
 """
 전체 항공편 데이터를 제공하는 향상된 API
 """
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from datetime import datetime
-import json
+from datetime import datetime, timedelta
 import os
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from pathlib import Path
 
+from flight_db import FlightDB
+from data_source import FlightDataSource
+from response_cache import ResponseCache
+from schedule_query import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, index_page_response, wants_page
+from itinerary import DEFAULT_MAX_LEGS, MAX_LEGS, search as search_itineraries
+from search_index import DEFAULT_LIMIT, MAX_LIMIT, TYPES as SEARCH_TYPES
+from timetable import MAX_RANGE_DAYS
+
 app = FastAPI(title="Korean Flight Schedule API - Full Data")
 
 # CORS 설정
@@ -20,32 +27,47 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# 전체 항공편 데이터 로드
-def load_flight_data():
-    """전체 항공편 데이터 로드"""
-    data_file = Path(__file__).parent / "korean_flight_schedules.json"
-    if data_file.exists():
-        with open(data_file, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    return {}
+# 항공편 데이터 (JSON 파일 또는 out/latest 디렉토리를 감시해 SQLite/노선 색인으로 반영)
+DATA_PATH = Path(os.getenv("FLIGHT_DATA_PATH", str(Path(__file__).parent / "korean_flight_schedules.json")))
+DB_PATH = Path(os.getenv("FLIGHT_DB_PATH", str(Path(__file__).parent / "flights.db")))
+
+FLIGHT_DB = FlightDB(DB_PATH)
+
+# 직렬화된 응답 캐시 (새 데이터가 반영될 때만 무효화)
+RESPONSE_CACHE = ResponseCache()
+
+DATA_SOURCE = FlightDataSource(
+    DATA_PATH, FLIGHT_DB,
+    on_reload=lambda snapshot: RESPONSE_CACHE.publish(snapshot.version)
+)
 
 # 시작시 데이터 로드
-FLIGHT_DATA = load_flight_data()
+DATA_SOURCE.reload()
+
+@app.on_event("startup")
+async def startup_event():
+    """파일 감시 시작"""
+    DATA_SOURCE.start()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    DATA_SOURCE.stop()
 
 @app.get("/health")
 async def health():
     """헬스 체크"""
-    total_flights = sum(data.get('totalFlights', 0) for data in FLIGHT_DATA.values())
+    snapshot = DATA_SOURCE.snapshot
+    stats = snapshot.index.statistics
     return {
         "status": "healthy",
         "crawl_status": {
-            "last_schedule_crawl": datetime.now().isoformat(),
+            "last_schedule_crawl": snapshot.loaded_at.isoformat(),
             "last_live_crawl": datetime.now().isoformat(),
             "last_schedule_status": "success",
             "last_live_status": "success",
             "failed_airports": [],
-            "total_airports": len(FLIGHT_DATA),
-            "total_flights": total_flights
+            "total_airports": stats["total_airports"],
+            "total_flights": stats["total_flights"]
         },
         "timestamp": datetime.now().isoformat()
     }
@@ -53,13 +75,7 @@ async def health():
 @app.get("/api/airports")
 async def get_airports():
     """지원 공항 목록"""
-    airports = []
-    for code, data in FLIGHT_DATA.items():
-        airports.append({
-            "code": code,
-            "name": data.get("airportName", code),
-            "totalFlights": data.get("totalFlights", 0)
-        })
+    airports = DATA_SOURCE.snapshot.index.airports
     
     return {
         "airports": airports,
@@ -67,88 +83,184 @@ async def get_airports():
     }
 
 @app.get("/api/schedule/{airport_code}")
-async def get_schedule(airport_code: str):
-    """특정 공항의 전체 항공편 스케줄"""
+async def get_schedule(
+    airport_code: str,
+    request: Request,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="페이지 크기"),
+    cursor: Optional[str] = Query(None, description="이전 응답의 nextCursor"),
+    fields: Optional[str] = Query(None, description="응답 필드 (쉼표 구분, 예: flightNo,destination,departureTime)"),
+    airline: Optional[str] = Query(None, description="항공사 (쉼표 구분)"),
+    destination: Optional[str] = Query(None, description="도착 공항 (쉼표 구분)"),
+    departure_from: Optional[str] = Query(None, alias="departureFrom", description="출발시간 HH:MM 이후"),
+    departure_to: Optional[str] = Query(None, alias="departureTo", description="출발시간 HH:MM 이전"),
+    weekday: Optional[str] = Query(None, description="운항 요일 (mon~sun)")
+):
+    """특정 공항의 항공편 스케줄 (조회 조건이 없으면 전체 문서, 있으면 필터/필드 선택/커서 페이지)"""
     airport_code = airport_code.upper()
     
-    if airport_code not in FLIGHT_DATA:
-        raise HTTPException(status_code=404, detail=f"Airport {airport_code} not found")
+    if wants_page(request.query_params):
+        # 조회 조건이 있으면 메모리 색인에서 해당 페이지만 스트리밍
+        snapshot = DATA_SOURCE.snapshot
+        return index_page_response(
+            snapshot.index, snapshot.version, airport_code,
+            limit=limit, cursor=cursor, fields=fields, airline=airline, destination=destination,
+            departure_from=departure_from, departure_to=departure_to, weekday=weekday
+        )
+    
+    def build():
+        schedule = DATA_SOURCE.get_schedule(airport_code)
+        if schedule is None:
+            raise HTTPException(status_code=404, detail=f"Airport {airport_code} not found")
+        return schedule
     
-    return FLIGHT_DATA[airport_code]
+    return RESPONSE_CACHE.respond(request, ("schedule", airport_code), build)
 
 @app.get("/api/schedule/{airport_code}/destinations")
 async def get_destinations(airport_code: str):
     """특정 공항에서 갈 수 있는 모든 도착지 목록"""
     airport_code = airport_code.upper()
     
-    if airport_code not in FLIGHT_DATA:
+    destinations = DATA_SOURCE.snapshot.index.destinations(airport_code)
+    if destinations is None:
         raise HTTPException(status_code=404, detail=f"Airport {airport_code} not found")
     
-    destinations = set()
-    for flight in FLIGHT_DATA[airport_code].get('flights', []):
-        if flight.get('destination'):
-            destinations.add(flight['destination'])
-    
     return {
         "airport": airport_code,
-        "destinations": sorted(list(destinations)),
+        "destinations": list(destinations),
         "total": len(destinations)
     }
 
 @app.get("/api/schedule/{departure_code}/{arrival_code}")
-async def get_route_schedule(departure_code: str, arrival_code: str):
-    """특정 노선의 항공편 스케줄"""
+async def get_route_schedule(
+    departure_code: str,
+    arrival_code: str,
+    request: Request,
+    date: Optional[str] = Query(None, description="운항일 YYYY-MM-DD (지정하면 해당 날짜부터 일자별로 전개)"),
+    days: int = Query(1, ge=1, le=MAX_RANGE_DAYS, description="date부터 조회할 일수")
+):
+    """특정 노선의 항공편 스케줄 (date 지정 시 운항일 기준 일자별 목록)"""
     departure_code = departure_code.upper()
     arrival_code = arrival_code.upper()
     
-    if departure_code not in FLIGHT_DATA:
+    index = DATA_SOURCE.snapshot.index
+    if not index.has_airport(departure_code):
         raise HTTPException(status_code=404, detail=f"Departure airport {departure_code} not found")
+    if not index.has_route(departure_code, arrival_code):
+        # 없는 노선은 캐시하지 않음 (임의의 도착 코드마다 캐시 항목이 생기지 않도록)
+        raise HTTPException(status_code=404, detail=f"Route {departure_code}-{arrival_code} not found")
     
-    # 해당 노선의 항공편만 필터링
-    route_flights = []
-    for flight in FLIGHT_DATA[departure_code].get('flights', []):
-        if flight.get('destination') == arrival_code:
-            route_flights.append(flight)
+    if date is not None:
+        try:
+            start = datetime.strptime(date, "%Y-%m-%d").date()
+        except ValueError:
+            raise HTTPException(status_code=400, detail="date must be YYYY-MM-DD")
+        try:
+            end = start + timedelta(days=days - 1)
+        except OverflowError:
+            raise HTTPException(status_code=400, detail="date range exceeds the supported calendar")
+        
+        def build_dated():
+            # 요일 마스크/유효기간 배열로 기간 전체를 한 번에 필터
+            dated_flights = index.timetable(departure_code, arrival_code).expand(start, end)
+            return {
+                "departure": departure_code,
+                "arrival": arrival_code,
+                "crawledAt": index.crawled_at(departure_code),
+                "date": start.isoformat(),
+                "endDate": end.isoformat(),
+                "totalFlights": len(dated_flights),
+                "flights": [dated.to_dict() for dated in dated_flights]
+            }
+        
+        return RESPONSE_CACHE.respond(request, ("route", departure_code, arrival_code, start, days), build_dated)
     
+    def build():
+        # 미리 만든 노선 색인에서 조회
+        route_flights = index.route(departure_code, arrival_code)
+        return {
+            "departure": departure_code,
+            "arrival": arrival_code,
+            "crawledAt": index.crawled_at(departure_code),
+            "totalFlights": len(route_flights),
+            "flights": [flight.to_dict() for flight in route_flights]
+        }
+    
+    return RESPONSE_CACHE.respond(request, ("route", departure_code, arrival_code), build)
+
+@app.get("/api/itineraries")
+async def get_itineraries(
+    request: Request,
+    origin: str = Query(..., alias="from", description="출발 공항"),
+    destination: str = Query(..., alias="to", description="도착 공항"),
+    date: Optional[str] = Query(None, description="출발일 YYYY-MM-DD (기본 오늘)"),
+    max_legs: int = Query(DEFAULT_MAX_LEGS, ge=1, le=MAX_LEGS, description="최대 구간 수"),
+    min_connection: Optional[int] = Query(None, ge=0, le=1440, description="최소 환승 시간(분), 기본은 공항별 값")
+):
+    """환승 경로 탐색 (출발시각/도착시각/구간 수 기준 파레토 최적 경로)"""
+    origin = origin.upper()
+    destination = destination.upper()
+    
+    index = DATA_SOURCE.snapshot.index
+    if not index.has_airport(origin):
+        raise HTTPException(status_code=404, detail=f"Departure airport {origin} not found")
+    
+    try:
+        day = datetime.strptime(date, "%Y-%m-%d").date() if date else datetime.now().date()
+    except ValueError:
+        raise HTTPException(status_code=400, detail="date must be YYYY-MM-DD")
+    
+    def build():
+        # 날짜별 연결 배열은 노선 색인에서 재사용
+        itineraries = search_itineraries(index.connections(day), origin, destination, max_legs, min_connection)
+        return {
+            "from": origin,
+            "to": destination,
+            "date": day.isoformat(),
+            "maxLegs": max_legs,
+            "totalItineraries": len(itineraries),
+            "itineraries": [itinerary.to_dict() for itinerary in itineraries]
+        }
+    
+    return RESPONSE_CACHE.respond(
+        request, ("itineraries", origin, destination, day, max_legs, min_connection), build
+    )
+
+@app.get("/api/search")
+async def search(
+    q: str = Query(..., min_length=1, max_length=50, description="검색어 (코드/편명/이름, 초성 가능)"),
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    types: Optional[str] = Query(None, description="결과 종류 (airport,airline,flight 중 쉼표 구분)")
+):
+    """공항/항공사/편명 자동완성"""
+    type_filter = [t.strip() for t in types.split(",") if t.strip()] if types else None
+    if type_filter and any(t not in SEARCH_TYPES for t in type_filter):
+        raise HTTPException(status_code=400, detail=f"types must be within {','.join(SEARCH_TYPES)}")
+    
+    results = DATA_SOURCE.snapshot.index.search_index.search(q, limit, type_filter)
     return {
-        "departure": departure_code,
-        "arrival": arrival_code,
-        "crawledAt": FLIGHT_DATA[departure_code].get('crawledAt'),
-        "totalFlights": len(route_flights),
-        "flights": route_flights
+        "query": q,
+        "total": len(results),
+        "results": results
     }
 
 @app.get("/api/statistics")
 async def get_statistics():
     """전체 통계"""
-    total_flights = 0
-    routes = set()
-    airlines = set()
-    
-    for airport_code, airport_data in FLIGHT_DATA.items():
-        for flight in airport_data.get('flights', []):
-            total_flights += 1
-            if flight.get('destination'):
-                routes.add(f"{airport_code}-{flight['destination']}")
-            if flight.get('airline'):
-                airlines.add(flight['airline'])
-    
+    snapshot = DATA_SOURCE.snapshot
     return {
-        "total_airports": len(FLIGHT_DATA),
-        "total_flights": total_flights,
-        "total_routes": len(routes),
-        "total_airlines": len(airlines),
+        **snapshot.index.statistics,
         "airports": {
-            code: {
-                "name": data.get("airportName", code),
-                "flights": data.get("totalFlights", 0)
+            airport["code"]: {
+                "name": airport["name"],
+                "flights": airport["totalFlights"]
             }
-            for code, data in FLIGHT_DATA.items()
+            for airport in snapshot.index.airports
         },
-        "last_update": datetime.now().isoformat()
+        "last_update": snapshot.loaded_at.isoformat()
     }
 
 if __name__ == "__main__":
     import uvicorn
-    print(f"Loaded {len(FLIGHT_DATA)} airports with total {sum(d.get('totalFlights', 0) for d in FLIGHT_DATA.values())} flights")
+    stats = DATA_SOURCE.snapshot.index.statistics
+    print(f"Loaded {stats['total_airports']} airports with total {stats['total_flights']} flights")
     uvicorn.run(app, host="0.0.0.0", port=8001)
\ No newline at end of file
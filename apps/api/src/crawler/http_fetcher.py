@@ -0,0 +1,142 @@
+"""
+HTTP 직접 조회 크롤러
+브라우저 없이 항공포털 조회 폼 POST를 재현하고 응답 HTML을 lxml로 파싱
+결과가 검증을 통과하지 못하면 호출 측에서 Playwright로 대체
+"""
+
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import httpx
+from lxml import etree, html
+
+from config import settings
+from table_extract import (
+    TableSpec, SCHEDULE_TABLE, LIVE_DEPARTURE_TABLE, LIVE_ARRIVAL_TABLE,
+    FLIGHT_NO_PATTERN, TIME_PATTERN, rows_to_records, parse_operating_days
+)
+
+logger = logging.getLogger(__name__)
+
+SCHEDULE_PATH = "/knowledge/airplanSchedule/airplaneSchedule.do"
+LIVE_PATH = "/knowledge/aircraftInfo/aircraftInfo.do"
+
+
+class HttpFetchError(Exception):
+    """HTTP 조회 실패 또는 응답 검증 실패"""
+
+
+def _class_xpath(class_name: str) -> str:
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {class_name} ')"
+
+
+def parse_table_rows(document, table_xpath: str) -> List[List[str]]:
+    """테이블의 데이터 행을 셀 텍스트 배열로 추출 (헤더 행 제외)"""
+    rows = []
+    for table in document.xpath(table_xpath):
+        for row in table.xpath('.//tr[td]'):
+            rows.append([cell.text_content().strip() for cell in row.xpath('./td')])
+    return rows
+
+
+def validate_flights(flights: List[Dict], time_field: str) -> bool:
+    """파싱 결과가 실제 항공편 행인지 확인 (편명/시간 형식)"""
+    for flight in flights:
+        if not FLIGHT_NO_PATTERN.match(flight.get("flightNo", "").replace(" ", "")):
+            return False
+        if not TIME_PATTERN.match(flight.get(time_field, "")):
+            return False
+    return True
+
+
+class AirportalHttpFetcher:
+    """커넥션 풀/keep-alive를 사용하는 항공포털 HTTP 클라이언트"""
+
+    def __init__(self, base_url: Optional[str] = None):
+        self.base_url = base_url or settings.AIRPORTAL_BASE_URL
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=settings.TIMEOUT,
+                limits=httpx.Limits(
+                    max_connections=settings.HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.HTTP_MAX_CONNECTIONS
+                ),
+                headers={
+                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+                    'Accept-Language': 'ko-KR,ko;q=0.9'
+                },
+                follow_redirects=True
+            )
+        return self._client
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _post_form(self, path: str, airport_code: str):
+        """조회 폼 POST 후 HTML 문서 반환"""
+        try:
+            response = await self.client.post(path, data={"airportCode": airport_code})
+            response.raise_for_status()
+        except httpx.HTTPError as e:
+            raise HttpFetchError(f"{path} request failed: {str(e)}") from e
+
+        try:
+            return html.fromstring(response.text)
+        except etree.ParserError as e:
+            raise HttpFetchError(f"{path} returned unparsable HTML: {str(e)}") from e
+
+    def _records(self, document, table_xpath: str, spec: TableSpec) -> List[Dict]:
+        return rows_to_records(parse_table_rows(document, table_xpath), spec)
+
+    async def fetch_schedule(self, airport_code: str) -> Dict:
+        """스케줄 조회 (scraper.crawl_schedule과 같은 형식)"""
+        document = await self._post_form(SCHEDULE_PATH, airport_code)
+
+        flights = self._records(
+            document, f"//table[{_class_xpath('schedule-table')}]", SCHEDULE_TABLE
+        )
+        if not flights or not validate_flights(flights, "departureTime"):
+            raise HttpFetchError(f"Schedule response for {airport_code} failed validation")
+
+        for flight in flights:
+            flight["days"] = parse_operating_days(flight["days"])
+
+        return {
+            "airport": airport_code,
+            "crawledAt": datetime.now().isoformat(),
+            "totalFlights": len(flights),
+            "flights": flights
+        }
+
+    async def fetch_live_status(self, airport_code: str) -> Dict:
+        """실시간 출도착 현황 조회 (scraper.crawl_live_status와 같은 형식)"""
+        document = await self._post_form(LIVE_PATH, airport_code)
+
+        departure_xpath = f"//div[{_class_xpath('departure-table')}]//table"
+        arrival_xpath = f"//div[{_class_xpath('arrival-table')}]//table"
+
+        # 야간에는 행이 없을 수 있으므로 테이블 존재 여부로 페이지 구조를 검증
+        if not document.xpath(departure_xpath) or not document.xpath(arrival_xpath):
+            raise HttpFetchError(f"Live response for {airport_code} has no result tables")
+
+        departures = self._records(document, departure_xpath, LIVE_DEPARTURE_TABLE)
+        arrivals = self._records(document, arrival_xpath, LIVE_ARRIVAL_TABLE)
+
+        if not (validate_flights(departures, "scheduledTime")
+                and validate_flights(arrivals, "scheduledTime")):
+            raise HttpFetchError(f"Live response for {airport_code} failed validation")
+
+        return {
+            "airport": airport_code,
+            "crawledAt": datetime.now().isoformat(),
+            "departures": departures,
+            "arrivals": arrivals
+        }
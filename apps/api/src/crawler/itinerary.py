@@ -0,0 +1,251 @@
+"""
+환승 경로 탐색 (Connection Scan 프로필 탐색)
+전체 공항 스케줄에서 출발일에 운항하는 항공편을 연결(출발 공항, 도착 공항, 출발/도착 시각) 배열로 만들고
+출발시각 내림차순으로 한 번 훑어 공항별로 "이 시각 이후 출발하면 목적지에 언제 도착하는가" 프로필을 쌓음
+- 프로필은 구간 수(1~max_legs)별로 따로 두어 (출발시각, 도착시각, 구간 수) 파레토 최적 경로를 모두 구함
+- 환승 공항에서는 최소 환승 시간(MCT) 이후 출발편만 연결
+- 운항일은 노선 시간표(timetable.py)의 요일 마스크/유효기간으로 판단
+- 시각은 출발일 자정 기준 분 (다음 날은 +1440), 도착시간이 출발시간보다 이르면 다음 날 도착으로 봄
+  (시각은 모두 현지 시각이므로 환승 대기 시간은 같은 공항 시각끼리만 비교)
+- 첫 구간은 출발일에 출발하고, 환승편은 다음 날(SEARCH_DAYS)까지 허용
+연결 배열은 노선 색인(route_index.py)에서 날짜별로 한 번만 만들어 재사용
+"""
+
+import os
+from bisect import bisect_right
+from datetime import date, timedelta
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from flight_record import Flight, format_minutes
+
+MINUTES_PER_DAY = 1440
+
+# 출발일 포함 탐색 일수 (심야 환승 대기로 다음 날 출발하는 연결편까지)
+SEARCH_DAYS = 2
+
+DEFAULT_MAX_LEGS = 3
+MAX_LEGS = 4
+
+# 최소 환승 시간 (분): 기본값과 공항별 값 ("ICN:90,GMP:45")
+DEFAULT_MIN_CONNECTION = int(os.getenv("MIN_CONNECTION_MINUTES", "60"))
+
+
+def parse_connection_times(text: str) -> Dict[str, int]:
+    times = {}
+    for item in text.split(","):
+        airport, _, minutes = item.partition(":")
+        if airport.strip() and minutes.strip().isdigit():
+            times[airport.strip().upper()] = int(minutes)
+    return times
+
+
+MIN_CONNECTION_TIMES = parse_connection_times(os.getenv("MIN_CONNECTION_TIMES", "ICN:90,GMP:45"))
+
+
+class Connection(NamedTuple):
+    """특정 날짜에 운항하는 항공편 1구간 (시각은 출발일 자정 기준 분)"""
+    origin: str
+    destination: str
+    departure: int
+    arrival: int
+    flight: Flight
+
+
+class ConnectionGraph:
+    """출발일 기준 연결 배열 (출발시각 내림차순, 만든 뒤에는 수정하지 않음)"""
+
+    __slots__ = ("day", "connections")
+
+    def __init__(self, day: date, connections: List[Connection]):
+        self.day = day
+        self.connections: Tuple[Connection, ...] = tuple(
+            sorted(connections, key=lambda c: (c.departure, c.arrival), reverse=True)
+        )
+
+    def __len__(self) -> int:
+        return len(self.connections)
+
+    @classmethod
+    def build(cls, index, day: date, days: int = SEARCH_DAYS) -> "ConnectionGraph":
+        """노선 색인의 운항일 시간표로 day부터 days일 동안의 연결 생성"""
+        connections = []
+        end = day + timedelta(days=days - 1)
+        for airport in index.origins():
+            for destination in index.destinations(airport):
+                for dated in index.timetable(airport, destination).expand(day, end):
+                    flight = dated.flight
+                    if type(flight.departure) is not int or type(flight.arrival) is not int:
+                        continue
+                    offset = (dated.date - day).days * MINUTES_PER_DAY
+                    arrival = flight.arrival if flight.arrival >= flight.departure \
+                        else flight.arrival + MINUTES_PER_DAY
+                    connections.append(Connection(
+                        airport, destination, offset + flight.departure, offset + arrival, flight
+                    ))
+        return cls(day, connections)
+
+
+class _Entry:
+    """프로필 항목: departure에 출발하면 arrival에 목적지 도착 (next는 다음 구간 항목)"""
+
+    __slots__ = ("departure", "arrival", "connection", "next")
+
+    def __init__(self, departure: int, arrival: int, connection: Connection, next: Optional["_Entry"]):
+        self.departure = departure
+        self.arrival = arrival
+        self.connection = connection
+        self.next = next
+
+
+class _Profile:
+    """출발시각 내림차순 / 도착시각 감소 순으로 쌓이는 파레토 프로필"""
+
+    __slots__ = ("keys", "entries")
+
+    def __init__(self):
+        # bisect용 (-출발시각) 오름차순
+        self.keys: List[int] = []
+        self.entries: List[_Entry] = []
+
+    def earliest(self, ready: int) -> Optional[_Entry]:
+        """ready 이후 출발해서 가장 빨리 도착하는 항목"""
+        position = bisect_right(self.keys, -ready)
+        return self.entries[position - 1] if position else None
+
+    def add(self, entry: _Entry):
+        entries = self.entries
+        if entries:
+            last = entries[-1]
+            if entry.arrival >= last.arrival:
+                return
+            if last.departure == entry.departure:
+                entries[-1] = entry
+                return
+        self.keys.append(-entry.departure)
+        entries.append(entry)
+
+
+class Itinerary(NamedTuple):
+    day: date
+    connections: Tuple[Connection, ...]
+
+    @property
+    def departure(self) -> int:
+        return self.connections[0].departure
+
+    @property
+    def arrival(self) -> int:
+        return self.connections[-1].arrival
+
+    @property
+    def legs(self) -> int:
+        return len(self.connections)
+
+    def _stamp(self, minutes: int) -> Tuple[str, str]:
+        days, minutes = divmod(minutes, MINUTES_PER_DAY)
+        return (self.day + timedelta(days=days)).isoformat(), format_minutes(minutes)
+
+    def to_dict(self) -> Dict:
+        departure_date, departure_time = self._stamp(self.departure)
+        arrival_date, arrival_time = self._stamp(self.arrival)
+        flights = []
+        for connection in self.connections:
+            leg_date, _ = self._stamp(connection.departure)
+            flights.append({"date": leg_date, "origin": connection.origin, **connection.flight.to_dict()})
+        return {
+            "departureDate": departure_date,
+            "departureTime": departure_time,
+            "arrivalDate": arrival_date,
+            "arrivalTime": arrival_time,
+            "legs": self.legs,
+            "transfers": [
+                {"airport": inbound.destination, "waitMinutes": outbound.departure - inbound.arrival}
+                for inbound, outbound in zip(self.connections, self.connections[1:])
+            ],
+            "flights": flights
+        }
+
+
+def min_connection(airport: str, default: Optional[int] = None) -> int:
+    if default is not None:
+        return default
+    return MIN_CONNECTION_TIMES.get(airport, DEFAULT_MIN_CONNECTION)
+
+
+def search(graph: ConnectionGraph, origin: str, destination: str, max_legs: int = DEFAULT_MAX_LEGS,
+           connection_minutes: Optional[int] = None) -> List[Itinerary]:
+    """origin -> destination 파레토 최적 경로 (출발이 늦을수록, 도착이 빠를수록, 구간이 적을수록 좋음)
+    connection_minutes를 주면 모든 공항에 같은 최소 환승 시간 적용. 결과는 출발시각 순"""
+    if origin == destination:
+        return []
+    # 공항 -> 구간 수별 프로필 (profiles[공항][k-1]은 k구간 이하 경로)
+    profiles: Dict[str, List[_Profile]] = {}
+    ready_delay: Dict[str, int] = {}
+    levels = range(max_legs)
+    onward_levels = range(1, max_legs)
+
+    for connection in graph.connections:
+        source, target, departure, arrival, _ = connection
+        # 출발지로 돌아오거나 목적지에서 다시 떠나는 경로는 최적일 수 없음
+        if target == origin or source == destination:
+            continue
+        # 첫 구간은 출발일에 출발 (다음 날 출발편이 프로필에 남으면 출발일 경로를 가림)
+        if source == origin and departure >= MINUTES_PER_DAY:
+            continue
+
+        if target == destination:
+            own = profiles.get(source)
+            if own is None:
+                own = profiles[source] = [_Profile() for _ in levels]
+            for legs in levels:
+                profile = own[legs]
+                if not profile.entries or arrival < profile.entries[-1].arrival:
+                    profile.add(_Entry(departure, arrival, connection, None))
+            continue
+
+        onward = profiles.get(target)
+        if onward is None:
+            continue
+        delay = ready_delay.get(target)
+        if delay is None:
+            delay = ready_delay[target] = min_connection(target, connection_minutes)
+        ready = arrival + delay
+        own = profiles.get(source)
+        for legs in onward_levels:
+            entry = onward[legs - 1].earliest(ready)
+            if entry is None:
+                continue
+            if own is None:
+                own = profiles[source] = [_Profile() for _ in levels]
+            profile = own[legs]
+            if not profile.entries or entry.arrival < profile.entries[-1].arrival:
+                profile.add(_Entry(departure, entry.arrival, connection, entry))
+
+    found = profiles.get(origin)
+    if found is None:
+        return []
+
+    itineraries = {}
+    for profile in found:
+        for entry in profile.entries:
+            connections = []
+            while entry is not None:
+                connections.append(entry.connection)
+                entry = entry.next
+            itinerary = Itinerary(graph.day, tuple(connections))
+            key = (itinerary.departure, itinerary.arrival)
+            if key not in itineraries or itinerary.legs < itineraries[key].legs:
+                itineraries[key] = itinerary
+
+    # (출발 늦음, 도착 빠름, 구간 적음) 중 하나라도 나은 경로만 남김
+    # 출발이 늦은 순으로 보면서 구간 수별 최소 도착시각과 비교
+    pareto = []
+    best = [None] * (max_legs + 1)
+    for itinerary in sorted(itineraries.values(), key=lambda i: (-i.departure, i.arrival, i.legs)):
+        arrival, legs = itinerary.arrival, itinerary.legs
+        if any(best[fewer] is not None and best[fewer] <= arrival for fewer in range(1, legs + 1)):
+            continue
+        best[legs] = arrival
+        pareto.append(itinerary)
+    pareto.sort(key=lambda i: (i.departure, i.arrival, i.legs))
+    return pareto
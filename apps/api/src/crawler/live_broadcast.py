@@ -0,0 +1,168 @@
+"""
+실시간 현황 변경분 푸시 (SSE / WebSocket 공용)
+구독자는 공항 또는 편명 단위로 구독하고, 실시간 크롤링마다 변경분(live_diff)만 받음
+- 메시지는 발행할 때 한 번만 직렬화하고 (SSE 프레임 포함) 모든 구독자 큐에 같은 객체를 넣음
+- 구독자 색인(공항 -> 구독자, 편명 -> 구독자)으로 해당 구독자에게만 전달
+- 큐가 가득 찬(읽지 않는) 구독자는 끊어서 메모리가 쌓이지 않도록 함
+"""
+
+import asyncio
+import json
+import logging
+from typing import Dict, Iterable, List, Optional, Set
+
+from live_diff import LIVE_SECTIONS
+
+logger = logging.getLogger(__name__)
+
+# 구독자별 대기 메시지 상한
+SUBSCRIBER_QUEUE_SIZE = 100
+
+# 변경 종류 (live_diff 결과 키)
+CHANGE_TYPES = ("added", "removed", "changed")
+
+
+class Message:
+    """한 번 직렬화한 메시지 (WebSocket은 text, SSE는 frame을 그대로 전송)"""
+
+    __slots__ = ("event", "text", "frame")
+
+    def __init__(self, event: str, payload: Dict):
+        self.event = event
+        self.text = json.dumps({"type": event, **payload}, ensure_ascii=False, separators=(",", ":"))
+        self.frame = f"event: {event}\ndata: {self.text}\n\n".encode("utf-8")
+
+    @property
+    def closing(self) -> bool:
+        """구독 종료 알림 여부 (보낸 뒤 연결을 닫음)"""
+        return self.event == "closed"
+
+
+# 구독 종료 알림 (느린 구독자 정리 / 서버 종료)
+OVERFLOWED = Message("closed", {"reason": "subscriber queue overflow"})
+SHUTDOWN = Message("closed", {"reason": "server shutdown"})
+
+
+class Subscription:
+    __slots__ = ("airports", "flights", "queue", "closed")
+
+    def __init__(self, airports: Iterable[str] = (), flights: Iterable[str] = ()):
+        self.airports: Set[str] = {a.strip().upper() for a in airports if a.strip()}
+        self.flights: Set[str] = {f.strip().upper() for f in flights if f.strip()}
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self.closed = False
+
+    async def next(self, timeout: Optional[float] = None) -> Optional[Message]:
+        """다음 메시지 (timeout 동안 없으면 None)"""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+def parse_codes(value: Optional[str]) -> List[str]:
+    """"ICN,GMP" 형식 쿼리 값 -> 코드 목록"""
+    return [code for code in (value or "").split(",") if code.strip()]
+
+
+class LiveBroadcaster:
+    def __init__(self):
+        self._by_airport: Dict[str, Set[Subscription]] = {}
+        self._by_flight: Dict[str, Set[Subscription]] = {}
+        self.stats = {"published": 0, "delivered": 0, "dropped_subscribers": 0}
+
+    @property
+    def subscribers(self) -> int:
+        unique = set()
+        for subscribers in self._by_airport.values():
+            unique.update(subscribers)
+        for subscribers in self._by_flight.values():
+            unique.update(subscribers)
+        return len(unique)
+
+    def subscribe(self, airports: Iterable[str] = (), flights: Iterable[str] = ()) -> Subscription:
+        subscription = Subscription(airports, flights)
+        self._index(subscription)
+        return subscription
+
+    def update(self, subscription: Subscription, airports: Iterable[str] = (), flights: Iterable[str] = (),
+               remove: bool = False):
+        """구독 대상 추가 (remove=True면 제거)"""
+        self._unindex(subscription)
+        changes = Subscription(airports, flights)
+        if remove:
+            subscription.airports -= changes.airports
+            subscription.flights -= changes.flights
+        else:
+            subscription.airports |= changes.airports
+            subscription.flights |= changes.flights
+        self._index(subscription)
+
+    def unsubscribe(self, subscription: Subscription):
+        self._unindex(subscription)
+        subscription.closed = True
+
+    def _index(self, subscription: Subscription):
+        for airport in subscription.airports:
+            self._by_airport.setdefault(airport, set()).add(subscription)
+        for flight_no in subscription.flights:
+            self._by_flight.setdefault(flight_no, set()).add(subscription)
+
+    def _unindex(self, subscription: Subscription):
+        for index, keys in ((self._by_airport, subscription.airports), (self._by_flight, subscription.flights)):
+            for key in keys:
+                subscribers = index.get(key)
+                if subscribers is not None:
+                    subscribers.discard(subscription)
+                    if not subscribers:
+                        del index[key]
+
+    def _deliver(self, subscribers: Iterable[Subscription], message: Message):
+        for subscription in list(subscribers):
+            try:
+                subscription.queue.put_nowait(message)
+                self.stats["delivered"] += 1
+            except asyncio.QueueFull:
+                # 읽지 않는 구독자: 대기 메시지를 비우고 종료 알림만 남김
+                self.unsubscribe(subscription)
+                self.stats["dropped_subscribers"] += 1
+                while not subscription.queue.empty():
+                    subscription.queue.get_nowait()
+                subscription.queue.put_nowait(OVERFLOWED)
+
+    def publish(self, airport: str, diff: Dict[str, Dict[str, List[Dict]]], crawled_at: Optional[str] = None):
+        """공항 1개의 변경분 발행 (공항 구독자에게는 전체, 편명 구독자에게는 해당 항공편만)"""
+        self.stats["published"] += 1
+
+        airport_subscribers = self._by_airport.get(airport)
+        if airport_subscribers:
+            self._deliver(airport_subscribers, Message("live_diff", {
+                "airport": airport, "crawledAt": crawled_at, **diff
+            }))
+
+        if not self._by_flight:
+            return
+        for section in LIVE_SECTIONS:
+            for change in CHANGE_TYPES:
+                for flight in diff.get(section, {}).get(change, []):
+                    flight_no = (flight.get("flightNo") or "").strip().upper()
+                    subscribers = self._by_flight.get(flight_no)
+                    if not subscribers:
+                        continue
+                    self._deliver(subscribers, Message("flight_update", {
+                        "airport": airport, "crawledAt": crawled_at, "section": section,
+                        "change": change, "flight": flight
+                    }))
+
+    def close_all(self):
+        """앱 종료 시 모든 구독자에게 종료 알림"""
+        subscribers = set()
+        for index in (self._by_airport, self._by_flight):
+            for group in index.values():
+                subscribers.update(group)
+        for subscription in subscribers:
+            self.unsubscribe(subscription)
+            try:
+                subscription.queue.put_nowait(SHUTDOWN)
+            except asyncio.QueueFull:
+                pass
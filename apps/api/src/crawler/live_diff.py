@@ -0,0 +1,54 @@
+"""
+실시간 현황 변경분 계산
+연속된 두 실시간 크롤링 결과를 (편명, 예정시간) 기준으로 맞춰
+출발/도착별 신규/사라진/상태 변경 항공편을 구함
+(상태 변경은 status, estimatedTime만 비교)
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+LIVE_SECTIONS = ("departures", "arrivals")
+
+# 변경 여부를 판단하는 필드
+TRACKED_FIELDS = ("status", "estimatedTime")
+
+FlightKey = Tuple[str, str]
+
+
+def flight_key(flight: Dict) -> FlightKey:
+    return ((flight.get("flightNo") or "").strip(), (flight.get("scheduledTime") or "").strip())
+
+
+def _index(flights: List[Dict]) -> Dict[FlightKey, Dict]:
+    indexed = {}
+    for flight in flights:
+        # 같은 키가 여러 번 나오면 처음 것만 사용
+        indexed.setdefault(flight_key(flight), flight)
+    return indexed
+
+
+def _tracked(flight: Dict) -> Tuple:
+    return tuple((flight.get(field) or "").strip() for field in TRACKED_FIELDS)
+
+
+def diff_live_status(previous: Optional[Dict], current: Dict) -> Dict[str, Dict[str, List[Dict]]]:
+    """출발/도착별 {"added": [...], "removed": [...], "changed": [...]}
+    (removed는 이전 항공편, 나머지는 현재 항공편. 이전 결과가 없으면 전부 added)"""
+    diff = {}
+    for section in LIVE_SECTIONS:
+        before = _index(previous.get(section, [])) if previous else {}
+        after = _index(current.get(section, []))
+        diff[section] = {
+            "added": [flight for key, flight in after.items() if key not in before],
+            "removed": [flight for key, flight in before.items() if key not in after],
+            "changed": [
+                flight for key, flight in after.items()
+                if key in before and _tracked(before[key]) != _tracked(flight)
+            ]
+        }
+    return diff
+
+
+def count_changes(diff: Dict[str, Dict[str, List[Dict]]]) -> int:
+    """변경분에 포함된 항공편 수"""
+    return sum(len(flights) for section in diff.values() for flights in section.values())
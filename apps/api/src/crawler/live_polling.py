@@ -0,0 +1,143 @@
+"""
+공항별 실시간 현황 조회 주기 조정
+연속된 두 실시간 크롤링 사이에 바뀐 항공편 수로 공항 x 시간대(0~23시)별 변경률(분당)을 추정하고
+다음 조회까지의 간격을 정함
+- 필요 조회 빈도 = 변경률 / 목표 변경 수 (한 번 조회할 때 목표 변경 수 정도가 쌓이도록)
+- 빈도는 [1/최대 간격, 1/최소 간격] 범위로 제한
+- 전체 빈도 합이 고정 주기(기본 간격)로 모든 공항을 조회할 때보다 크면 비율대로 줄임
+  (전체 크롤링 부하는 같거나 줄어듦, 조용한 시간대에는 줄어듦)
+- 관측이 없는 시간대는 공항 전체 평균, 그것도 없으면 기본 간격
+변경률은 상태 파일에 저장해 재시작 후에도 이어서 사용
+"""
+
+import json
+import logging
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# 변경률 지수이동평균 가중치 (새 관측 비중)
+EWMA_ALPHA = 0.3
+
+
+class AdaptiveLivePoller:
+    def __init__(self, airports: Iterable[str], base_interval: float, min_interval: float,
+                 max_interval: float, target_changes: float, state_path: Optional[Path] = None):
+        """간격 단위는 분"""
+        self.airports = list(airports)
+        self.base_interval = base_interval
+        self.min_interval = min_interval
+        self.max_interval = max(max_interval, base_interval)
+        self.target_changes = target_changes
+        self.state_path = Path(state_path) if state_path else None
+
+        # 공항 -> 시간대 -> 분당 변경 수 / 공항 -> 전체 평균
+        self.hourly_rates: Dict[str, Dict[int, float]] = {}
+        self.rates: Dict[str, float] = {}
+        # 공항 -> 마지막 조회 시각 / 다음 조회 시각 (time.time())
+        self.last_polled: Dict[str, float] = {}
+        self.next_due: Dict[str, float] = {airport: 0.0 for airport in self.airports}
+
+        self._load()
+
+    def _load(self):
+        if self.state_path is None or not self.state_path.exists():
+            return
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            self.hourly_rates = {
+                airport: {int(hour): rate for hour, rate in hours.items()}
+                for airport, hours in state.get("hourlyRates", {}).items()
+            }
+            self.rates = state.get("rates", {})
+        except (OSError, ValueError) as e:
+            logger.warning(f"Live polling state ignored: {str(e)}")
+
+    def _save(self):
+        if self.state_path is None:
+            return
+        state = {"hourlyRates": self.hourly_rates, "rates": self.rates}
+        tmp_path = self.state_path.with_name(f".{self.state_path.name}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, indent=2)
+        os.replace(tmp_path, self.state_path)
+
+    # 관측
+
+    def record(self, airport: str, changes: int, at: Optional[float] = None):
+        """실시간 크롤링 1회 결과 반영 (이전 결과 대비 바뀐 항공편 수) 후 다음 조회 시각 갱신"""
+        at = at or time.time()
+        previous = self.last_polled.get(airport)
+        self.last_polled[airport] = at
+        if previous is not None and at > previous:
+            rate = changes / ((at - previous) / 60)
+            hour = datetime.fromtimestamp(at).hour
+            hours = self.hourly_rates.setdefault(airport, {})
+            hours[hour] = self._smooth(hours.get(hour), rate)
+            self.rates[airport] = self._smooth(self.rates.get(airport), rate)
+            self._save()
+        self.next_due[airport] = at + self.intervals(at)[airport] * 60
+
+    @staticmethod
+    def _smooth(current: Optional[float], observed: float) -> float:
+        if current is None:
+            return observed
+        return current + EWMA_ALPHA * (observed - current)
+
+    def _rate(self, airport: str, hour: int) -> Optional[float]:
+        rate = self.hourly_rates.get(airport, {}).get(hour)
+        return rate if rate is not None else self.rates.get(airport)
+
+    # 주기 계산
+
+    def intervals(self, at: Optional[float] = None) -> Dict[str, float]:
+        """공항별 조회 간격 (분)"""
+        hour = datetime.fromtimestamp(at or time.time()).hour
+        min_freq, max_freq = 1 / self.max_interval, 1 / self.min_interval
+
+        demand = {}
+        for airport in self.airports:
+            rate = self._rate(airport, hour)
+            freq = 1 / self.base_interval if rate is None else rate / self.target_changes
+            demand[airport] = min(max(freq, min_freq), max_freq)
+
+        # 고정 주기로 전체를 조회할 때의 빈도 합을 넘지 않도록 비율 조정 (최소 빈도는 유지)
+        budget = len(self.airports) / self.base_interval
+        total = sum(demand.values())
+        if total > budget:
+            floor = sum(min_freq for _ in demand)
+            scale = (budget - floor) / (total - floor) if total > floor else 0
+            demand = {airport: min_freq + (freq - min_freq) * scale for airport, freq in demand.items()}
+
+        return {airport: 1 / freq for airport, freq in demand.items()}
+
+    def due(self, at: Optional[float] = None) -> List[str]:
+        """조회할 때가 된 공항 (조회 예정으로 표시하고 다음 시각을 미리 잡아 둠)"""
+        at = at or time.time()
+        due = [airport for airport in self.airports if self.next_due.get(airport, 0.0) <= at]
+        if due:
+            intervals = self.intervals(at)
+            for airport in due:
+                # 크롤링이 실패해도 같은 공항을 매 분 다시 넣지 않도록 (성공하면 record에서 다시 계산)
+                self.next_due[airport] = at + intervals[airport] * 60
+        return due
+
+    def snapshot(self) -> Dict:
+        """/health용 공항별 간격/변경률"""
+        now = time.time()
+        intervals = self.intervals(now)
+        hour = datetime.fromtimestamp(now).hour
+        snapshot = {}
+        for airport in self.airports:
+            rate = self._rate(airport, hour)
+            snapshot[airport] = {
+                "intervalMinutes": round(intervals[airport], 1),
+                "changesPerMinute": round(rate, 3) if rate is not None else None,
+                "nextPollIn": max(0, round(self.next_due.get(airport, now) - now))
+            }
+        return snapshot
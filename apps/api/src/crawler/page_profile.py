@@ -0,0 +1,120 @@
+"""
+경량 페이지 프로필
+크롤링에 필요 없는 리소스(이미지, 폰트, 스타일시트, 외부 분석/광고 스크립트)를 차단하고
+작은 뷰포트를 사용해 대역폭과 렌더링 비용을 줄임
+"""
+
+import logging
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# 차단한 요청의 예상 크기 (바이트, 리소스 종류별 평균값)
+ESTIMATED_RESOURCE_BYTES = {
+    "image": 30_000,
+    "media": 200_000,
+    "font": 60_000,
+    "stylesheet": 20_000,
+    "script": 40_000,
+    "other": 5_000
+}
+
+
+class ProfileStats:
+    """차단/허용 요청 수와 바이트 집계"""
+
+    def __init__(self):
+        self.requests_allowed = 0
+        self.requests_blocked = 0
+        self.bytes_loaded = 0
+        self.estimated_bytes_saved = 0
+        self.blocked_by_type: Dict[str, int] = {}
+
+    def record_blocked(self, resource_type: str):
+        self.requests_blocked += 1
+        self.blocked_by_type[resource_type] = self.blocked_by_type.get(resource_type, 0) + 1
+        self.estimated_bytes_saved += ESTIMATED_RESOURCE_BYTES.get(
+            resource_type, ESTIMATED_RESOURCE_BYTES["other"]
+        )
+
+    def snapshot(self) -> Dict:
+        return {
+            "requests_allowed": self.requests_allowed,
+            "requests_blocked": self.requests_blocked,
+            "bytes_loaded": self.bytes_loaded,
+            "estimated_bytes_saved": self.estimated_bytes_saved,
+            "blocked_by_type": dict(self.blocked_by_type)
+        }
+
+    def since(self, before: Dict) -> Dict:
+        """snapshot() 이후 증가분 (크롤링 1회 단위 보고용)"""
+        now = self.snapshot()
+        delta = {
+            key: now[key] - before.get(key, 0)
+            for key in ("requests_allowed", "requests_blocked", "bytes_loaded", "estimated_bytes_saved")
+        }
+        delta["blocked_by_type"] = {
+            resource_type: count - before.get("blocked_by_type", {}).get(resource_type, 0)
+            for resource_type, count in now["blocked_by_type"].items()
+            if count - before.get("blocked_by_type", {}).get(resource_type, 0) > 0
+        }
+        return delta
+
+
+class PageProfile:
+    """Playwright 컨텍스트/페이지에 적용할 요청 차단 프로필"""
+
+    def __init__(self, stats: Optional[ProfileStats] = None):
+        self.enabled = settings.LIGHT_PAGE_PROFILE
+        self.blocked_types = set(settings.BLOCKED_RESOURCE_TYPES)
+        self.allowed_hosts: List[str] = [
+            *settings.ALLOWED_HOSTS,
+            urlparse(settings.AIRPORTAL_BASE_URL).hostname or ""
+        ]
+        self.stats = stats or ProfileStats()
+
+    @property
+    def viewport(self) -> Dict[str, int]:
+        if self.enabled:
+            return {'width': settings.VIEWPORT_WIDTH, 'height': settings.VIEWPORT_HEIGHT}
+        return {'width': 1920, 'height': 1080}
+
+    def context_options(self) -> Dict:
+        """browser.new_context / browser.new_page 인자"""
+        return {"viewport": self.viewport, "locale": "ko-KR"}
+
+    def _is_first_party(self, url: str) -> bool:
+        host = urlparse(url).hostname or ""
+        return any(host == allowed or host.endswith(f".{allowed}") for allowed in self.allowed_hosts)
+
+    def should_block(self, resource_type: str, url: str) -> bool:
+        if resource_type == "document" and self._is_first_party(url):
+            return False
+        if resource_type in self.blocked_types:
+            return True
+        # 외부 호스트(분석, 광고 등)는 종류와 무관하게 차단
+        return url.startswith("http") and not self._is_first_party(url)
+
+    async def _handle_route(self, route):
+        request = route.request
+        if self.should_block(request.resource_type, request.url):
+            self.stats.record_blocked(request.resource_type)
+            await route.abort()
+        else:
+            self.stats.requests_allowed += 1
+            await route.continue_()
+
+    def _on_response(self, response):
+        length = response.headers.get("content-length")
+        if length and length.isdigit():
+            self.stats.bytes_loaded += int(length)
+
+    async def apply(self, target):
+        """BrowserContext 또는 Page에 요청 차단 적용"""
+        if not self.enabled:
+            return
+        await target.route("**/*", self._handle_route)
+        target.on("response", self._on_response)
@@ -9,12 +9,17 @@ from datetime import datetime
 from pathlib import Path
 from playwright.async_api import async_playwright
 import re
+from waits import WaitStrategy
+from page_profile import PageProfile
+from table_extract import BASIC_SCHEDULE_TABLE, extract_rows, rows_to_records
 
 class RealAirportCrawler:
     def __init__(self):
         self.base_url = "https://www.airportal.go.kr"
         self.browser = None
         self.page = None
+        self.waits = WaitStrategy()
+        self.profile = PageProfile()
     
     async def init_browser(self):
         """브라우저 초기화"""
@@ -23,7 +28,8 @@ class RealAirportCrawler:
             headless=True,
             args=['--disable-dev-shm-usage', '--no-sandbox']
         )
-        self.page = await self.browser.new_page()
+        self.page = await self.browser.new_page(**self.profile.context_options())
+        await self.profile.apply(self.page)
         
         # User Agent 설정
         await self.page.set_extra_http_headers({
@@ -37,8 +43,8 @@ class RealAirportCrawler:
             
             # 항공편 조회 페이지로 이동
             url = f"{self.base_url}/knowledge/airplanSchedule/airplaneSchedule.do"
-            await self.page.goto(url, wait_until='networkidle', timeout=30000)
-            await self.page.wait_for_timeout(2000)
+            await self.page.goto(url, wait_until='domcontentloaded', timeout=30000)
+            await self.waits.for_selector(self.page, 'select, iframe', label="form-ready")
             
             # iframe 확인
             iframes = await self.page.query_selector_all('iframe')
@@ -63,7 +69,6 @@ class RealAirportCrawler:
                     if element:
                         await element.select_option(departure_code)
                         print(f"출발 공항 {departure_code} 선택됨")
-                        await self.page.wait_for_timeout(1000)
                         break
                 except:
                     continue
@@ -83,7 +88,6 @@ class RealAirportCrawler:
                         if element:
                             await element.select_option(arrival_code)
                             print(f"도착 공항 {arrival_code} 선택됨")
-                            await self.page.wait_for_timeout(1000)
                             break
                     except:
                         continue
@@ -102,15 +106,13 @@ class RealAirportCrawler:
                 try:
                     btn = await self.page.wait_for_selector(selector, timeout=3000)
                     if btn:
-                        await btn.click()
+                        # 결과 테이블 행이 안정될 때까지 대기
+                        await self.waits.for_results(self.page, btn.click, 'table tbody tr')
                         print("검색 버튼 클릭됨")
                         break
                 except:
                     continue
             
-            # 결과 로딩 대기
-            await self.page.wait_for_timeout(3000)
-            
             # 결과 테이블 파싱
             flights = await self.parse_flight_table()
             
@@ -128,65 +130,31 @@ class RealAirportCrawler:
         """테이블에서 항공편 정보 파싱"""
         flights = []
         
-        # 다양한 테이블 선택자 시도
-        table_selectors = [
-            'table.schedule_table',
-            'table#scheduleTable',
-            'table[class*="schedule"]',
-            'table[class*="flight"]',
+        # 다양한 테이블 행 선택자 시도
+        row_selectors = [
+            'table.schedule_table tbody tr',
+            'table#scheduleTable tbody tr',
+            'table[class*="schedule"] tbody tr',
+            'table[class*="flight"] tbody tr',
             'table tbody tr',
             '.list_table tbody tr'
         ]
         
-        for selector in table_selectors:
-            rows = await self.page.query_selector_all(selector)
+        for selector in row_selectors:
+            # 테이블 전체를 한 번에 추출
+            rows = await extract_rows(self.page, selector)
             if rows:
                 print(f"{len(rows)}개 행 발견")
                 
-                for row in rows:
-                    try:
-                        cells = await row.query_selector_all('td')
-                        if len(cells) >= 4:
-                            # 항공사명
-                            airline = await cells[0].text_content()
-                            airline = airline.strip() if airline else ""
-                            
-                            # 편명
-                            flight_no = await cells[1].text_content()
-                            flight_no = flight_no.strip() if flight_no else ""
-                            
-                            # 도착지
-                            destination = await cells[2].text_content()
-                            destination = destination.strip() if destination else ""
-                            
-                            # 출발시간
-                            dep_time = await cells[3].text_content()
-                            dep_time = dep_time.strip() if dep_time else ""
-                            
-                            # 도착시간 (있으면)
-                            arr_time = ""
-                            if len(cells) > 4:
-                                arr_time = await cells[4].text_content()
-                                arr_time = arr_time.strip() if arr_time else ""
-                            
-                            # 운항요일 (있으면)
-                            days = {
-                                "mon": True, "tue": True, "wed": True, 
-                                "thu": True, "fri": True, "sat": True, "sun": True
-                            }
-                            
-                            if airline and flight_no and destination:
-                                flights.append({
-                                    "airline": airline,
-                                    "flightNo": flight_no,
-                                    "destination": destination,
-                                    "departureTime": dep_time,
-                                    "arrivalTime": arr_time,
-                                    "status": "정상",
-                                    "days": days
-                                })
-                    except:
-                        continue
+                for record in rows_to_records(rows, BASIC_SCHEDULE_TABLE):
+                    if record["airline"] and record["flightNo"] and record["destination"]:
+                        record["status"] = "정상"
+                        # 운항요일 정보가 없으므로 매일 운항으로 설정
+                        record["days"] = {
+                            "mon": True, "tue": True, "wed": True, 
+                            "thu": True, "fri": True, "sat": True, "sun": True
+                        }
+                        flights.append(record)
                 
                 if flights:
                     break
@@ -247,6 +215,7 @@ class RealAirportCrawler:
         """브라우저 종료"""
         if self.browser:
             await self.browser.close()
+            print(f"리소스 사용: {self.profile.stats.snapshot()}")
 
 async def crawl_pus_to_nrt():
     """PUS → NRT 실제 크롤링"""
@@ -0,0 +1,127 @@
+"""
+직렬화된 응답 캐시
+공항/노선별 JSON 응답을 bytes로 한 번만 만들어 두고 (gzip, brotli 압축본 포함)
+ETag가 같으면 304로 응답. 크롤러가 새 데이터를 반영할 때만 무효화
+키는 요청 값으로 만들어지므로 최근 사용한 MAX_ENTRIES개만 보관 (LRU)
+"""
+
+import gzip
+import hashlib
+import json
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+from fastapi import Request, Response
+
+try:
+    import brotli
+except ImportError:  # brotli는 선택 의존성 (없으면 gzip만 사용)
+    brotli = None
+
+# 이보다 작은 응답은 압축하지 않음 (바이트)
+MIN_COMPRESS_SIZE = 512
+
+# 보관할 응답 수 (넘으면 가장 오래 쓰지 않은 응답부터 버림)
+MAX_ENTRIES = 512
+
+
+def encode_json(data: Any) -> bytes:
+    """FastAPI JSONResponse와 같은 형식으로 직렬화"""
+    return json.dumps(data, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+def _accepted_encodings(header: str) -> set:
+    """Accept-Encoding 헤더에서 q=0이 아닌 인코딩 목록"""
+    accepted = set()
+    for part in header.split(","):
+        name, *params = [p.strip() for p in part.split(";")]
+        quality = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if name and quality > 0:
+            accepted.add(name.lower())
+    return accepted
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+class CachedBody:
+    """응답 본문 1개의 원본/압축본과 ETag"""
+
+    __slots__ = ("plain", "gzip", "br", "etag")
+
+    def __init__(self, plain: bytes):
+        self.plain = plain
+        self.etag = f'"{hashlib.sha1(plain).hexdigest()[:20]}"'
+        compress = len(plain) >= MIN_COMPRESS_SIZE
+        self.gzip = gzip.compress(plain, compresslevel=6, mtime=0) if compress else None
+        self.br = brotli.compress(plain, quality=5) if compress and brotli else None
+
+
+class ResponseCache:
+    def __init__(self, max_entries: int = MAX_ENTRIES):
+        self.version: Optional[str] = None
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, CachedBody]" = OrderedDict()
+        self.stats = {"hits": 0, "misses": 0, "not_modified": 0, "evictions": 0}
+
+    def publish(self, version: Any):
+        """새 데이터 버전 반영 (버전이 바뀌었을 때만 전체 무효화)"""
+        version = str(version)
+        if version != self.version:
+            self.version = version
+            self._entries = OrderedDict()
+
+    def invalidate(self, *keys: Hashable):
+        """일부 키만 무효화 (공항 단위로 데이터가 갱신될 때)"""
+        for key in keys:
+            self._entries.pop(key, None)
+
+    def get(self, key: Hashable, build: Callable[[], Any]) -> CachedBody:
+        # 만드는 도중 publish()로 교체되면 이전 버전 사전에만 기록되어 버려짐
+        entries = self._entries
+        entry = entries.get(key)
+        if entry is None:
+            self.stats["misses"] += 1
+            # build()가 HTTPException을 던지면 캐시하지 않고 그대로 전달
+            entry = CachedBody(encode_json(build()))
+            entries[key] = entry
+            while len(entries) > self.max_entries:
+                entries.popitem(last=False)
+                self.stats["evictions"] += 1
+        else:
+            self.stats["hits"] += 1
+            entries.move_to_end(key)
+        return entry
+
+    def respond(self, request: Request, key: Hashable, build: Callable[[], Any]) -> Response:
+        """캐시된 bytes로 응답 (If-None-Match 일치 시 304)"""
+        entry = self.get(key, build)
+        headers = {"ETag": entry.etag, "Vary": "Accept-Encoding", "Cache-Control": "no-cache"}
+
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and _etag_matches(if_none_match, entry.etag):
+            self.stats["not_modified"] += 1
+            return Response(status_code=304, headers=headers)
+
+        accepted = _accepted_encodings(request.headers.get("accept-encoding", ""))
+        if entry.br is not None and "br" in accepted:
+            headers["Content-Encoding"] = "br"
+            body = entry.br
+        elif entry.gzip is not None and "gzip" in accepted:
+            headers["Content-Encoding"] = "gzip"
+            body = entry.gzip
+        else:
+            body = entry.plain
+        return Response(content=body, media_type="application/json", headers=headers)
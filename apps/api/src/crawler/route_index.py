@@ -0,0 +1,183 @@
+"""
+노선 색인
+데이터를 불러올 때 한 번만 만들어 두고 요청마다 항공편 전체를 훑지 않도록 함
+- (출발, 도착) -> 항공편
+- 출발 공항 -> 정렬된 도착지 목록
+- (출발, 도착) -> 운항일 시간표 (날짜별 조회용, 처음 조회할 때 생성)
+- 출발 공항 -> 전체 항공편 시간표 (스케줄 페이지 조회용, 처음 조회할 때 생성)
+- 날짜 -> 환승 탐색용 연결 배열 (itinerary.py, 최근 CONNECTION_CACHE_SIZE일만 보관)
+- 공항/항공사/편명 자동완성 색인 (search_index.py)
+- 항공사 -> 항공편
+- 공항 목록 / 전체 통계 (미리 계산)
+
+출발 공항별 색인은 처음 조회할 때 만들 수 있어 지연 로딩 데이터(LazySchedules)와 함께 쓸 수 있음
+(warm()을 호출하면 전부 미리 생성)
+항공편은 Flight 레코드 (flight_record.py)로 보관하며 응답 시 to_dict()로 변환
+만든 뒤에는 수정하지 않으므로 새 데이터가 들어오면 새 색인을 만들어 전역 참조를 한 번에 교체
+"""
+
+from collections import OrderedDict
+from datetime import date
+from typing import Dict, List, Mapping, Optional, Tuple
+
+from flight_record import Flight
+from itinerary import ConnectionGraph
+from search_index import SearchIndex
+from timetable import RouteTimetable
+
+# 날짜별 연결 배열 보관 수
+CONNECTION_CACHE_SIZE = 8
+
+
+class _OriginIndex:
+    __slots__ = ("flights", "routes", "destinations", "crawled_at", "timetables", "timetable")
+
+    def __init__(self, data: Dict):
+        routes: Dict[str, List[Flight]] = {}
+        self.flights = data.get('flights', [])
+        for flight in self.flights:
+            if flight.destination:
+                routes.setdefault(flight.destination, []).append(flight)
+
+        self.routes = {destination: tuple(flights) for destination, flights in routes.items()}
+        self.destinations = tuple(sorted(routes))
+        self.crawled_at = data.get('crawledAt')
+        self.timetables: Dict[str, RouteTimetable] = {}
+        self.timetable: Optional[RouteTimetable] = None
+
+
+class RouteIndex:
+    def __init__(self, schedules: Mapping):
+        self._schedules = schedules
+        self._origins: Dict[str, _OriginIndex] = {}
+        self._airlines: Optional[Dict[str, Tuple[Flight, ...]]] = None
+        self._airports: Optional[List[Dict]] = None
+        self._statistics: Optional[Dict] = None
+        self._search: Optional[SearchIndex] = None
+        self._connections: "OrderedDict[date, ConnectionGraph]" = OrderedDict()
+
+    def _origin(self, airport_code: str) -> Optional[_OriginIndex]:
+        index = self._origins.get(airport_code)
+        if index is None and airport_code in self._schedules:
+            index = _OriginIndex(self._schedules[airport_code])
+            self._origins[airport_code] = index
+        return index
+
+    def _build_totals(self):
+        airlines: Dict[str, List[Flight]] = {}
+        airports = []
+        for code, data in self._schedules.items():
+            flights = data.get('flights', [])
+            for flight in flights:
+                if flight.airline:
+                    airlines.setdefault(flight.airline, []).append(flight)
+            airports.append({
+                "code": code,
+                "name": data.get("airportName", code),
+                "totalFlights": len(flights)
+            })
+
+        self._airlines = {airline: tuple(flights) for airline, flights in airlines.items()}
+        self._statistics = {
+            "total_airports": len(airports),
+            "total_flights": sum(airport["totalFlights"] for airport in airports),
+            "total_routes": sum(len(self._origin(code).routes) for code in self._schedules),
+            "total_airlines": len(self._airlines)
+        }
+        self._airports = airports
+
+    def warm(self) -> "RouteIndex":
+        """모든 공항 색인과 통계를 미리 생성"""
+        for airport_code in self._schedules:
+            self._origin(airport_code)
+        if self._airports is None:
+            self._build_totals()
+        if self._search is None:
+            self._search = SearchIndex(self._schedules)
+        return self
+
+    @property
+    def airports(self) -> List[Dict]:
+        if self._airports is None:
+            self._build_totals()
+        return self._airports
+
+    @property
+    def search_index(self) -> SearchIndex:
+        """자동완성 색인 (warm()에서 미리 생성, 지연 로딩이면 처음 검색할 때)"""
+        if self._search is None:
+            self._search = SearchIndex(self._schedules)
+        return self._search
+
+    @property
+    def statistics(self) -> Dict:
+        if self._statistics is None:
+            self._build_totals()
+        return self._statistics
+
+    def has_airport(self, airport_code: str) -> bool:
+        return airport_code in self._schedules
+
+    def schedule(self, airport_code: str) -> Optional[Dict]:
+        """공항 스케줄 원본 (지연 로딩이면 이때 파싱)"""
+        if airport_code not in self._schedules:
+            return None
+        return self._schedules[airport_code]
+
+    def has_route(self, origin: str, destination: str) -> bool:
+        index = self._origin(origin)
+        return index is not None and destination in index.routes
+
+    def route(self, origin: str, destination: str) -> Tuple[Flight, ...]:
+        index = self._origin(origin)
+        return index.routes.get(destination, ()) if index else ()
+
+    def timetable(self, origin: str, destination: str) -> RouteTimetable:
+        """노선 운항일 시간표 (노선별로 한 번만 만들어 재사용, 없는 노선은 보관하지 않음)"""
+        index = self._origin(origin)
+        if index is None or destination not in index.routes:
+            return RouteTimetable(())
+        timetable = index.timetables.get(destination)
+        if timetable is None:
+            timetable = RouteTimetable(index.routes[destination])
+            index.timetables[destination] = timetable
+        return timetable
+
+    def origins(self) -> Tuple[str, ...]:
+        """스케줄이 있는 출발 공항"""
+        return tuple(self._schedules)
+
+    def connections(self, day: date) -> ConnectionGraph:
+        """출발일 기준 환승 탐색용 연결 배열 (날짜별로 한 번만 생성)"""
+        graph = self._connections.get(day)
+        if graph is None:
+            graph = ConnectionGraph.build(self, day)
+            self._connections[day] = graph
+            while len(self._connections) > CONNECTION_CACHE_SIZE:
+                self._connections.popitem(last=False)
+        else:
+            self._connections.move_to_end(day)
+        return graph
+
+    def airport_timetable(self, airport_code: str) -> Optional[RouteTimetable]:
+        """공항 전체 항공편 시간표 (모르는 공항이면 None)"""
+        index = self._origin(airport_code)
+        if index is None:
+            return None
+        if index.timetable is None:
+            index.timetable = RouteTimetable(index.flights)
+        return index.timetable
+
+    def destinations(self, origin: str) -> Optional[Tuple[str, ...]]:
+        """도착지 목록 (모르는 공항이면 None)"""
+        index = self._origin(origin)
+        return index.destinations if index else None
+
+    def by_airline(self, airline: str) -> Tuple[Flight, ...]:
+        if self._airlines is None:
+            self._build_totals()
+        return self._airlines.get(airline, ())
+
+    def crawled_at(self, airport_code: str) -> Optional[str]:
+        index = self._origin(airport_code)
+        return index.crawled_at if index else None
@@ -0,0 +1,185 @@
+"""
+스케줄 JSON 지연 로더
+{공항코드: 스케줄} 형식의 큰 파일을 한 번에 json.load 하지 않고
+공항별 구간의 바이트 위치만 먼저 찾은 뒤 공항 단위로 필요할 때 파싱
+- json.dump(indent=2)로 쓴 파일은 최상위 키 줄만 정규식으로 찾음 (그 외 형식은 토큰 단위 스캔)
+- 반복되는 문자열(항공사, 목적지, 시간, 상태 등)은 sys.intern으로 공유
+- 항공편은 파싱하면서 바로 Flight 레코드로 변환
+- 스캔 후에도 파일을 열어 두므로 파일이 교체(os.replace)되어도 기존 내용을 계속 읽음
+"""
+
+import json
+import mmap
+import os
+import re
+import sys
+import threading
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Dict, Iterator, Tuple
+
+from flight_record import Flight
+
+# 값이 반복되는 필드 (sys.intern 대상)
+INTERN_FIELDS = frozenset({
+    "airport", "airportName", "airline", "destination", "origin", "aircraft",
+    "departureTime", "arrivalTime", "scheduledTime", "estimatedTime", "status", "section"
+})
+
+# json.dump(indent=2) 파일의 최상위 키 줄 (문자열 안에는 줄바꿈이 없으므로 2칸 들여쓰기 키는 최상위 키뿐)
+_INDENTED_FILE = re.compile(rb'\s*\{\s*\n  "')
+_INDENTED_KEY_LINE = b'\n  "'
+_INDENTED_KEY = re.compile(rb'  "((?:[^"\\\n]|\\.)*)"[ \t]*:[ \t]*')
+
+# 일반 형식 스캔용 토큰 (문자열 전체 또는 괄호)
+_TOKEN = re.compile(rb'"(?:[^"\\]|\\.)*"|[{}\[\]]')
+_COLON = re.compile(rb'\s*:\s*')
+# 최상위 스칼라 값 (문자열 또는 숫자/true/false/null)
+_SCALAR = re.compile(rb'"(?:[^"\\]|\\.)*"|[^,}\s]+')
+
+Sections = Dict[str, Tuple[int, int]]
+
+
+def _intern_values(obj: Dict):
+    if "flightNo" in obj:
+        return Flight.from_dict(obj)
+    for key, value in obj.items():
+        if type(value) is str and key in INTERN_FIELDS:
+            obj[key] = sys.intern(value)
+    return obj
+
+
+def parse_section(raw: bytes) -> Dict:
+    """공항 1개 구간 파싱 (반복 문자열 intern, 항공편은 Flight 레코드)"""
+    return json.loads(raw, object_hook=_intern_values)
+
+
+def _scan_indented(buf) -> Sections:
+    # 정규식으로 전체를 훑지 않고 줄 시작 패턴을 find로 찾아 해당 위치에서만 매칭
+    matches = []
+    pos = buf.find(_INDENTED_KEY_LINE)
+    while pos >= 0:
+        match = _INDENTED_KEY.match(buf, pos + 1)
+        if match:
+            matches.append(match)
+        pos = buf.find(_INDENTED_KEY_LINE, pos + 1)
+    end_of_object = buf.rfind(b"}")
+    sections = {}
+    for i, match in enumerate(matches):
+        end = matches[i + 1].start() if i + 1 < len(matches) else end_of_object
+        # 다음 키 앞의 쉼표/공백 제거
+        while end > match.end() and buf[end - 1:end] in (b",", b" ", b"\n", b"\r", b"\t"):
+            end -= 1
+        sections[json.loads(b'"' + match.group(1) + b'"')] = (match.end(), end)
+    return sections
+
+
+def _scan_tokens(buf) -> Sections:
+    sections = {}
+    depth = 0
+    key = None
+    start = 0
+    for match in _TOKEN.finditer(buf):
+        token = match.group()
+        if token[:1] == b'"':
+            if depth == 1 and key is None:
+                colon = _COLON.match(buf, match.end())
+                if colon:
+                    key = json.loads(token)
+                    start = colon.end()
+                    if buf[start:start + 1] not in (b"{", b"["):
+                        # 스칼라 값은 여기서 끝나므로 다음 객체/배열이 이 키로 기록되지 않도록 키를 비움
+                        scalar = _SCALAR.match(buf, start)
+                        sections[key] = (start, scalar.end() if scalar else start)
+                        key = None
+            continue
+        if token in (b"{", b"["):
+            depth += 1
+        else:
+            depth -= 1
+            if depth == 1 and key is not None:
+                sections[key] = (start, match.end())
+                key = None
+    if depth != 0:
+        raise ValueError("Unterminated JSON object")
+    return sections
+
+
+def scan_sections(fileno: int) -> Sections:
+    """최상위 키별 값의 (시작, 끝) 바이트 위치"""
+    if os.fstat(fileno).st_size == 0:
+        raise ValueError("Empty schedule file")
+    with mmap.mmap(fileno, 0, access=mmap.ACCESS_READ) as buf:
+        if buf.rfind(b"}") < 0:
+            raise ValueError("Unterminated JSON object")
+        if _INDENTED_FILE.match(buf):
+            return _scan_indented(buf)
+        return _scan_tokens(buf)
+
+
+class LazySchedules(Mapping):
+    """공항코드 -> 스케줄 (처음 접근할 때 해당 구간만 파싱)"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._file = open(self.path, 'rb')
+        try:
+            self._sections = scan_sections(self._file.fileno())
+        except Exception:
+            self._file.close()
+            raise
+        self._cache: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+
+    def _read(self, airport_code: str) -> bytes:
+        start, end = self._sections[airport_code]
+        return os.pread(self._file.fileno(), end - start, start)
+
+    def parse(self, airport_code: str) -> Dict:
+        """캐시하지 않고 파싱 (DB 적재처럼 한 번만 훑을 때)"""
+        return parse_section(self._read(airport_code))
+
+    def __getitem__(self, airport_code: str) -> Dict:
+        data = self._cache.get(airport_code)
+        if data is None:
+            with self._lock:
+                data = self._cache.get(airport_code)
+                if data is None:
+                    data = self.parse(airport_code)
+                    self._cache[airport_code] = data
+        return data
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._sections)
+
+    def __len__(self) -> int:
+        return len(self._sections)
+
+    def __contains__(self, airport_code) -> bool:
+        return airport_code in self._sections
+
+    def is_parsed(self, airport_code: str) -> bool:
+        return airport_code in self._cache
+
+    def streaming(self) -> Iterator[Tuple[str, Dict]]:
+        """공항 단위로 파싱해 순서대로 반환 (캐시에 남기지 않음)"""
+        for airport_code in self._sections:
+            yield airport_code, self._cache.get(airport_code) or self.parse(airport_code)
+
+    def close(self):
+        self._file.close()
+
+    def __del__(self):
+        try:
+            self._file.close()
+        except Exception:
+            pass
+
+
+def load_schedules(path: Path) -> Dict[str, Dict]:
+    """파일 전체를 공항 단위로 파싱해 dict로 반환"""
+    schedules = LazySchedules(path)
+    try:
+        return dict(schedules.streaming())
+    finally:
+        schedules.close()
@@ -0,0 +1,207 @@
+"""
+공항 스케줄 페이지 조회 (필터 / 필드 선택 / 커서 페이지)
+공항 전체 항공편 시간표(timetable.py, 출발시간 순)에서 조건에 맞는 항공편 위치만 골라 한 페이지씩 응답
+- 출발 시간대는 출발시간 배열의 위치 범위, 요일은 요일별 위치 목록,
+  항공사/도착지는 값별 위치 목록으로 찾고 가장 짧은 목록만 훑으며 나머지 조건을 확인
+- 페이지 크기만큼 찾으면 멈춤 (응답 크기/CPU가 전체 항공편 수가 아니라 표시하는 행 수에 비례)
+- 커서는 마지막 항공편의 (데이터 버전, 위치, 정렬 키). 데이터가 바뀌면 정렬 키로 이어서 찾음
+- 응답은 항공편 단위로 직렬화해 스트리밍 (전체 목록을 만들어 두지 않음)
+"""
+
+import base64
+import json
+from bisect import bisect_left, bisect_right
+from heapq import merge
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+
+from flight_record import FLIGHT_FIELDS, Flight, parse_minutes
+from response_cache import encode_json
+from table_extract import DAY_KEYS
+from timetable import RouteTimetable, UNTIMED
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+# 페이지 조회로 처리하는 쿼리 파라미터 (하나도 없으면 기존 전체 문서 응답)
+QUERY_PARAMS = ("limit", "cursor", "fields", "airline", "destination", "departureFrom", "departureTo", "weekday")
+
+
+class ScheduleQueryError(ValueError):
+    """잘못된 조회 조건 (400)"""
+
+
+def _codes(value: Optional[str], upper: bool = False) -> Optional[frozenset]:
+    if not value:
+        return None
+    codes = {code.strip().upper() if upper else code.strip() for code in value.split(",")}
+    codes.discard("")
+    return frozenset(codes) or None
+
+
+def _minutes(value: Optional[str], name: str) -> Optional[int]:
+    if not value:
+        return None
+    minutes = parse_minutes(value)
+    if type(minutes) is not int:
+        raise ScheduleQueryError(f"{name} must be HH:MM")
+    return minutes
+
+
+def _sort_key(flight: Flight) -> Tuple:
+    # timetable 정렬 순서와 같음
+    if type(flight.departure) is int:
+        return (0, flight.departure, flight.flight_no or "")
+    return (1, 0, flight.flight_no or "")
+
+
+class ScheduleQuery:
+    __slots__ = ("airlines", "destinations", "departure_from", "departure_to", "weekday", "fields",
+                 "limit", "after")
+
+    def __init__(self, airline: Optional[str] = None, destination: Optional[str] = None,
+                 departure_from: Optional[str] = None, departure_to: Optional[str] = None,
+                 weekday: Optional[str] = None, fields: Optional[str] = None,
+                 limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None):
+        self.airlines = _codes(airline)
+        self.destinations = _codes(destination, upper=True)
+        self.departure_from = _minutes(departure_from, "departureFrom")
+        self.departure_to = _minutes(departure_to, "departureTo")
+        if self.departure_from is not None and self.departure_to is not None \
+                and self.departure_from > self.departure_to:
+            raise ScheduleQueryError("departureFrom must not be later than departureTo")
+
+        self.weekday: Optional[int] = None
+        if weekday:
+            if weekday.lower() not in DAY_KEYS:
+                raise ScheduleQueryError(f"weekday must be one of {','.join(DAY_KEYS)}")
+            self.weekday = DAY_KEYS.index(weekday.lower())
+
+        self.fields: Optional[Tuple[str, ...]] = None
+        if fields:
+            self.fields = tuple(field.strip() for field in fields.split(",") if field.strip()) or None
+            unknown = [field for field in self.fields or () if field not in FLIGHT_FIELDS]
+            if unknown:
+                raise ScheduleQueryError(
+                    f"unknown fields: {','.join(unknown)} (available: {','.join(FLIGHT_FIELDS)})"
+                )
+
+        if not 1 <= limit <= MAX_PAGE_SIZE:
+            raise ScheduleQueryError(f"limit must be between 1 and {MAX_PAGE_SIZE}")
+        self.limit = limit
+        self.after = decode_cursor(cursor) if cursor else None
+
+    # 항공편 찾기
+
+    def _start(self, timetable: RouteTimetable, version: str) -> int:
+        """커서 다음 위치 (데이터 버전이 같으면 위치, 바뀌었으면 정렬 키로)"""
+        if self.after is None:
+            return 0
+        cursor_version, position, key = self.after
+        if cursor_version == version:
+            return position + 1
+        return bisect_right(timetable.flights, key, key=_sort_key)
+
+    def _candidates(self, timetable: RouteTimetable, window: range) -> Sequence[int]:
+        """조건별 위치 목록 중 가장 짧은 것 (window 범위로 자른 결과)"""
+        lists: List[Sequence[int]] = []
+        if self.weekday is not None:
+            lists.append(timetable.by_weekday[self.weekday])
+        for field, values in (("airline", self.airlines), ("destination", self.destinations)):
+            if values is None:
+                continue
+            positions = timetable.positions(field)
+            groups = [positions.get(value, ()) for value in values]
+            lists.append(groups[0] if len(groups) == 1 else list(merge(*groups)))
+        if not lists:
+            return window
+        shortest = min(lists, key=len)
+        return shortest[bisect_left(shortest, window.start):bisect_left(shortest, window.stop)]
+
+    def matches(self, timetable: RouteTimetable, version: str) -> Iterator[int]:
+        """조건에 맞는 항공편 위치 (출발시간 순, 필요한 만큼만 찾음)"""
+        window = timetable.departure_range(self.departure_from, self.departure_to)
+        if self.departure_from is not None:
+            # 출발시간이 HH:MM 형식이 아닌 항공편(정렬상 맨 뒤)은 시간대 조건에서 제외
+            window = range(window.start, min(window.stop, bisect_left(timetable.departures, UNTIMED)))
+        window = range(max(window.start, self._start(timetable, version)), window.stop)
+
+        flights, masks = timetable.flights, timetable.masks
+        day_bit = 1 << self.weekday if self.weekday is not None else 0
+        for position in self._candidates(timetable, window):
+            flight = flights[position]
+            if day_bit and not masks[position] & day_bit:
+                continue
+            if self.airlines is not None and flight.airline not in self.airlines:
+                continue
+            if self.destinations is not None and flight.destination not in self.destinations:
+                continue
+            yield position
+
+    def project(self, flight: Flight) -> Dict:
+        data = flight.to_dict()
+        if self.fields is None:
+            return data
+        return {field: data[field] for field in self.fields if field in data}
+
+    def stream(self, timetable: RouteTimetable, version: str, header: Dict) -> Iterator[bytes]:
+        """{...header, "flights": [...], "count": n, "nextCursor": ...} JSON을 조각으로 생성"""
+        yield encode_json(header)[:-1] + b',"flights":['
+
+        count = 0
+        last = None
+        next_cursor = None
+        for position in self.matches(timetable, version):
+            if count == self.limit:
+                # 한 건 더 있으면 다음 페이지 커서
+                next_cursor = encode_cursor(version, last, _sort_key(timetable.flights[last]))
+                break
+            yield (b"," if count else b"") + encode_json(self.project(timetable.flights[position]))
+            count += 1
+            last = position
+
+        yield b'],"count":' + encode_json(count) + b',"nextCursor":' + encode_json(next_cursor) + b"}"
+
+
+def encode_cursor(version: str, position: int, key: Tuple) -> str:
+    raw = json.dumps([version, position, list(key)], ensure_ascii=False, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, int, Tuple]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        version, position, key = json.loads(raw)
+        return str(version), int(position), tuple(key)
+    except (ValueError, TypeError):
+        raise ScheduleQueryError("invalid cursor")
+
+
+def wants_page(params: Iterable[str]) -> bool:
+    """페이지 조회 파라미터가 하나라도 있는지"""
+    return any(param in QUERY_PARAMS for param in params)
+
+
+def page_response(timetable: RouteTimetable, version: str, header: Dict, **params) -> StreamingResponse:
+    """조회 조건(ScheduleQuery 인자)으로 스트리밍 응답 (조건이 잘못되면 400)"""
+    try:
+        query = ScheduleQuery(**params)
+    except ScheduleQueryError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return StreamingResponse(query.stream(timetable, version, header), media_type="application/json")
+
+
+def index_page_response(index, version: str, airport_code: str, **params) -> StreamingResponse:
+    """노선 색인(route_index.py)의 공항 시간표로 페이지 응답 (모르는 공항이면 404)"""
+    timetable = index.airport_timetable(airport_code)
+    if timetable is None:
+        raise HTTPException(status_code=404, detail=f"Airport {airport_code} not found")
+    schedule = index.schedule(airport_code)
+    header = {"airport": airport_code}
+    if schedule.get("airportName") is not None:
+        header["airportName"] = schedule["airportName"]
+    header["crawledAt"] = index.crawled_at(airport_code)
+    header["totalFlights"] = len(timetable)
+    return page_response(timetable, version, header, **params)
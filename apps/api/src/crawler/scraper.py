@@ -4,193 +4,194 @@ Playwright 기반 항공포털 크롤러
 
 import asyncio
 import logging
+from contextlib import asynccontextmanager
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import AsyncIterator, Dict, List, Optional
 from pathlib import Path
+from urllib.parse import urlparse
 
-from playwright.async_api import async_playwright, Page, Browser
+from playwright.async_api import Page
 from config import settings
+from browser_manager import BrowserManager
+from waits import WaitStrategy
+from http_fetcher import AirportalHttpFetcher, HttpFetchError
+from table_extract import (
+    TableSpec, SCHEDULE_TABLE, LIVE_DEPARTURE_TABLE, LIVE_ARRIVAL_TABLE,
+    extract_records, parse_operating_days
+)
 
 logger = logging.getLogger(__name__)
 
 
+class HostRateLimiter:
+    """호스트별 최소 요청 간격 제한"""
+    
+    def __init__(self, min_interval: float):
+        self.min_interval = min_interval
+        self._last_request: Dict[str, float] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        
+    async def wait(self, url: str):
+        """같은 호스트로의 직전 요청 이후 min_interval 만큼 대기"""
+        host = urlparse(url).netloc
+        lock = self._locks.setdefault(host, asyncio.Lock())
+        
+        async with lock:
+            loop = asyncio.get_running_loop()
+            delay = self._last_request.get(host, 0.0) + self.min_interval - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self._last_request[host] = loop.time()
+
+
 class AirportScraper:
-    def __init__(self):
-        self.browser: Optional[Browser] = None
-        self.page: Optional[Page] = None
-        self.base_url = "https://www.airportal.go.kr"
+    def __init__(self, browser_manager: Optional[BrowserManager] = None):
+        self.base_url = settings.AIRPORTAL_BASE_URL
+        self.http = AirportalHttpFetcher(self.base_url)
+        
+        # 브라우저 관리자를 넘겨받지 않으면 직접 만들고 close_browser에서 정리
+        self._owns_browser = browser_manager is None
+        self.browser_manager = browser_manager or BrowserManager()
+        self.rate_limiter = HostRateLimiter(settings.CRAWL_MIN_INTERVAL)
+        self.waits = WaitStrategy()
         
     async def init_browser(self):
-        """브라우저 초기화"""
-        if self.browser:
-            return
-            
-        playwright = await async_playwright().start()
-        self.browser = await playwright.chromium.launch(
-            headless=settings.HEADLESS,
-            args=['--no-sandbox', '--disable-setuid-sandbox']
-        )
-        context = await self.browser.new_context(
-            viewport={'width': 1920, 'height': 1080},
-            locale='ko-KR'
-        )
-        self.page = await context.new_page()
+        """브라우저 준비 (공유 관리자의 경우 이미 실행 중이면 그대로 사용)"""
+        await self.browser_manager.start()
         
     async def close_browser(self):
-        """브라우저 종료"""
-        if self.page:
-            await self.page.close()
-        if self.browser:
-            await self.browser.close()
-        self.browser = None
-        self.page = None
+        """직접 만든 브라우저만 종료 (공유 관리자는 앱 종료 시 정리)"""
+        if self._owns_browser:
+            await self.browser_manager.stop()
+        
+    @asynccontextmanager
+    async def acquire_page(self) -> AsyncIterator[Page]:
+        """풀에서 페이지를 빌려 사용 후 반납 (브라우저는 처음 사용할 때 실행)"""
+        async with self.browser_manager.page() as page:
+            yield page
+            
+    async def _goto(self, page: Page, url: str, ready_selector: str):
+        """호스트 요청 간격을 지켜 페이지 이동 후 조회 폼이 준비될 때까지 대기"""
+        await self.rate_limiter.wait(url)
+        await page.goto(url, wait_until='domcontentloaded', timeout=settings.TIMEOUT * 1000)
+        await self.waits.for_selector(page, ready_selector, label="form-ready")
         
     async def crawl_schedule(self, airport_code: str) -> Dict:
-        """공항 스케줄 크롤링"""
+        """공항 스케줄 크롤링 (HTTP 직접 조회 우선)"""
+        if settings.HTTP_FETCH:
+            try:
+                await self.rate_limiter.wait(self.base_url)
+                return await self.http.fetch_schedule(airport_code)
+            except HttpFetchError as e:
+                logger.warning(f"HTTP schedule fetch failed for {airport_code}, using browser: {str(e)}")
+                
         try:
-            url = f"{self.base_url}/knowledge/airplanSchedule/airplaneSchedule.do"
-            await self.page.goto(url, wait_until='networkidle')
-            await asyncio.sleep(2)
-            
-            # 공항 선택
-            await self.page.select_option('#airportCode', airport_code)
-            await asyncio.sleep(1)
-            
-            # 조회 버튼 클릭
-            await self.page.click('button.btn-search')
-            await asyncio.sleep(3)
-            
-            # 데이터 파싱
-            flights = []
-            
-            # 테이블 행 추출
-            rows = await self.page.query_selector_all('table.schedule-table tbody tr')
-            
-            for row in rows:
-                try:
-                    cells = await row.query_selector_all('td')
-                    if len(cells) < 7:
-                        continue
-                    
-                    # 셀 텍스트 추출
-                    airline = await cells[0].inner_text()
-                    flight_no = await cells[1].inner_text()
-                    destination = await cells[2].inner_text()
-                    departure_time = await cells[3].inner_text()
-                    arrival_time = await cells[4].inner_text()
-                    schedule_text = await cells[5].inner_text()
-                    
-                    # 요일 파싱
-                    days = self._parse_schedule_days(schedule_text)
-                    
-                    flights.append({
-                        "airline": airline.strip(),
-                        "flightNo": flight_no.strip(),
-                        "destination": destination.strip(),
-                        "departureTime": departure_time.strip(),
-                        "arrivalTime": arrival_time.strip(),
-                        "days": days
-                    })
-                    
-                except Exception as e:
-                    logger.warning(f"Failed to parse row: {str(e)}")
-                    continue
-            
-            return {
-                "airport": airport_code,
-                "crawledAt": datetime.now().isoformat(),
-                "totalFlights": len(flights),
-                "flights": flights
-            }
-            
+            async with self.acquire_page() as page:
+                return await self._crawl_schedule(page, airport_code)
         except Exception as e:
             logger.error(f"Schedule crawl error for {airport_code}: {str(e)}")
             raise
             
+    async def _crawl_schedule(self, page: Page, airport_code: str) -> Dict:
+        """주어진 페이지에서 공항 스케줄 크롤링"""
+        url = f"{self.base_url}/knowledge/airplanSchedule/airplaneSchedule.do"
+        await self._goto(page, url, '#airportCode')
+        
+        # 공항 선택
+        await page.select_option('#airportCode', airport_code)
+        
+        # 조회 버튼 클릭 후 결과 응답과 테이블 행 안정화 대기
+        await self.waits.for_results(
+            page,
+            lambda: page.click('button.btn-search'),
+            'table.schedule-table tbody tr',
+            response_pattern='airplaneSchedule'
+        )
+        
+        # 테이블 전체를 한 번에 추출
+        records = await extract_records(page, 'table.schedule-table tbody tr', SCHEDULE_TABLE)
+        
+        flights = []
+        for record in records:
+            # 요일 파싱
+            record["days"] = self._parse_schedule_days(record["days"])
+            flights.append(record)
+        
+        return {
+            "airport": airport_code,
+            "crawledAt": datetime.now().isoformat(),
+            "totalFlights": len(flights),
+            "flights": flights
+        }
+        
     async def crawl_live_status(self, airport_code: str) -> Dict:
-        """실시간 출도착 현황 크롤링"""
+        """실시간 출도착 현황 크롤링 (HTTP 직접 조회 우선)"""
+        if settings.HTTP_FETCH:
+            try:
+                await self.rate_limiter.wait(self.base_url)
+                return await self.http.fetch_live_status(airport_code)
+            except HttpFetchError as e:
+                logger.warning(f"HTTP live fetch failed for {airport_code}, using browser: {str(e)}")
+                
         try:
-            url = f"{self.base_url}/knowledge/aircraftInfo/aircraftInfo.do"
-            await self.page.goto(url, wait_until='networkidle')
-            await asyncio.sleep(2)
-            
-            # 공항 선택
-            await self.page.select_option('#airportCode', airport_code)
-            await asyncio.sleep(1)
-            
-            # 조회 버튼 클릭
-            await self.page.click('button.btn-search')
-            await asyncio.sleep(3)
-            
-            # 출발/도착 데이터 파싱
-            departures = await self._parse_live_table('div.departure-table table')
-            arrivals = await self._parse_live_table('div.arrival-table table')
-            
-            return {
-                "airport": airport_code,
-                "crawledAt": datetime.now().isoformat(),
-                "departures": departures,
-                "arrivals": arrivals
-            }
-            
+            async with self.acquire_page() as page:
+                return await self._crawl_live_status(page, airport_code)
         except Exception as e:
             logger.error(f"Live crawl error for {airport_code}: {str(e)}")
             raise
             
-    async def _parse_live_table(self, selector: str) -> List[Dict]:
-        """실시간 테이블 파싱"""
-        flights = []
+    async def _crawl_live_status(self, page: Page, airport_code: str) -> Dict:
+        """주어진 페이지에서 실시간 출도착 현황 크롤링"""
+        url = f"{self.base_url}/knowledge/aircraftInfo/aircraftInfo.do"
+        await self._goto(page, url, '#airportCode')
         
-        try:
-            table = await self.page.query_selector(selector)
-            if not table:
-                return flights
-                
-            rows = await table.query_selector_all('tbody tr')
+        # 공항 선택
+        await page.select_option('#airportCode', airport_code)
+        
+        # 조회 버튼 클릭 후 결과 응답과 출발 테이블 행 안정화 대기
+        await self.waits.for_results(
+            page,
+            lambda: page.click('button.btn-search'),
+            'div.departure-table table tbody tr',
+            response_pattern='aircraftInfo'
+        )
+        
+        # 출발/도착 데이터 파싱
+        departures = await self._parse_live_table(page, 'div.departure-table table', LIVE_DEPARTURE_TABLE)
+        arrivals = await self._parse_live_table(page, 'div.arrival-table table', LIVE_ARRIVAL_TABLE)
+        
+        return {
+            "airport": airport_code,
+            "crawledAt": datetime.now().isoformat(),
+            "departures": departures,
+            "arrivals": arrivals
+        }
             
-            for row in rows:
-                try:
-                    cells = await row.query_selector_all('td')
-                    if len(cells) < 6:
-                        continue
-                    
-                    flight = {
-                        "airline": await cells[0].inner_text(),
-                        "flightNo": await cells[1].inner_text(),
-                        "destination": await cells[2].inner_text(),
-                        "scheduledTime": await cells[3].inner_text(),
-                        "estimatedTime": await cells[4].inner_text(),
-                        "status": await cells[5].inner_text()
-                    }
-                    
-                    flights.append({k: v.strip() for k, v in flight.items()})
-                    
-                except Exception as e:
-                    logger.warning(f"Failed to parse live row: {str(e)}")
-                    continue
-                    
+    async def _parse_live_table(self, page: Page, selector: str, spec: TableSpec) -> List[Dict]:
+        """실시간 테이블 파싱"""
+        try:
+            return await extract_records(page, f'{selector} tbody tr', spec)
         except Exception as e:
             logger.error(f"Failed to parse live table: {str(e)}")
-            
-        return flights
+            return []
         
     async def download_excel(self) -> Optional[Path]:
-        """Excel 파일 다운로드"""
+        """Excel 파일 다운로드 (스케줄 조회 화면의 Excel 버튼)"""
         try:
-            # 다운로드 대기 설정
-            download_promise = self.page.wait_for_event('download')
-            
-            # Excel 다운로드 버튼 클릭
-            await self.page.click('button.btn-excel-download')
-            
-            # 다운로드 완료 대기
-            download = await download_promise
-            
-            # 임시 경로에 저장
-            temp_path = Path(f"/tmp/airportal_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx")
-            await download.save_as(temp_path)
-            
-            return temp_path
+            async with self.acquire_page() as page:
+                url = f"{self.base_url}/knowledge/airplanSchedule/airplaneSchedule.do"
+                await self._goto(page, url, 'button.btn-excel-download')
+                
+                # 클릭 전에 다운로드 대기를 걸어 두어야 이벤트를 놓치지 않음
+                async with page.expect_download(timeout=settings.TIMEOUT * 1000) as download_info:
+                    await page.click('button.btn-excel-download')
+                download = await download_info.value
+                
+                # 임시 경로에 저장
+                temp_path = Path(f"/tmp/airportal_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx")
+                await download.save_as(temp_path)
+                
+                return temp_path
             
         except Exception as e:
             logger.error(f"Excel download error: {str(e)}")
@@ -198,24 +199,4 @@ class AirportScraper:
             
     def _parse_schedule_days(self, schedule_text: str) -> Dict[str, bool]:
         """요일 문자열 파싱"""
-        days = {
-            "mon": False,
-            "tue": False,
-            "wed": False,
-            "thu": False,
-            "fri": False,
-            "sat": False,
-            "sun": False
-        }
-        
-        # 요일 매핑
-        day_map = {
-            "월": "mon", "화": "tue", "수": "wed", "목": "thu",
-            "금": "fri", "토": "sat", "일": "sun"
-        }
-        
-        for kor, eng in day_map.items():
-            if kor in schedule_text:
-                days[eng] = True
-                
-        return days
\ No newline at end of file
+        return parse_operating_days(schedule_text)
@@ -0,0 +1,258 @@
+"""
+자동완성 검색 색인 (공항 / 항공사 / 편명)
+데이터를 불러올 때 한 번 만들어 두고 /api/search 입력마다 접두어 범위만 이분 탐색
+- 검색 키를 정렬된 배열로 보관 (접두어 trie와 같은 범위 조회를 bisect로, 키 수만큼의 노드 없이)
+- 영문/숫자 키 (공항 코드, 항공사 코드, 편명)는 대문자로, 한글 키 (공항명, 도시명, 항공사명)는 초성 문자열로 정렬
+- 편명은 순위가 모두 같아 (편명순) 따로 두고 접두어 범위 앞에서부터 limit개만 봄 (짧은 질의도 편명 수와 무관)
+- 한글 질의는 초성 접두어로 후보 범위를 찾은 뒤 글자 단위로 확인
+  완성된 음절은 같은 음절, 초성(ㄴㄹㅌ)은 초성이 같은 음절과 일치하고
+  입력 중인 마지막 음절의 받침은 다음 음절 초성으로 봄 ("날" -> "나리타")
+- 이름은 음절마다 접미어도 키로 넣어 중간부터 입력해도 찾음 ("국제" -> "김해국제공항", 순위는 낮음)
+- 순위: 코드 정확히 일치 > 코드 접두어 > 이름 접두어 > 이름 중간, 같으면 운항편 수가 많은 순
+"""
+
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Mapping, NamedTuple, Optional, Tuple
+
+from flight_record import Flight, format_minutes
+
+HANGUL_START = 0xAC00
+HANGUL_END = 0xD7A3
+CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+JONGSEONG = ("", "ㄱ", "ㄲ", "ㄳ", "ㄴ", "ㄵ", "ㄶ", "ㄷ", "ㄹ", "ㄺ", "ㄻ", "ㄼ", "ㄽ", "ㄾ", "ㄿ", "ㅀ",
+             "ㅁ", "ㅂ", "ㅄ", "ㅅ", "ㅆ", "ㅇ", "ㅈ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ")
+
+# 스케줄 데이터에는 도착지가 코드로만 있으므로 공항명/도시명은 여기서 보충
+AIRPORT_NAMES: Dict[str, Tuple[str, str]] = {
+    "ICN": ("인천국제공항", "인천"), "GMP": ("김포국제공항", "서울"), "PUS": ("김해국제공항", "부산"),
+    "CJU": ("제주국제공항", "제주"), "TAE": ("대구국제공항", "대구"), "CJJ": ("청주국제공항", "청주"),
+    "KWJ": ("광주공항", "광주"), "RSU": ("여수공항", "여수"), "USN": ("울산공항", "울산"),
+    "MWX": ("무안국제공항", "무안"), "KPO": ("포항공항", "포항"), "WJU": ("원주공항", "원주"),
+    "YNY": ("양양국제공항", "양양"), "HIN": ("사천공항", "사천"), "KUV": ("군산공항", "군산"),
+    "NRT": ("나리타국제공항", "도쿄"), "HND": ("하네다공항", "도쿄"), "KIX": ("간사이국제공항", "오사카"),
+    "NGO": ("주부국제공항", "나고야"), "FUK": ("후쿠오카공항", "후쿠오카"),
+    "PEK": ("베이징수도국제공항", "베이징"), "PVG": ("상하이푸둥국제공항", "상하이"),
+    "SHA": ("상하이훙차오국제공항", "상하이"), "CAN": ("광저우바이윈국제공항", "광저우"),
+    "SZX": ("선전바오안국제공항", "선전"), "HKG": ("홍콩국제공항", "홍콩"), "TPE": ("타오위안국제공항", "타이베이"),
+    "KHH": ("가오슝국제공항", "가오슝"), "ULN": ("칭기즈칸국제공항", "울란바토르"),
+    "BKK": ("수완나품국제공항", "방콕"), "SIN": ("창이국제공항", "싱가포르"), "MNL": ("니노이아키노국제공항", "마닐라"),
+    "CEB": ("막탄세부국제공항", "세부"), "SGN": ("떤선녓국제공항", "호찌민"), "HAN": ("노이바이국제공항", "하노이"),
+    "DAD": ("다낭국제공항", "다낭"), "VTE": ("왓따이국제공항", "비엔티안"),
+    "LAX": ("로스앤젤레스국제공항", "로스앤젤레스"), "SFO": ("샌프란시스코국제공항", "샌프란시스코"),
+    "SEA": ("시애틀터코마국제공항", "시애틀"), "JFK": ("존F케네디국제공항", "뉴욕"),
+    "LHR": ("히스로공항", "런던"), "CDG": ("샤를드골공항", "파리"), "FRA": ("프랑크푸르트공항", "프랑크푸르트"),
+}
+
+TYPES = ("airport", "airline", "flight")
+
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 50
+
+# 키 종류 (순위에 사용, 작을수록 앞)
+KIND_CODE = 0
+KIND_NAME = 1
+KIND_INFIX = 2
+
+
+def is_syllable(char: str) -> bool:
+    return HANGUL_START <= ord(char) <= HANGUL_END
+
+
+def choseong(text: str) -> str:
+    """음절을 초성으로 바꾼 문자열 (나머지 글자는 그대로)"""
+    return "".join(
+        CHOSEONG[(ord(char) - HANGUL_START) // 588] if is_syllable(char) else char
+        for char in text
+    )
+
+
+def _split_final(char: str) -> Tuple[str, str]:
+    """음절 -> (받침 없는 음절, 받침)"""
+    offset = ord(char) - HANGUL_START
+    final = offset % 28
+    return chr(ord(char) - final), JONGSEONG[final]
+
+
+def _char_matches(query: str, key: str) -> bool:
+    return query == key or (query in CHOSEONG and is_syllable(key) and choseong(key) == query)
+
+
+def hangul_prefix_match(query: str, key: str) -> bool:
+    """key가 입력 중인 query로 시작하는지 (초성 입력, 마지막 음절 받침 -> 다음 초성 허용)"""
+    if len(query) > len(key):
+        return False
+    head, last = query[:-1], query[-1]
+    if not all(_char_matches(q, k) for q, k in zip(head, key)):
+        return False
+    target = key[len(head)]
+    if _char_matches(last, target):
+        return True
+    if is_syllable(last) and is_syllable(target):
+        syllable, final = _split_final(last)
+        # 홑받침만 다음 음절 초성이 될 수 있음
+        return (final in CHOSEONG and syllable == target and len(key) > len(query)
+                and choseong(key[len(query)]) == final)
+    return False
+
+
+def _is_hangul(text: str) -> bool:
+    return any(is_syllable(char) or char in CHOSEONG for char in text)
+
+
+class SearchResult(NamedTuple):
+    type: str
+    code: str
+    label: str
+    detail: Dict
+    popularity: int
+
+
+class _Keys:
+    """정렬된 키 배열 (bisect로 접두어 범위 조회)"""
+
+    __slots__ = ("keys", "originals", "entries")
+
+    def __init__(self, items: Iterable[Tuple[str, str, int, int]]):
+        # (조회 키, 원문 키, 결과 번호, 키 종류)
+        ordered = sorted(set(items))
+        self.keys = [item[0] for item in ordered]
+        self.originals = [item[1] for item in ordered]
+        self.entries = [(item[2], item[3]) for item in ordered]
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def prefix_range(self, prefix: str) -> range:
+        return range(bisect_left(self.keys, prefix), bisect_left(self.keys, prefix + "\uffff"))
+
+
+def _suffixes(name: str) -> List[Tuple[str, int]]:
+    """이름 전체와 음절별 접미어 (2글자 이상)"""
+    keys = [(name, KIND_NAME)]
+    keys.extend((name[start:], KIND_INFIX) for start in range(1, len(name) - 1))
+    return keys
+
+
+def airline_code(flight_no: Optional[str]) -> Optional[str]:
+    """편명 앞 2글자 (IATA 항공사 코드, 예: BX164 -> BX, 7C1301 -> 7C)"""
+    if not flight_no or len(flight_no) < 3:
+        return None
+    return flight_no[:2].upper()
+
+
+class SearchIndex:
+    """만든 뒤에는 수정하지 않음 (새 데이터가 들어오면 노선 색인과 함께 새로 만듦)"""
+
+    def __init__(self, schedules: Mapping):
+        results: List[SearchResult] = []
+        ascii_keys: List[Tuple[str, str, int, int]] = []
+        flight_keys: List[Tuple[str, str, int, int]] = []
+        hangul_keys: List[Tuple[str, str, int, int]] = []
+
+        airport_flights: Dict[str, int] = {}
+        airport_names: Dict[str, str] = {}
+        airlines: Dict[str, Dict] = {}
+        flights: Dict[Tuple[str, str], Tuple[str, Flight]] = {}
+
+        for origin, data in schedules.items():
+            airport_names.setdefault(origin, data.get("airportName") or origin)
+            for flight in data.get("flights", []):
+                airport_flights[origin] = airport_flights.get(origin, 0) + 1
+                if flight.destination:
+                    airport_flights[flight.destination] = airport_flights.get(flight.destination, 0) + 1
+                if flight.airline:
+                    airline = airlines.setdefault(flight.airline, {"codes": {}, "flights": 0})
+                    airline["flights"] += 1
+                    code = airline_code(flight.flight_no)
+                    if code:
+                        airline["codes"][code] = airline["codes"].get(code, 0) + 1
+                if flight.flight_no:
+                    flights.setdefault((flight.flight_no.upper(), origin), (origin, flight))
+
+        def add(result: SearchResult, codes: Iterable[str], names: Iterable[str], code_keys=ascii_keys):
+            number = len(results)
+            results.append(result)
+            for code in codes:
+                code_keys.append((code.upper(), code.upper(), number, KIND_CODE))
+            for name in names:
+                compact = name.replace(" ", "")
+                for key, kind in _suffixes(compact):
+                    hangul_keys.append((choseong(key), key, number, kind))
+
+        for code in {**airport_names, **airport_flights}:
+            count = airport_flights.get(code, 0)
+            name, city = AIRPORT_NAMES.get(code, (airport_names.get(code, code), None))
+            names = [name] + ([city] if city else [])
+            add(SearchResult("airport", code, name, {"city": city}, count), [code], names)
+
+        for airline, info in airlines.items():
+            # 같은 항공사명에 여러 코드가 섞여 있으면 가장 많이 쓰인 코드를 대표 코드로
+            codes = sorted(info["codes"], key=lambda c: -info["codes"][c])
+            add(SearchResult("airline", codes[0] if codes else "", airline, {"codes": codes}, info["flights"]),
+                codes, [airline])
+
+        for (flight_no, _), (origin, flight) in flights.items():
+            add(SearchResult("flight", flight_no, flight_no, {
+                "airline": flight.airline,
+                "origin": origin,
+                "destination": flight.destination,
+                "departureTime": format_minutes(flight.departure),
+                "arrivalTime": format_minutes(flight.arrival)
+            }, 1), [flight_no], [], flight_keys)
+
+        self.results = results
+        self._ascii = _Keys(ascii_keys)
+        self._flights = _Keys(flight_keys)
+        self._hangul = _Keys(hangul_keys)
+
+    def __len__(self) -> int:
+        return len(self.results)
+
+    def search(self, query: str, limit: int = DEFAULT_LIMIT, types: Optional[Iterable[str]] = None) -> List[Dict]:
+        """순위순 결과 (같은 항목은 가장 높은 순위의 키로 한 번만)"""
+        query = query.strip().replace(" ", "")
+        if not query:
+            return []
+        allowed = set(types) if types else None
+
+        best: Dict[int, Tuple[int, bool]] = {}
+        if _is_hangul(query):
+            keys = self._hangul
+            # 초성 접두어로 후보를 찾고 (받침이 있어도 초성은 같음) 글자 단위로 확인
+            # (초성만 입력했으면 범위 전체가 일치)
+            initials = choseong(query)
+            only_initials = initials == query
+            for position in keys.prefix_range(initials):
+                original = keys.originals[position]
+                if only_initials or hangul_prefix_match(query, original):
+                    self._rank(best, keys.entries[position], original == query)
+        else:
+            keys = self._ascii
+            query = query.upper()
+            for position in keys.prefix_range(query):
+                self._rank(best, keys.entries[position], keys.originals[position] == query)
+            if allowed is None or "flight" in allowed:
+                # 정확히 일치하는 편명이 범위 맨 앞, 나머지는 편명순이므로 앞에서 limit개면 충분
+                flights = self._flights
+                for position in flights.prefix_range(query)[:limit]:
+                    self._rank(best, flights.entries[position], flights.originals[position] == query)
+
+        ranked = []
+        for number, (kind, exact) in best.items():
+            result = self.results[number]
+            if allowed is not None and result.type not in allowed:
+                continue
+            ranked.append((kind * 2 + (0 if exact else 1), -result.popularity, result.label, number))
+        ranked.sort()
+
+        return [
+            {"type": result.type, "code": result.code, "label": result.label, **result.detail}
+            for result in (self.results[item[3]] for item in ranked[:limit])
+        ]
+
+    @staticmethod
+    def _rank(best: Dict[int, Tuple[int, bool]], entry: Tuple[int, int], exact: bool):
+        number, kind = entry
+        current = best.get(number)
+        if current is None or (kind, not exact) < (current[0], not current[1]):
+            best[number] = (kind, exact)
@@ -1,11 +1,16 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
 from datetime import datetime
 import json
 import os
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from pathlib import Path
 
+from flight_db import FlightDB
+from data_source import FlightDataSource
+from response_cache import ResponseCache
+from schedule_query import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, index_page_response, wants_page
+
 app = FastAPI()
 
 # CORS 설정
@@ -17,9 +22,8 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# 전체 항공편 데이터 로드
-def load_flight_data():
-    """전체 항공편 데이터 로드"""
+def find_data_file() -> Optional[Path]:
+    """데이터 파일 위치 찾기"""
     # Try multiple locations
     possible_paths = [
         Path(__file__).parent / "korean_flight_schedules.json",
@@ -29,11 +33,19 @@ def load_flight_data():
     
     for data_file in possible_paths:
         if data_file.exists():
-            print(f"[API] Loading data from {data_file}")
-            with open(data_file, 'r', encoding='utf-8') as f:
-                loaded_data = json.load(f)
-                print(f"[API] Successfully loaded data for {len(loaded_data)} airports")
-                return loaded_data
+            return data_file
+    return None
+
+# 전체 항공편 데이터 로드
+def load_flight_data():
+    """전체 항공편 데이터 로드"""
+    data_file = find_data_file()
+    if data_file:
+        print(f"[API] Loading data from {data_file}")
+        with open(data_file, 'r', encoding='utf-8') as f:
+            loaded_data = json.load(f)
+            print(f"[API] Successfully loaded data for {len(loaded_data)} airports")
+            return loaded_data
     
     # 파일이 없으면 기본 데이터 반환
     return {
@@ -292,29 +304,66 @@ async def health():
         "timestamp": datetime.now().isoformat()
     }
 
-# 시작시 데이터 로드
-FLIGHT_DATA = load_flight_data()
-print(f"[API] Loaded data for {len(FLIGHT_DATA)} airports")
-for code, data in FLIGHT_DATA.items():
-    print(f"[API] {code}: {data.get('totalFlights', 0)} flights to {len(set(f['destination'] for f in data.get('flights', [])))} destinations")
+# 시작시 데이터를 SQLite로 가져와 인덱스로 조회 (이후 파일이 바뀌면 자동 반영)
+FLIGHT_DB = FlightDB(Path(os.getenv("FLIGHT_DB_PATH", str(Path(__file__).parent / "flights.db"))))
+RESPONSE_CACHE = ResponseCache()
+DATA_SOURCE = FlightDataSource(
+    find_data_file(), FLIGHT_DB,
+    on_reload=lambda snapshot: RESPONSE_CACHE.publish(snapshot.version)
+)
+if not DATA_SOURCE.reload():
+    # 파일이 없으면 기본 데이터
+    DATA_SOURCE.publish(load_flight_data())
+_index = DATA_SOURCE.snapshot.index
+print(f"[API] Loaded data for {len(_index.airports)} airports")
+for airport in _index.airports:
+    print(f"[API] {airport['code']}: {airport['totalFlights']} flights to {len(_index.destinations(airport['code']))} destinations")
+
+@app.on_event("startup")
+async def startup_event():
+    DATA_SOURCE.start()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    DATA_SOURCE.stop()
 
 @app.get("/api/schedule/{airport_code}")
-async def get_schedule(airport_code: str):
+async def get_schedule(
+    airport_code: str,
+    request: Request,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="페이지 크기"),
+    cursor: Optional[str] = Query(None, description="이전 응답의 nextCursor"),
+    fields: Optional[str] = Query(None, description="응답 필드 (쉼표 구분, 예: flightNo,destination,departureTime)"),
+    airline: Optional[str] = Query(None, description="항공사 (쉼표 구분)"),
+    destination: Optional[str] = Query(None, description="도착 공항 (쉼표 구분)"),
+    departure_from: Optional[str] = Query(None, alias="departureFrom", description="출발시간 HH:MM 이후"),
+    departure_to: Optional[str] = Query(None, alias="departureTo", description="출발시간 HH:MM 이전"),
+    weekday: Optional[str] = Query(None, description="운항 요일 (mon~sun)")
+):
+    """특정 공항의 항공편 스케줄 (조회 조건이 없으면 전체 문서, 있으면 필터/필드 선택/커서 페이지)"""
     airport_code = airport_code.upper()
-    if airport_code in FLIGHT_DATA:
-        return FLIGHT_DATA[airport_code]
-    else:
-        raise HTTPException(status_code=404, detail=f"Airport {airport_code} not found")
+    
+    if wants_page(request.query_params):
+        # 조회 조건이 있으면 메모리 색인에서 해당 페이지만 스트리밍
+        snapshot = DATA_SOURCE.snapshot
+        return index_page_response(
+            snapshot.index, snapshot.version, airport_code,
+            limit=limit, cursor=cursor, fields=fields, airline=airline, destination=destination,
+            departure_from=departure_from, departure_to=departure_to, weekday=weekday
+        )
+    
+    def build():
+        schedule = DATA_SOURCE.get_schedule(airport_code)
+        if schedule is not None:
+            return schedule
+        else:
+            raise HTTPException(status_code=404, detail=f"Airport {airport_code} not found")
+    
+    return RESPONSE_CACHE.respond(request, ("schedule", airport_code), build)
 
 @app.get("/api/airports")
 async def get_airports():
-    airports = []
-    for code, data in FLIGHT_DATA.items():
-        airports.append({
-            "code": code,
-            "name": data.get("airportName", code),
-            "totalFlights": data.get("totalFlights", 0)
-        })
+    airports = DATA_SOURCE.snapshot.index.airports
     
     return {
         "airports": airports,
@@ -326,17 +375,13 @@ async def get_destinations(airport_code: str):
     """특정 공항에서 갈 수 있는 모든 도착지 목록"""
     airport_code = airport_code.upper()
     
-    if airport_code not in FLIGHT_DATA:
+    destinations = DATA_SOURCE.snapshot.index.destinations(airport_code)
+    if destinations is None:
         raise HTTPException(status_code=404, detail=f"Airport {airport_code} not found")
     
-    destinations = set()
-    for flight in FLIGHT_DATA[airport_code].get('flights', []):
-        if flight.get('destination'):
-            destinations.add(flight['destination'])
-    
     return {
         "airport": airport_code,
-        "destinations": sorted(list(destinations)),
+        "destinations": list(destinations),
         "total": len(destinations)
     }
 
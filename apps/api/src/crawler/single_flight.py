@@ -0,0 +1,116 @@
+"""
+단일 실행 (single-flight) 작업 관리
+같은 키의 작업이 이미 실행 중이면 새로 시작하지 않고 진행 중인 작업을 함께 기다림
+- 캐시 미스로 크롤링이 필요한 요청이 몰려도 크롤링은 한 번만 실행
+- 수동 트리거는 실행 중인 같은 종류의 작업과 합쳐지고 작업 id/상태를 돌려줌
+- 끝난 작업은 최근 HISTORY_SIZE개까지 id로 조회 가능
+"""
+
+import asyncio
+import logging
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+logger = logging.getLogger(__name__)
+
+# 조회용으로 보관하는 끝난 작업 수
+HISTORY_SIZE = 100
+
+
+class Job:
+    """실행 중이거나 끝난 작업 1개"""
+
+    __slots__ = ("id", "key", "status", "started_at", "finished_at", "error", "waiters", "task")
+
+    def __init__(self, key: Hashable):
+        self.id = uuid.uuid4().hex[:12]
+        self.key = key
+        self.status = "running"
+        self.started_at = datetime.now()
+        self.finished_at: Optional[datetime] = None
+        self.error: Optional[str] = None
+        # 이 작업에 합쳐진 요청 수 (처음 시작한 요청 포함)
+        self.waiters = 1
+        self.task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self.status == "running"
+
+    def to_dict(self) -> Dict:
+        return {
+            "jobId": self.id,
+            "key": self.key if isinstance(self.key, str) else list(self.key),
+            "status": self.status,
+            "startedAt": self.started_at.isoformat(),
+            "finishedAt": self.finished_at.isoformat() if self.finished_at else None,
+            "error": self.error,
+            "waiters": self.waiters
+        }
+
+
+class SingleFlight:
+    def __init__(self):
+        self._running: Dict[Hashable, Job] = {}
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self.stats = {"started": 0, "joined": 0}
+
+    def start(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Job:
+        """key 작업을 시작 (이미 실행 중이면 그 작업을 반환)"""
+        job = self._running.get(key)
+        if job is not None:
+            job.waiters += 1
+            self.stats["joined"] += 1
+            return job
+
+        job = Job(key)
+        self._running[key] = job
+        self._remember(job)
+        self.stats["started"] += 1
+        job.task = asyncio.create_task(self._run(job, factory))
+        # 아무도 기다리지 않는 작업(수동 트리거)의 예외도 회수 (실패는 _run에서 기록)
+        job.task.add_done_callback(lambda task: task.cancelled() or task.exception())
+        return job
+
+    async def run(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """key 작업 결과를 기다림 (실행 중인 작업이 있으면 합류)"""
+        job = self.start(key, factory)
+        # 기다리던 요청이 끊겨도 공유 작업은 취소되지 않음
+        return await asyncio.shield(job.task)
+
+    async def _run(self, job: Job, factory: Callable[[], Awaitable[Any]]) -> Any:
+        try:
+            result = await factory()
+            job.status = "success"
+            return result
+        except asyncio.CancelledError:
+            job.status = "cancelled"
+            raise
+        except Exception as e:
+            job.status = "failed"
+            job.error = str(e)
+            logger.error(f"Job {job.key} ({job.id}) failed: {str(e)}")
+            raise
+        finally:
+            job.finished_at = datetime.now()
+            self._running.pop(job.key, None)
+
+    def _remember(self, job: Job):
+        self._jobs[job.id] = job
+        while len(self._jobs) > HISTORY_SIZE:
+            oldest_id, oldest = next(iter(self._jobs.items()))
+            if oldest.running:
+                break
+            del self._jobs[oldest_id]
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    def running(self, key: Hashable) -> Optional[Job]:
+        return self._running.get(key)
+
+    def jobs(self):
+        """최근 작업 목록 (최신순)"""
+        return [job.to_dict() for job in reversed(self._jobs.values())]
@@ -3,13 +3,60 @@
 """
 
 import json
-import csv
+import hashlib
+import os
 import shutil
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional
 
 from config import settings
+from columnar_archive import ColumnarArchive
+from flight_db import FlightDB
+
+
+# 실시간 현황에서 변경 비교 대상 목록
+LIVE_SECTIONS = ("departures", "arrivals")
+
+
+def normalize_flights(flights: List[Dict]) -> List[Dict]:
+    """비교용 정규화 (문자열 공백 제거, 편명/시간 순 정렬)"""
+    normalized = [
+        {k: v.strip() if isinstance(v, str) else v for k, v in flight.items()}
+        for flight in flights
+    ]
+    return sorted(normalized, key=lambda f: json.dumps(f, ensure_ascii=False, sort_keys=True))
+
+
+def content_hash(sections: Dict[str, List[Dict]]) -> str:
+    """정규화된 항공편 집합의 해시 (crawledAt 등 메타데이터 제외)"""
+    canonical = {name: normalize_flights(flights) for name, flights in sections.items()}
+    payload = json.dumps(canonical, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def _index_by_flight_no(flights: List[Dict]) -> Dict[str, Dict]:
+    """편명 기준 색인 (같은 편명이 여러 번 나오면 #2, #3 ... 으로 구분)"""
+    indexed = {}
+    for flight in normalize_flights(flights):
+        key = flight.get('flightNo', '')
+        n = 1
+        while (key if n == 1 else f"{key}#{n}") in indexed:
+            n += 1
+        indexed[key if n == 1 else f"{key}#{n}"] = flight
+    return indexed
+
+
+def diff_flights(previous: List[Dict], current: List[Dict]) -> Dict:
+    """편명 기준 추가/삭제/변경 항공편"""
+    before = _index_by_flight_no(previous)
+    after = _index_by_flight_no(current)
+
+    return {
+        "added": {k: v for k, v in after.items() if k not in before},
+        "removed": sorted(k for k in before if k not in after),
+        "modified": {k: v for k, v in after.items() if k in before and before[k] != v}
+    }
 
 
 class Storage:
@@ -17,56 +64,144 @@ class Storage:
         self.base_dir = Path(settings.OUTPUT_DIR)
         self.latest_dir = self.base_dir / "latest"
         self.archive_dir = self.base_dir / "archive"
+        self.state_path = self.latest_dir / "_state.json"
         
         # 디렉토리 생성
         self.latest_dir.mkdir(parents=True, exist_ok=True)
         self.archive_dir.mkdir(parents=True, exist_ok=True)
         
-    def save_schedule(self, airport_code: str, data: Dict):
-        """스케줄 데이터 저장"""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M")
+        # 컬럼 기반 압축 아카이브 (ARCHIVE_FORMAT=columnar 일 때만, 기본은 시각별 JSON 변경분 파일)
+        self.columnar = ColumnarArchive(self.archive_dir / "columns") if settings.ARCHIVE_FORMAT == "columnar" else None
+        
+        # API 조회용 SQLite 저장소
+        self.db = FlightDB(Path(settings.FLIGHT_DB_PATH))
+        
+        # 파일별 해시 / 마지막 확인 시각
+        self.state: Dict[str, Dict] = self.load_json(self.state_path) if self.state_path.exists() else {}
+        
+    def save_schedule(self, airport_code: str, data: Dict) -> bool:
+        """스케줄 데이터 저장 (변경이 없으면 확인 시각만 갱신, 변경 여부 반환)"""
+        return self._save_snapshot(
+            "schedule", airport_code, data,
+            {"flights": data.get("flights", [])}
+        )
+        
+    def save_live_status(self, airport_code: str, data: Dict) -> bool:
+        """실시간 현황 저장 (변경이 없으면 확인 시각만 갱신, 변경 여부 반환)"""
+        return self._save_snapshot(
+            "live", airport_code, data,
+            {section: data.get(section, []) for section in LIVE_SECTIONS}
+        )
+        
+    def _save_to_db(self, kind: str, airport_code: str, data: Dict):
+        if kind == "schedule":
+            self.db.replace_schedule(airport_code, data)
+        else:
+            self.db.replace_live_status(airport_code, data)
+        
+    def _db_has(self, kind: str, airport_code: str) -> bool:
+        if kind == "schedule":
+            return self.db.has_airport(airport_code)
+        return self.db.has_live_status(airport_code)
+        
+    def _save_snapshot(self, kind: str, airport_code: str, data: Dict,
+                       sections: Dict[str, List[Dict]]) -> bool:
+        """해시 비교 후 변경분만 아카이브에 기록하고 latest 갱신"""
+        name = f"{kind}_{airport_code}"
+        now = datetime.now()
+        new_hash = content_hash(sections)
+        latest_json = self.latest_dir / f"{name}.json"
+        
+        entry = self.state.get(name, {})
+        previous = self.load_json(latest_json) if latest_json.exists() else None
+        previous_hash = entry.get("hash")
+        if previous is not None and previous_hash is None:
+            previous_hash = content_hash({
+                section: previous.get(section, []) for section in sections
+            })
+        
+        if previous is not None and previous_hash == new_hash:
+            # 변경 없음: 확인 시각만 기록
+            entry.update({"hash": new_hash, "lastVerified": now.isoformat()})
+            self.state[name] = entry
+            self._save_state()
+            # DB가 새로 만들어진 경우에는 내용이 같아도 채워 넣음
+            if not self._db_has(kind, airport_code):
+                self._save_to_db(kind, airport_code, data)
+            return False
         
         # Archive에 저장
-        archive_subdir = self.archive_dir / timestamp
+        if self.columnar:
+            self.columnar.append(kind, airport_code, now, self._archive_rows(kind, sections))
+        else:
+            self._archive_delta(name, airport_code, data, sections, previous, previous_hash, new_hash, now)
+        
+        # API 조회용 DB 갱신 (한 트랜잭션으로 교체)
+        self._save_to_db(kind, airport_code, data)
+        
+        # Latest 갱신 (읽는 쪽이 중간 상태를 보지 않도록 교체 방식으로 기록)
+        # CSV 등 다운로드 파일은 미리 만들지 않고 요청 시 DB에서 생성 (export_stream.py)
+        self._write_atomic(latest_json, lambda path: self.save_json(path, data))
+        
+        self.state[name] = {
+            "hash": new_hash,
+            "lastChanged": now.isoformat(),
+            "lastVerified": now.isoformat()
+        }
+        self._save_state()
+        return True
+        
+    def _archive_rows(self, kind: str, sections: Dict[str, List[Dict]]) -> List[Dict]:
+        """아카이브용 행 목록 (실시간 현황은 출발/도착 구분을 section 컬럼으로)"""
+        if kind == "schedule":
+            return sections["flights"]
+        return [
+            {**flight, "section": section}
+            for section, flights in sections.items()
+            for flight in flights
+        ]
+        
+    def _archive_delta(self, name: str, airport_code: str, data: Dict, sections: Dict[str, List[Dict]],
+                       previous: Optional[Dict], previous_hash: Optional[str], new_hash: str, now: datetime):
+        """시각별 디렉토리에 JSON 저장 (이전 스냅샷이 있으면 변경분만)"""
+        archive_subdir = self.archive_dir / now.strftime("%Y%m%d_%H%M")
         archive_subdir.mkdir(exist_ok=True)
         
-        # JSON 저장
-        json_path = archive_subdir / f"schedule_{airport_code}.json"
-        self.save_json(json_path, data)
-        
-        # CSV 저장
-        csv_path = archive_subdir / f"schedule_{airport_code}.csv"
-        self.save_schedule_csv(csv_path, data)
-        
-        # Latest로 복사
-        latest_json = self.latest_dir / f"schedule_{airport_code}.json"
-        latest_csv = self.latest_dir / f"schedule_{airport_code}.csv"
-        
-        shutil.copy2(json_path, latest_json)
-        shutil.copy2(csv_path, latest_csv)
-        
-    def save_live_status(self, airport_code: str, data: Dict):
-        """실시간 현황 저장"""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M")
-        
-        # Archive에 저장
-        archive_subdir = self.archive_dir / timestamp
-        archive_subdir.mkdir(exist_ok=True)
-        
-        # JSON 저장
-        json_path = archive_subdir / f"live_{airport_code}.json"
-        self.save_json(json_path, data)
-        
-        # CSV 저장
-        csv_path = archive_subdir / f"live_{airport_code}.csv"
-        self.save_live_csv(csv_path, data)
-        
-        # Latest로 복사
-        latest_json = self.latest_dir / f"live_{airport_code}.json"
-        latest_csv = self.latest_dir / f"live_{airport_code}.csv"
-        
-        shutil.copy2(json_path, latest_json)
-        shutil.copy2(csv_path, latest_csv)
+        if previous is None:
+            self.save_json(archive_subdir / f"{name}.json", data)
+            return
+        
+        delta = {
+            "airport": airport_code,
+            "crawledAt": data.get("crawledAt"),
+            "baseHash": previous_hash,
+            "hash": new_hash
+        }
+        for section, flights in sections.items():
+            delta[section] = diff_flights(previous.get(section, []), flights)
+        self.save_json(archive_subdir / f"{name}.delta.json", delta)
+        
+    def query(self, airport_code: str, start: datetime, end: datetime,
+              columns: Optional[List[str]] = None, kind: str = "live") -> Iterator[Dict]:
+        """아카이브 기간 조회 (요청한 컬럼만 읽어 행 단위로 반환)
+        
+        변경이 있었던 크롤링만 기록되므로 각 배치는 다음 배치 전까지 유효한 스냅샷
+        """
+        if not self.columnar:
+            raise RuntimeError("Archive query requires ARCHIVE_FORMAT=columnar")
+        return self.columnar.query(kind, airport_code, start, end, columns)
+        
+    def get_state(self, kind: str, airport_code: str) -> Optional[Dict]:
+        """최신 파일의 해시 / 마지막 변경 / 마지막 확인 시각"""
+        return self.state.get(f"{kind}_{airport_code}")
+        
+    def _save_state(self):
+        self._write_atomic(self.state_path, lambda path: self.save_json(path, self.state))
+        
+    def _write_atomic(self, path: Path, write):
+        tmp_path = path.with_name(f".{path.name}.tmp")
+        write(tmp_path)
+        os.replace(tmp_path, path)
         
     def save_json(self, path: Path, data: Dict):
         """JSON 파일 저장"""
@@ -78,82 +213,8 @@ class Storage:
         with open(path, 'r', encoding='utf-8') as f:
             return json.load(f)
             
-    def save_schedule_csv(self, path: Path, data: Dict):
-        """스케줄 CSV 저장"""
-        with open(path, 'w', encoding='utf-8-sig', newline='') as f:
-            writer = csv.writer(f)
-            
-            # 헤더
-            writer.writerow([
-                '항공사', '편명', '도착지', '출발시간', '도착시간',
-                '월', '화', '수', '목', '금', '토', '일'
-            ])
-            
-            # 데이터
-            for flight in data.get('flights', []):
-                days = flight.get('days', {})
-                writer.writerow([
-                    flight.get('airline', ''),
-                    flight.get('flightNo', ''),
-                    flight.get('destination', ''),
-                    flight.get('departureTime', ''),
-                    flight.get('arrivalTime', ''),
-                    'O' if days.get('mon') else '',
-                    'O' if days.get('tue') else '',
-                    'O' if days.get('wed') else '',
-                    'O' if days.get('thu') else '',
-                    'O' if days.get('fri') else '',
-                    'O' if days.get('sat') else '',
-                    'O' if days.get('sun') else ''
-                ])
-                
-    def save_live_csv(self, path: Path, data: Dict):
-        """실시간 현황 CSV 저장"""
-        with open(path, 'w', encoding='utf-8-sig', newline='') as f:
-            writer = csv.writer(f)
-            
-            # 출발 데이터
-            writer.writerow(['=== 출발 ==='])
-            writer.writerow(['항공사', '편명', '도착지', '예정시간', '예상시간', '상태'])
-            
-            for flight in data.get('departures', []):
-                writer.writerow([
-                    flight.get('airline', ''),
-                    flight.get('flightNo', ''),
-                    flight.get('destination', ''),
-                    flight.get('scheduledTime', ''),
-                    flight.get('estimatedTime', ''),
-                    flight.get('status', '')
-                ])
-            
-            writer.writerow([])  # 빈 줄
-            
-            # 도착 데이터
-            writer.writerow(['=== 도착 ==='])
-            writer.writerow(['항공사', '편명', '출발지', '예정시간', '예상시간', '상태'])
-            
-            for flight in data.get('arrivals', []):
-                writer.writerow([
-                    flight.get('airline', ''),
-                    flight.get('flightNo', ''),
-                    flight.get('destination', ''),  # 도착 테이블에서는 출발지
-                    flight.get('scheduledTime', ''),
-                    flight.get('estimatedTime', ''),
-                    flight.get('status', '')
-                ])
-                
     def archive_excel(self, source_path: Path):
         """Excel 파일 아카이브"""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M")
         dest_path = self.archive_dir / f"항공기출도착_{timestamp}.xlsx"
         shutil.move(str(source_path), str(dest_path))
-        
-    def get_latest_schedule_path(self, airport_code: str, format: str) -> Optional[Path]:
-        """최신 스케줄 파일 경로"""
-        path = self.latest_dir / f"schedule_{airport_code}.{format}"
-        return path if path.exists() else None
-        
-    def get_latest_live_path(self, airport_code: str, format: str) -> Optional[Path]:
-        """최신 실시간 파일 경로"""
-        path = self.latest_dir / f"live_{airport_code}.{format}"
-        return path if path.exists() else None
\ No newline at end of file
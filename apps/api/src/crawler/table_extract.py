@@ -0,0 +1,147 @@
+"""
+테이블 일괄 추출
+셀마다 inner_text()를 호출하는 대신 page.evaluate 한 번으로 테이블 전체를 행 배열로 가져옴
+"""
+
+import re
+from typing import Dict, List, NamedTuple
+
+# 항공편 행 형식 검증 (편명 / HH:MM 시간)
+FLIGHT_NO_PATTERN = re.compile(r'^[A-Z0-9]{2}\d{1,4}[A-Z]?$')
+TIME_PATTERN = re.compile(r'^\d{1,2}:\d{2}')
+
+
+# 행 셀렉터에 매칭되는 모든 행의 td 텍스트를 2차원 배열로 반환
+EXTRACT_ROWS_JS = """
+(rows) => rows.map(row =>
+    Array.from(row.querySelectorAll('td')).map(cell =>
+        (cell.innerText || cell.textContent || '').trim()
+    )
+)
+"""
+
+
+class TableSpec(NamedTuple):
+    """테이블 컬럼 매핑 (필드명 -> 셀 인덱스)"""
+    columns: Dict[str, int]
+    min_cells: int
+
+
+# airplaneSchedule.do 스케줄 테이블
+SCHEDULE_TABLE = TableSpec(
+    columns={
+        "airline": 0,
+        "flightNo": 1,
+        "destination": 2,
+        "departureTime": 3,
+        "arrivalTime": 4,
+        "days": 5
+    },
+    min_cells=7
+)
+
+# RbHanFrmMain.jsp 항공기스케줄조회 테이블 (기종 컬럼 포함)
+AIRPORTAL_SCHEDULE_TABLE = TableSpec(
+    columns={
+        "airline": 0,
+        "flightNo": 1,
+        "destination": 2,
+        "departureTime": 3,
+        "arrivalTime": 4,
+        "aircraft": 5,
+        "days": 6
+    },
+    min_cells=7
+)
+
+# 컬럼 구성이 확실하지 않은 스케줄 테이블 (도착시간 이후는 선택)
+BASIC_SCHEDULE_TABLE = TableSpec(
+    columns={
+        "airline": 0,
+        "flightNo": 1,
+        "destination": 2,
+        "departureTime": 3,
+        "arrivalTime": 4
+    },
+    min_cells=4
+)
+
+# 실시간 출발 테이블
+LIVE_DEPARTURE_TABLE = TableSpec(
+    columns={
+        "airline": 0,
+        "flightNo": 1,
+        "destination": 2,
+        "scheduledTime": 3,
+        "estimatedTime": 4,
+        "status": 5
+    },
+    min_cells=6
+)
+
+# 실시간 도착 테이블 (destination 컬럼에 출발지가 들어감)
+LIVE_ARRIVAL_TABLE = TableSpec(
+    columns={
+        "airline": 0,
+        "flightNo": 1,
+        "destination": 2,
+        "scheduledTime": 3,
+        "estimatedTime": 4,
+        "status": 5
+    },
+    min_cells=6
+)
+
+
+async def extract_rows(page, row_selector: str) -> List[List[str]]:
+    """행 셀렉터에 매칭되는 테이블을 한 번의 왕복으로 추출 (Page/Frame 모두 지원)"""
+    return await page.eval_on_selector_all(row_selector, EXTRACT_ROWS_JS)
+
+
+def rows_to_records(rows: List[List[str]], spec: TableSpec) -> List[Dict[str, str]]:
+    """행 배열을 컬럼 매핑에 따라 dict 목록으로 변환 (셀 수가 부족한 행은 제외)"""
+    records = []
+
+    for row in rows:
+        if len(row) < spec.min_cells:
+            continue
+        records.append({
+            field: row[index].strip() if index < len(row) else ""
+            for field, index in spec.columns.items()
+        })
+
+    return records
+
+
+async def extract_records(page, row_selector: str, spec: TableSpec) -> List[Dict[str, str]]:
+    """테이블을 추출해 바로 레코드 목록으로 변환"""
+    rows = await extract_rows(page, row_selector)
+    return rows_to_records(rows, spec)
+
+
+# 요일 키 (비트 순서: mon=bit0 ... sun=bit6)
+DAY_KEYS = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+
+
+def parse_operating_days(days_text: str) -> Dict[str, bool]:
+    """운항 요일 문자열 파싱 (예: '월화수목금' -> mon~fri True)"""
+    day_map = {
+        "월": "mon", "화": "tue", "수": "wed", "목": "thu",
+        "금": "fri", "토": "sat", "일": "sun"
+    }
+
+    return {eng: kor in days_text for kor, eng in day_map.items()}
+
+
+def days_to_mask(days: Dict[str, bool]) -> int:
+    """요일 dict -> 7비트 마스크"""
+    mask = 0
+    for bit, key in enumerate(DAY_KEYS):
+        if days.get(key):
+            mask |= 1 << bit
+    return mask
+
+
+def mask_to_days(mask: int) -> Dict[str, bool]:
+    """7비트 마스크 -> 요일 dict"""
+    return {key: bool(mask & (1 << bit)) for bit, key in enumerate(DAY_KEYS)}
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+항공편 업스트림 라우터 점검 - ODcloud/KAC 가짜 업스트림(httpx.MockTransport)으로
+페이지 조회, KAC resultCode 오류 -> 502, 동시 요청 병합(업스트림 호출 1회)을 확인
+
+    python test_flight_upstream.py
+"""
+
+import asyncio
+import sys
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+import httpx
+from fastapi import FastAPI
+
+# routers 패키지는 src 디렉토리 기준으로 import
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from routers import flight  # noqa: E402
+from routers.flight_upstream import KAC_ROWS_PER_PAGE, OD_PER_PAGE, FlightUpstream  # noqa: E402
+
+OD_BASE = "http://odcloud.test/api"
+KAC_BASE = "http://kac.test/service"
+
+# 두 페이지에 걸친 스케줄 (GMP -> CJU 편은 마지막 페이지에만 있음)
+OD_RECORDS = [
+    {"항공사": "에어부산", "편명": f"BX{1000 + i}", "출발공항": "PUS", "도착공항": "CJU",
+     "출발시간": "0700", "도착시간": "0800", "운항요일": "월화수목금토일"}
+    for i in range(OD_PER_PAGE)
+] + [
+    {"항공사": "대한항공", "편명": f"KE{1201 + i}", "출발공항": "김포", "도착공항": "CJU",
+     "출발시간": f"{8 + i:02d}00", "도착시간": f"{9 + i:02d}10", "운항요일": "월화수목금토일"}
+    for i in range(5)
+]
+
+# 두 페이지에 걸친 KAC 운항 현황 (KE1201은 두 번째 페이지)
+KAC_ITEMS = [
+    {"airFln": f"LJ{300 + i}", "io": "O", "std": "0600", "etd": "0600", "rmkKor": "출발"}
+    for i in range(KAC_ROWS_PER_PAGE)
+] + [
+    {"airFln": "KE1201", "io": "O", "std": "0800", "etd": "0835", "rmkKor": "지연", "gate": "12"},
+    {"airFln": "KE1201", "io": "I", "std": "0910", "etd": "0945", "rmkKor": "도착"}
+]
+
+
+class FakeUpstream:
+    """ODcloud(JSON)/KAC(XML) 응답을 만드는 MockTransport 핸들러 (경로별 호출 수 기록)"""
+
+    def __init__(self, kac_result_code: str = "00", delay: float = 0.05):
+        self.kac_result_code = kac_result_code
+        self.delay = delay
+        self.calls = Counter()
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        # 동시 요청이 진행 중인 호출과 겹치도록 응답을 늦춤
+        await asyncio.sleep(self.delay)
+        params = request.url.params
+        if request.url.host == "odcloud.test":
+            page = int(params["page"])
+            per_page = int(params["perPage"])
+            self.calls[("odcloud", page)] += 1
+            data = OD_RECORDS[(page - 1) * per_page:page * per_page]
+            return httpx.Response(200, json={
+                "page": page, "perPage": per_page, "currentCount": len(data),
+                "totalCount": len(OD_RECORDS), "matchCount": len(OD_RECORDS), "data": data
+            })
+        if request.url.host == "kac.test":
+            page = int(params["pageNo"])
+            rows = int(params["numOfRows"])
+            self.calls[("kac", page)] += 1
+            return httpx.Response(200, text=self._kac_xml(page, rows),
+                                  headers={"Content-Type": "application/xml"})
+        return httpx.Response(404)
+
+    def _kac_xml(self, page: int, rows: int) -> str:
+        if self.kac_result_code != "00":
+            return (
+                "<response><header><resultCode>{0}</resultCode>"
+                "<resultMsg>SERVICE KEY IS NOT REGISTERED ERROR.</resultMsg></header></response>"
+            ).format(self.kac_result_code)
+        items = "".join(
+            "<item>" + "".join(f"<{k}>{escape(v)}</{k}>" for k, v in item.items()) + "</item>"
+            for item in KAC_ITEMS[(page - 1) * rows:page * rows]
+        )
+        return (
+            "<response><header><resultCode>00</resultCode><resultMsg>NORMAL SERVICE.</resultMsg></header>"
+            f"<body><items>{items}</items><numOfRows>{rows}</numOfRows><pageNo>{page}</pageNo>"
+            f"<totalCount>{len(KAC_ITEMS)}</totalCount></body></response>"
+        )
+
+
+def use_fake_upstream(fake: FakeUpstream) -> FlightUpstream:
+    """라우터의 공유 업스트림 클라이언트를 가짜 업스트림으로 교체"""
+    flight.UPSTREAM = FlightUpstream(
+        OD_BASE, KAC_BASE, "od-key", "kac-key", ttl=60,
+        transport=httpx.MockTransport(fake)
+    )
+    return flight.UPSTREAM
+
+
+def api_client() -> httpx.AsyncClient:
+    app = FastAPI()
+    app.include_router(flight.router)
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://api.test")
+
+
+async def check_pagination():
+    print("1. 페이지 조회...")
+    fake = FakeUpstream()
+    upstream = use_fake_upstream(fake)
+    try:
+        records = await upstream.odcloud_records(flight.UDDI_DOM_SCHED)
+        assert len(records) == len(OD_RECORDS), len(records)
+        items = await upstream.kac_items(flight.KAC_STATUS_PATH, {"schDate": "20261016"})
+        assert len(items) == len(KAC_ITEMS), len(items)
+        assert fake.calls == {("odcloud", 1): 1, ("odcloud", 2): 1, ("kac", 1): 1, ("kac", 2): 1}, fake.calls
+        print(f"   ODcloud {len(records)}건 / KAC {len(items)}건 (각 2페이지)")
+    finally:
+        await upstream.aclose()
+
+
+async def check_kac_errors():
+    print("2. KAC resultCode 오류...")
+    upstream = use_fake_upstream(FakeUpstream(kac_result_code="30"))
+    try:
+        async with api_client() as client:
+            response = await client.get("/flight/status/KE1201")
+            assert response.status_code == 502, response.status_code
+            print(f"   /flight/status -> {response.status_code} {response.json()['detail']}")
+
+            # 시간표는 운항 현황 없이 스케줄만 반환
+            response = await client.get("/flight/timetable", params={"dep": "GMP", "arr": "CJU"})
+            assert response.status_code == 200, response.status_code
+            assert len(response.json()) == 5 and all(f["status"] is None for f in response.json())
+            print(f"   /flight/timetable -> {response.status_code} (현황 없이 {len(response.json())}편)")
+    finally:
+        await upstream.aclose()
+
+
+async def check_coalescing():
+    print("3. 동시 요청 병합...")
+    fake = FakeUpstream()
+    upstream = use_fake_upstream(fake)
+    today = datetime.now().date().isoformat()
+    try:
+        async with api_client() as client:
+            responses = await asyncio.gather(*(
+                client.get("/flight/timetable", params={"dep": "GMP", "arr": "CJU", "date": today})
+                for _ in range(50)
+            ))
+        assert all(r.status_code == 200 for r in responses)
+        first = responses[0].json()
+        assert [f["flightNo"] for f in first] == [f"KE{1201 + i}" for i in range(5)]
+        assert first[0]["status"] == "지연"
+        assert all(r.json() == first for r in responses)
+        # 페이지마다 업스트림 호출은 한 번
+        assert fake.calls == {("odcloud", 1): 1, ("odcloud", 2): 1, ("kac", 1): 1, ("kac", 2): 1}, fake.calls
+        print(f"   시간표 50건 -> 업스트림 호출 {sum(fake.calls.values())}회 {dict(fake.calls)}")
+        print(f"   캐시 {upstream.cache.stats}")
+    finally:
+        await upstream.aclose()
+
+
+async def main():
+    print("=== 항공편 업스트림 점검 ===\n")
+    await check_pagination()
+    await check_kac_errors()
+    await check_coalescing()
+    print("\n모든 점검 통과")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+HTTP 직접 조회 크롤러 점검 - 저장해 둔 항공포털 페이지(fixtures/)를 로컬 스텁 서버로 응답
+
+    python test_http_fetcher.py            # 스텁 서버를 띄우고 fetch_schedule/fetch_live_status/validate_flights 점검
+    python test_http_fetcher.py --serve    # 스텁 서버만 실행 (AIRPORTAL_BASE_URL=http://127.0.0.1:8090 으로 크롤러 연결)
+"""
+
+import asyncio
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict
+
+from http_fetcher import LIVE_PATH, SCHEDULE_PATH, AirportalHttpFetcher, HttpFetchError, validate_flights
+
+FIXTURE_DIR = Path(__file__).parent / "fixtures"
+SCHEDULE_PAGE = (FIXTURE_DIR / "airplaneSchedule.html").read_bytes()
+LIVE_PAGE = (FIXTURE_DIR / "aircraftInfo.html").read_bytes()
+# 결과 테이블이 없는 페이지 (점검 안내 등)
+NOTICE_PAGE = "<html><body><p>서비스 점검 중입니다.</p></body></html>".encode("utf-8")
+
+SERVE_PORT = 8090
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    """조회 폼 요청에 server.pages의 페이지로 응답"""
+
+    def _respond(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+
+        body = self.server.pages.get(self.path.split("?", 1)[0])
+        if body is None:
+            self.send_error(404)
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=UTF-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = _respond
+    do_POST = _respond
+
+    def log_message(self, format, *args):
+        pass
+
+
+def stub_server(pages: Dict[str, bytes], port: int = 0) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", port), FixtureHandler)
+    server.pages = pages
+    return server
+
+
+async def with_stub(pages: Dict[str, bytes], check):
+    """스텁 서버를 띄우고 check(fetcher) 실행"""
+    server = stub_server(pages)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    fetcher = AirportalHttpFetcher(f"http://127.0.0.1:{server.server_address[1]}")
+    try:
+        await check(fetcher)
+    finally:
+        await fetcher.aclose()
+        server.shutdown()
+
+
+async def check_recorded_pages(fetcher: AirportalHttpFetcher):
+    print("1. 저장된 페이지 조회...")
+    schedule = await fetcher.fetch_schedule("PUS")
+    flights = schedule["flights"]
+    assert schedule["totalFlights"] == 5, schedule["totalFlights"]
+    assert flights[0]["flightNo"] == "KE 1101" and flights[0]["destination"] == "GMP"
+    assert flights[1]["days"] == {
+        "mon": True, "tue": False, "wed": True, "thu": False,
+        "fri": True, "sat": False, "sun": False
+    }
+    print(f"   스케줄 {len(flights)}편 (첫 편: {flights[0]['flightNo']} {flights[0]['departureTime']})")
+
+    live = await fetcher.fetch_live_status("PUS")
+    assert len(live["departures"]) == 2 and len(live["arrivals"]) == 1
+    assert live["departures"][1]["status"] == "지연"
+    print(f"   실시간 출발 {len(live['departures'])}편, 도착 {len(live['arrivals'])}편")
+
+
+async def expect_fetch_error(fetch):
+    try:
+        await fetch("PUS")
+    except HttpFetchError as e:
+        print(f"   {fetch.__name__}: {e}")
+    else:
+        raise AssertionError(f"{fetch.__name__} accepted an unexpected page")
+
+
+async def check_notice_pages(fetcher: AirportalHttpFetcher):
+    print("2. 결과 테이블이 없는 페이지...")
+    await expect_fetch_error(fetcher.fetch_schedule)
+    await expect_fetch_error(fetcher.fetch_live_status)
+
+
+async def check_swapped_pages(fetcher: AirportalHttpFetcher):
+    print("3. 다른 화면이 돌아온 경우...")
+    await expect_fetch_error(fetcher.fetch_schedule)
+    await expect_fetch_error(fetcher.fetch_live_status)
+
+
+def check_validate_flights():
+    print("4. validate_flights...")
+    assert validate_flights([
+        {"flightNo": "KE 1101", "departureTime": "07:00"},
+        {"flightNo": "7C2251", "departureTime": "9:05"}
+    ], "departureTime")
+    # 헤더 행이 데이터로 섞이거나 컬럼이 밀린 경우
+    assert not validate_flights([{"flightNo": "편명", "departureTime": "출발시간"}], "departureTime")
+    assert not validate_flights([{"flightNo": "KE1101", "departureTime": "GMP"}], "departureTime")
+    assert not validate_flights([{"flightNo": "KE1101"}], "departureTime")
+    print("   형식 검증 확인")
+
+
+async def main():
+    print("=== HTTP 크롤러 점검 ===\n")
+    await with_stub({SCHEDULE_PATH: SCHEDULE_PAGE, LIVE_PATH: LIVE_PAGE}, check_recorded_pages)
+    await with_stub({SCHEDULE_PATH: NOTICE_PAGE, LIVE_PATH: NOTICE_PAGE}, check_notice_pages)
+    await with_stub({SCHEDULE_PATH: LIVE_PAGE, LIVE_PATH: SCHEDULE_PAGE}, check_swapped_pages)
+    check_validate_flights()
+    print("\n모든 점검 통과")
+
+
+if __name__ == "__main__":
+    if "--serve" in sys.argv:
+        print(f"Serving fixtures on http://127.0.0.1:{SERVE_PORT}")
+        stub_server({SCHEDULE_PATH: SCHEDULE_PAGE, LIVE_PATH: LIVE_PAGE}, SERVE_PORT).serve_forever()
+    else:
+        asyncio.run(main())
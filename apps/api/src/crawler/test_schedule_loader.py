@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+스케줄 지연 로더 점검 - 최상위 스칼라 필드가 섞인 문서를 들여쓰기/압축 형식으로 써서
+scan_sections 구간이 json.load 결과와 같은지 확인
+"""
+
+import json
+import os
+import tempfile
+from pathlib import Path
+
+from schedule_loader import LazySchedules, scan_sections
+
+DATA_PATH = Path(__file__).parent / "korean_flight_schedules.json"
+
+
+def sample_document():
+    flight = {
+        "airline": "대한항공", "flightNo": "KE1101", "destination": "GMP",
+        "departureTime": "07:00", "arrivalTime": "08:05",
+        "days": {"mon": True, "tue": True, "wed": True, "thu": True, "fri": True, "sat": False, "sun": False}
+    }
+    return {
+        "version": 3,
+        "PUS": {"airport": "PUS", "crawledAt": "2026-10-16T06:00:00", "flights": [flight]},
+        "generatedBy": "crawler, \"daily\" {run}",
+        "complete": True,
+        "GMP": {"airport": "GMP", "crawledAt": "2026-10-16T06:00:00", "flights": []},
+        "note": None,
+        "airports": ["PUS", "GMP"],
+        "ratio": -1.5e-3
+    }
+
+
+def check_round_trip(name: str, document: dict, **dump_options):
+    with tempfile.NamedTemporaryFile('w', suffix='.json', encoding='utf-8', delete=False) as f:
+        json.dump(document, f, ensure_ascii=False, **dump_options)
+        path = Path(f.name)
+
+    try:
+        raw = path.read_bytes()
+        with open(path, 'rb') as f:
+            sections = scan_sections(f.fileno())
+
+        assert list(sections) == list(document), f"{name}: keys {list(sections)}"
+        for key, (start, end) in sections.items():
+            value = json.loads(raw[start:end])
+            assert value == document[key], f"{name}: {key} -> {raw[start:end][:60]!r}"
+
+        schedules = LazySchedules(path)
+        try:
+            assert set(schedules) == set(document)
+            if "PUS" in document and document["PUS"]["flights"]:
+                assert schedules["PUS"]["flights"][0].flight_no == document["PUS"]["flights"][0]["flightNo"]
+        finally:
+            schedules.close()
+        print(f"   {name}: {len(sections)}개 키 일치")
+    finally:
+        os.unlink(path)
+
+
+def main():
+    print("=== 스케줄 지연 로더 점검 ===\n")
+
+    print("1. 최상위 스칼라 필드가 섞인 문서...")
+    document = sample_document()
+    check_round_trip("indent=2", document, indent=2)
+    check_round_trip("압축", document, separators=(',', ':'))
+    check_round_trip("공백 구분", document)
+
+    if DATA_PATH.exists():
+        print("2. 저장된 스케줄 파일...")
+        with open(DATA_PATH, encoding='utf-8') as f:
+            data = json.load(f)
+        check_round_trip(DATA_PATH.name, data, separators=(',', ':'))
+
+    print("\n모든 점검 통과")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+노선 시간표 (운항일 필터 / 일자별 전개)
+노선 항공편의 운항 요일 마스크와 유효기간을 배열로 보관하고 날짜 조건을 비트 연산으로 한 번에 적용
+- 요일 마스크: bit0 = 월요일 (table_extract.DAY_KEYS 순서, date.weekday()와 같음), 요일 정보가 없으면 매일
+- 유효기간: validFrom/validTo의 date 서수 (없으면 무제한)
+- 요일별 운항 항공편 목록을 마스크 배열의 비트 연산으로 미리 나눠 두고 날짜마다 해당 요일 목록만 사용
+- 항공편은 출발시간 순으로 정렬해 두므로 일자별 전개 결과는 (날짜, 출발시간) 순
+- 출발시간 배열로 시간대 범위를, 필드값별 위치 목록(positions)으로 항공사/도착지 조건을 위치 범위로 바로 찾음
+"""
+
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from flight_record import Flight
+
+ALL_DAYS = 0x7F
+
+# 유효기간이 없는 항공편의 경계값 (date 서수는 1부터)
+OPEN_START = 0
+OPEN_END = date.max.toordinal()
+
+# 요청 1건에서 전개할 수 있는 최대 일수
+MAX_RANGE_DAYS = 366
+
+# HH:MM 형식이 아닌 출발시간의 정렬용 값 (하루의 어떤 분보다 큼)
+UNTIMED = 24 * 60
+
+
+class DatedFlight(NamedTuple):
+    """특정 날짜에 운항하는 항공편"""
+    date: date
+    flight: Flight
+
+    def to_dict(self) -> Dict:
+        return {"date": self.date.isoformat(), **self.flight.to_dict()}
+
+
+def _departure_order(flight: Flight) -> Tuple:
+    # HH:MM 형식이 아닌 출발시간은 뒤로
+    if type(flight.departure) is int:
+        return (0, flight.departure, flight.flight_no or "")
+    return (1, 0, flight.flight_no or "")
+
+
+class RouteTimetable:
+    """노선 1개의 항공편 운항일 배열 (만든 뒤에는 수정하지 않음)"""
+
+    __slots__ = ("flights", "masks", "departures", "valid_from", "valid_to", "by_weekday", "_dated",
+                 "_positions")
+
+    def __init__(self, flights: Iterable[Flight]):
+        self.flights: Tuple[Flight, ...] = tuple(sorted(flights, key=_departure_order))
+        self.masks = array("B", (
+            ALL_DAYS if f.days_mask is None else f.days_mask for f in self.flights
+        ))
+        self.departures = array("l", (
+            f.departure if type(f.departure) is int else UNTIMED for f in self.flights
+        ))
+        self.valid_from = array("q", (
+            OPEN_START if f.valid_from is None else f.valid_from for f in self.flights
+        ))
+        self.valid_to = array("q", (
+            OPEN_END if f.valid_to is None else f.valid_to for f in self.flights
+        ))
+        # 요일 -> 그 요일에 운항하는 항공편 위치 (출발시간 순)
+        self.by_weekday: Tuple[Tuple[int, ...], ...] = tuple(
+            tuple(i for i, mask in enumerate(self.masks) if mask & day_bit)
+            for day_bit in (1 << weekday for weekday in range(7))
+        )
+        # 유효기간이 있는 항공편이 하나도 없으면 요일만 보면 됨
+        self._dated = any(f.valid_from is not None or f.valid_to is not None for f in self.flights)
+        # 필드 -> 값 -> 위치 목록 (처음 조회할 때 생성)
+        self._positions: Dict[str, Dict[object, Tuple[int, ...]]] = {}
+
+    def __len__(self) -> int:
+        return len(self.flights)
+
+    def departure_range(self, start: Optional[int] = None, end: Optional[int] = None) -> range:
+        """출발시간이 start~end분 (양끝 포함)인 항공편 위치 범위 (지정하지 않은 쪽은 끝까지)"""
+        low = 0 if start is None else bisect_left(self.departures, start)
+        high = len(self.flights) if end is None else bisect_right(self.departures, end)
+        return range(low, max(low, high))
+
+    def positions(self, field: str) -> Dict[object, Tuple[int, ...]]:
+        """Flight 속성값 -> 항공편 위치 목록 (출발시간 순, 예: positions("airline")["대한항공"])"""
+        positions = self._positions.get(field)
+        if positions is None:
+            grouped: Dict[object, List[int]] = {}
+            for i, flight in enumerate(self.flights):
+                grouped.setdefault(getattr(flight, field), []).append(i)
+            positions = {value: tuple(indices) for value, indices in grouped.items()}
+            self._positions[field] = positions
+        return positions
+
+    def on(self, day: date) -> List[Flight]:
+        """해당 날짜 운항 항공편 (출발시간 순)"""
+        return [dated.flight for dated in self.expand(day, day)]
+
+    def expand(self, start: date, end: date) -> List[DatedFlight]:
+        """start~end (양끝 포함) 기간의 일자별 운항 항공편 ((날짜, 출발시간) 순)"""
+        if end < start or not self.flights:
+            return []
+        flights = self.flights
+        by_weekday = self.by_weekday
+        result = []
+        # 날짜 대신 서수로 순회 (end가 date.max여도 넘치지 않도록)
+        for ordinal in range(start.toordinal(), end.toordinal() + 1):
+            day = date.fromordinal(ordinal)
+            indices = by_weekday[day.weekday()]
+            if self._dated:
+                valid_from, valid_to = self.valid_from, self.valid_to
+                indices = [i for i in indices if valid_from[i] <= ordinal <= valid_to[i]]
+            result.extend([DatedFlight(day, flights[i]) for i in indices])
+        return result
@@ -0,0 +1,146 @@
+"""
+크롤러 대기 전략
+고정 sleep 대신 실제 조건(셀렉터 등장, 행 수 안정화, XHR 응답 완료)을 기다리고
+각 대기에 실제로 걸린 시간을 기록
+"""
+
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Optional
+
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class WaitStats:
+    """대기 종류별 소요 시간 기록"""
+
+    def __init__(self, max_samples: int = 500):
+        self.max_samples = max_samples
+        self._samples: Dict[str, List[float]] = {}
+        self._timeouts: Dict[str, int] = {}
+
+    def record(self, label: str, elapsed: float, timed_out: bool = False):
+        samples = self._samples.setdefault(label, [])
+        samples.append(elapsed)
+        if len(samples) > self.max_samples:
+            del samples[0]
+        if timed_out:
+            self._timeouts[label] = self._timeouts.get(label, 0) + 1
+
+    def summary(self) -> Dict[str, Dict]:
+        """대기 종류별 횟수/평균/최대 소요 시간 (초)"""
+        result = {}
+        for label, samples in self._samples.items():
+            result[label] = {
+                "count": len(samples),
+                "avg": round(sum(samples) / len(samples), 3),
+                "max": round(max(samples), 3),
+                "timeouts": self._timeouts.get(label, 0)
+            }
+        return result
+
+
+class WaitStrategy:
+    """조건 기반 대기 (모든 대기는 설정된 상한 시간 내에서만 수행)"""
+
+    def __init__(self, stats: Optional[WaitStats] = None):
+        self.stats = stats or WaitStats()
+        self.timeout = settings.WAIT_TIMEOUT_MS
+        self.poll_interval = settings.WAIT_POLL_MS / 1000
+        self.stable_checks = settings.WAIT_STABLE_CHECKS
+
+    @asynccontextmanager
+    async def _measure(self, label: str) -> AsyncIterator[None]:
+        started = time.monotonic()
+        timed_out = False
+        try:
+            yield
+        except (asyncio.TimeoutError, PlaywrightTimeoutError):
+            timed_out = True
+            raise
+        finally:
+            elapsed = time.monotonic() - started
+            self.stats.record(label, elapsed, timed_out)
+            logger.debug(f"Wait {label}: {elapsed:.3f}s{' (timeout)' if timed_out else ''}")
+
+    async def for_selector(self, page, selector: str, timeout: Optional[int] = None,
+                           state: str = 'attached', label: Optional[str] = None):
+        """셀렉터가 나타날 때까지 대기"""
+        async with self._measure(label or f"selector:{selector}"):
+            return await page.wait_for_selector(
+                selector, state=state, timeout=timeout or self.timeout
+            )
+
+    async def for_stable_rows(self, page, row_selector: str, timeout: Optional[int] = None,
+                              label: Optional[str] = None) -> int:
+        """행 수가 연속 stable_checks 번 같아질 때까지 대기 후 행 수 반환"""
+        ceiling = (timeout or self.timeout) / 1000
+        locator = page.locator(row_selector)
+
+        async with self._measure(label or f"rows:{row_selector}"):
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + ceiling
+            last_count = -1
+            stable = 0
+
+            while True:
+                count = await locator.count()
+                if count == last_count and count > 0:
+                    stable += 1
+                    if stable >= self.stable_checks:
+                        return count
+                else:
+                    stable = 0
+                last_count = count
+
+                if loop.time() >= deadline:
+                    logger.warning(f"Row count for {row_selector} did not settle, using {count}")
+                    return count
+                await asyncio.sleep(self.poll_interval)
+
+    async def for_results(self, page, trigger, row_selector: str,
+                          response_pattern: Optional[str] = None,
+                          timeout: Optional[int] = None) -> int:
+        """조회 트리거 실행 후 결과 응답과 결과 행이 준비될 때까지 대기
+
+        trigger: 조회를 실행하는 코루틴 함수 (예: 버튼 클릭)
+        response_pattern: 결과를 가져오는 요청 URL에 포함된 문자열
+        """
+        timeout = timeout or self.timeout
+
+        # 이전 조회 결과가 남아 있으면 교체될 때까지 기다려야 함
+        previous_row = await page.query_selector(row_selector)
+
+        if response_pattern and hasattr(page, 'expect_response'):
+            try:
+                async with self._measure(f"response:{response_pattern}"):
+                    async with page.expect_response(
+                        lambda response: response_pattern in response.url,
+                        timeout=timeout
+                    ):
+                        await trigger()
+            except PlaywrightTimeoutError:
+                logger.warning(f"No response matching {response_pattern} within {timeout}ms")
+        else:
+            await trigger()
+
+        if previous_row:
+            try:
+                async with self._measure("previous-rows-replaced"):
+                    await previous_row.wait_for_element_state('hidden', timeout=timeout)
+            except PlaywrightTimeoutError:
+                logger.warning(f"Previous rows for {row_selector} were not replaced")
+
+        try:
+            await self.for_selector(page, row_selector, timeout=timeout,
+                                    label=f"first-row:{row_selector}")
+        except PlaywrightTimeoutError:
+            # 결과 행이 없는 경우 (운항편 없음)
+            return 0
+
+        return await self.for_stable_rows(page, row_selector, timeout=timeout)
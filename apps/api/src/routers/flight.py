@@ -1,20 +1,50 @@
 import asyncio
-import xml.etree.ElementTree as ET
-from datetime import datetime, date
-from typing import List, Optional, Dict, Any
+import logging
+import os
+from datetime import datetime, date, timedelta
+from statistics import median
+from typing import List, Optional, Dict, Any, Tuple
 from fastapi import APIRouter, HTTPException, Query
-import httpx
 from pydantic import BaseModel
 
+from .flight_upstream import FlightUpstream, UpstreamError
+
+logger = logging.getLogger(__name__)
+
 # 테스트용 키 하드코딩 (prod 전 환경변수로 이동 필요)
-OD_API_KEY = "fbbYsG27DtQ4lJN8eeOAZrsZVrrAJLKEYwCg9OitJmmqBdtr7vnqJvzLLmsSr9aFGxD9RyRItLaaP+04Kz3V6A=="
-OD_BASE = "https://api.odcloud.kr/api"
+OD_API_KEY = os.getenv("OD_API_KEY", "fbbYsG27DtQ4lJN8eeOAZrsZVrrAJLKEYwCg9OitJmmqBdtr7vnqJvzLLmsSr9aFGxD9RyRItLaaP+04Kz3V6A==")
+KAC_API_KEY = os.getenv("KAC_API_KEY", OD_API_KEY)
+OD_BASE = os.getenv("OD_BASE_URL", "https://api.odcloud.kr/api")
 UDDI_DOM_ROUTE = "15002707/v1/uddi:36a1b1ac-597a-4db5-93cd-84ee87f14798"
 UDDI_DOM_SCHED = "15043890/v1/uddi:57dcf102-1447-49e9-bd2b-cfb32e869d5c"
-KAC_XML_BASE = "https://openapi.airport.co.kr/service"
+KAC_XML_BASE = os.getenv("KAC_BASE_URL", "https://openapi.airport.co.kr/service")
+KAC_STATUS_PATH = "rest/FlightStatusList/getFlightStatusList"
+
+# 캐시 유지 시간 (초): 스케줄은 하루 단위로 바뀌고 실시간 현황은 자주 바뀜
+SCHEDULE_TTL = float(os.getenv("FLIGHT_SCHEDULE_TTL", "3600"))
+STATUS_TTL = float(os.getenv("FLIGHT_STATUS_TTL", "60"))
+# 지난 날짜의 운항 현황은 바뀌지 않으므로 길게 보관
+HISTORY_TTL = float(os.getenv("FLIGHT_HISTORY_TTL", "21600"))
+
+# 평균 지연 계산에 쓰는 기간 (일) / 지연으로 보는 기준 (분)
+DELAY_WINDOW_DAYS = int(os.getenv("FLIGHT_DELAY_WINDOW_DAYS", "7"))
+DELAY_THRESHOLD = 15
+
+# 업스트림 공유 클라이언트 (커넥션 풀 / TTL 캐시 / 요청 병합)
+UPSTREAM = FlightUpstream(
+    OD_BASE, KAC_XML_BASE, OD_API_KEY, KAC_API_KEY,
+    ttl=SCHEDULE_TTL,
+    max_connections=int(os.getenv("FLIGHT_UPSTREAM_MAX_CONNECTIONS", "20")),
+    timeout=float(os.getenv("FLIGHT_UPSTREAM_TIMEOUT", "10"))
+)
 
 router = APIRouter(prefix="/flight", tags=["flight"])
 
+
+@router.on_event("shutdown")
+async def close_upstream():
+    await UPSTREAM.aclose()
+
 # Response models
 class Airport(BaseModel):
     code: str
@@ -68,6 +98,145 @@ KOREAN_AIRPORTS = [
     {"code": "PEK", "name": "베이징수도국제공항", "city": "베이징"}
 ]
 
+
+# ODcloud 국내선 스케줄 컬럼명 (데이터셋 버전마다 이름이 조금씩 달라 후보를 순서대로 확인)
+SCHEDULE_COLUMNS = {
+    "airline": ("항공사", "항공사명"),
+    "flightNo": ("편명", "운항편명", "항공편명"),
+    "departure": ("출발공항", "출발공항코드", "출발지"),
+    "arrival": ("도착공항", "도착공항코드", "도착지"),
+    "depTime": ("출발시간", "출발시각", "계획시간"),
+    "arrTime": ("도착시간", "도착시각"),
+    "days": ("운항요일", "요일"),
+    "validFrom": ("시작일자", "운항시작일", "유효시작일"),
+    "validTo": ("종료일자", "운항종료일", "유효종료일"),
+    "aircraft": ("기종",)
+}
+WEEKDAY_COLUMNS = ("월", "화", "수", "목", "금", "토", "일")
+
+
+def _column(record: Dict[str, Any], field: str) -> str:
+    for name in SCHEDULE_COLUMNS[field]:
+        value = record.get(name)
+        if value not in (None, ""):
+            return str(value).strip()
+    return ""
+
+
+def _airport_code(value: str) -> str:
+    """공항 코드 또는 공항/도시 이름 -> IATA 코드 (모르는 이름은 그대로)"""
+    value = value.strip()
+    if len(value) == 3 and value.isascii() and value.isalpha():
+        return value.upper()
+    for airport in KOREAN_AIRPORTS:
+        if value and (value in airport["name"] or value == airport["city"]):
+            return airport["code"]
+    return value
+
+
+def _hhmm(value: str) -> Optional[str]:
+    """"0730" / "07:30" / "730" -> "07:30" """
+    digits = value.replace(":", "")
+    if not digits.isdigit() or not 3 <= len(digits) <= 4:
+        return None
+    digits = digits.zfill(4)
+    return f"{digits[:2]}:{digits[2:]}"
+
+
+def _minutes(value: Optional[str]) -> Optional[int]:
+    if not value:
+        return None
+    return int(value[:2]) * 60 + int(value[3:])
+
+
+def _parse_date(value: str) -> Optional[date]:
+    digits = value.replace("-", "").replace(".", "")
+    try:
+        return datetime.strptime(digits, "%Y%m%d").date()
+    except ValueError:
+        return None
+
+
+def _weekday_mask(record: Dict[str, Any]) -> int:
+    """운항 요일 비트 마스크 (bit0 = 월요일, 요일 정보가 없으면 매일)"""
+    days_text = _column(record, "days")
+    if days_text:
+        return sum(1 << i for i, day in enumerate(WEEKDAY_COLUMNS) if day in days_text)
+    flags = [str(record.get(day, "")).strip().upper() for day in WEEKDAY_COLUMNS]
+    if any(flags):
+        return sum(1 << i for i, flag in enumerate(flags) if flag in ("Y", "O", "1", "TRUE", "운항"))
+    return 0x7F
+
+
+def _normalize_schedule(record: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    flight_no = _column(record, "flightNo").replace(" ", "").upper()
+    departure = _airport_code(_column(record, "departure"))
+    arrival = _airport_code(_column(record, "arrival"))
+    if not flight_no or not departure or not arrival:
+        return None
+    return {
+        "flightNo": flight_no,
+        "airline": _column(record, "airline") or flight_no[:2],
+        "departure": departure,
+        "arrival": arrival,
+        "depTime": _hhmm(_column(record, "depTime")),
+        "arrTime": _hhmm(_column(record, "arrTime")),
+        "mask": _weekday_mask(record),
+        "validFrom": _parse_date(_column(record, "validFrom")),
+        "validTo": _parse_date(_column(record, "validTo")),
+        "aircraft": _column(record, "aircraft") or None
+    }
+
+
+async def _load_schedules() -> Tuple[Dict[str, Any], ...]:
+    records = await UPSTREAM.odcloud_records(UDDI_DOM_SCHED)
+    schedules = (_normalize_schedule(record) for record in records)
+    return tuple(s for s in schedules if s is not None)
+
+
+async def domestic_schedules() -> Tuple[Dict[str, Any], ...]:
+    """ODcloud 국내선 스케줄 전체 (정규화 결과를 캐시, 동시 요청은 한 번만 조회)"""
+    try:
+        return await UPSTREAM.cache.get(("schedules", UDDI_DOM_SCHED), _load_schedules)
+    except UpstreamError as e:
+        logger.error(f"Schedule upstream failed: {str(e)}")
+        raise HTTPException(status_code=502, detail="Schedule upstream unavailable")
+
+
+async def flight_status_list(day: date, ttl: Optional[float] = None, **filters: str) -> List[Dict[str, str]]:
+    """KAC 운항 현황 목록 (schDate 기준, 같은 날짜/조건 요청은 병합)"""
+    params = {"schDate": day.strftime("%Y%m%d"), **filters}
+    return await UPSTREAM.cached_kac(KAC_STATUS_PATH, params, ttl=ttl)
+
+
+def _operates(schedule: Dict[str, Any], day: date) -> bool:
+    if not schedule["mask"] >> day.weekday() & 1:
+        return False
+    if schedule["validFrom"] and day < schedule["validFrom"]:
+        return False
+    return not schedule["validTo"] or day <= schedule["validTo"]
+
+
+def _status_delay(item: Dict[str, str]) -> Optional[int]:
+    """예정(std) 대비 변경(etd) 시각 차이 (분)"""
+    scheduled = _minutes(_hhmm(item.get("std", "")))
+    estimated = _minutes(_hhmm(item.get("etd", "")))
+    if scheduled is None or estimated is None:
+        return None
+    delay = estimated - scheduled
+    # 자정을 넘긴 경우 보정
+    if delay < -720:
+        delay += 1440
+    return delay
+
+
+def _duration(schedule: Dict[str, Any]) -> Optional[int]:
+    dep, arr = _minutes(schedule["depTime"]), _minutes(schedule["arrTime"])
+    if dep is None or arr is None:
+        return None
+    return (arr - dep) % 1440
+
+
 @router.get("/airports", response_model=List[Airport])
 async def get_airports():
     """한국 주요 공항 목록 반환"""
@@ -75,28 +244,34 @@ async def get_airports():
 
 @router.get("/routes", response_model=List[Route])
 async def get_routes(departure: str = Query(..., description="출발 공항 코드")):
-    """특정 공항에서 출발하는 노선 목록"""
-    # 임시 하드코딩 데이터
-    routes_data = {
-        "ICN": [
-            {"departure": "ICN", "arrival": "NRT", "airlines": ["KE", "OZ", "JL", "NH"], "duration": 150},
-            {"departure": "ICN", "arrival": "KIX", "airlines": ["KE", "OZ", "JL"], "duration": 120},
-            {"departure": "ICN", "arrival": "PEK", "airlines": ["KE", "OZ", "CA", "MU"], "duration": 140},
-            {"departure": "ICN", "arrival": "PUS", "airlines": ["KE", "OZ", "BX", "7C"], "duration": 60},
-            {"departure": "ICN", "arrival": "CJU", "airlines": ["KE", "OZ", "BX", "7C", "LJ"], "duration": 70},
-        ],
-        "GMP": [
-            {"departure": "GMP", "arrival": "CJU", "airlines": ["KE", "OZ", "7C"], "duration": 65},
-            {"departure": "GMP", "arrival": "PUS", "airlines": ["KE", "OZ", "BX"], "duration": 55},
-            {"departure": "GMP", "arrival": "KIX", "airlines": ["KE", "OZ"], "duration": 110},
-        ]
-    }
+    """특정 공항에서 출발하는 노선 목록 (ODcloud 국내선 스케줄 기준)"""
+    departure = _airport_code(departure)
     
-    routes = routes_data.get(departure.upper(), [])
-    if not routes:
+    airlines: Dict[str, List[str]] = {}
+    durations: Dict[str, List[int]] = {}
+    for schedule in await domestic_schedules():
+        if schedule["departure"] != departure:
+            continue
+        arrival = schedule["arrival"]
+        route_airlines = airlines.setdefault(arrival, [])
+        if schedule["airline"] not in route_airlines:
+            route_airlines.append(schedule["airline"])
+        duration = _duration(schedule)
+        if duration is not None:
+            durations.setdefault(arrival, []).append(duration)
+    
+    if not airlines:
         raise HTTPException(status_code=404, detail=f"No routes found for {departure}")
     
-    return [Route(**route) for route in routes]
+    return [
+        Route(
+            departure=departure,
+            arrival=arrival,
+            airlines=route_airlines,
+            duration=int(median(durations[arrival])) if durations.get(arrival) else 0
+        )
+        for arrival, route_airlines in sorted(airlines.items())
+    ]
 
 @router.get("/timetable", response_model=List[FlightSchedule])
 async def get_timetable(
@@ -104,67 +279,130 @@ async def get_timetable(
     arr: Optional[str] = Query(None, description="도착 공항"),
     date: Optional[str] = Query(None, description="날짜 YYYY-MM-DD")
 ):
-    """항공편 시간표 조회 (오늘 기준)"""
+    """항공편 시간표 조회 (기본 오늘, 운항 요일/유효기간 기준, KAC 운항 현황이 있으면 상태 포함)"""
     if not dep and not arr:
         raise HTTPException(status_code=400, detail="dep 또는 arr 중 하나는 필수")
     
     # 날짜 처리
-    target_date = datetime.now().strftime("%Y%m%d") if not date else date.replace("-", "")
+    target_date = datetime.now().date() if not date else _parse_date(date)
+    if target_date is None:
+        raise HTTPException(status_code=400, detail="date는 YYYY-MM-DD 형식")
+    dep = _airport_code(dep) if dep else None
+    arr = _airport_code(arr) if arr else None
     
-    # 임시 데이터 생성 (실제로는 ODcloud API 호출)
+    matched = sorted(
+        (
+            s for s in await domestic_schedules()
+            if (dep is None or s["departure"] == dep)
+            and (arr is None or s["arrival"] == arr)
+            and _operates(s, target_date)
+        ),
+        key=lambda s: (s["depTime"] or "99:99", s["flightNo"])
+    )
+    
+    # 운항 현황은 부가 정보 (조회 실패 시 시간표만 반환)
+    statuses: Dict[str, Dict[str, str]] = {}
+    if matched:
+        filters = {}
+        if dep:
+            filters["schDeptCityCode"] = dep
+        if arr:
+            filters["schArrvCityCode"] = arr
+        ttl = STATUS_TTL if target_date >= datetime.now().date() else HISTORY_TTL
+        try:
+            for item in await flight_status_list(target_date, ttl=ttl, **filters):
+                statuses.setdefault(item.get("airFln", "").upper(), item)
+        except UpstreamError as e:
+            logger.warning(f"Flight status upstream failed: {str(e)}")
+    
+    day_text = target_date.isoformat()
     schedules = []
-    base_time = datetime.now().replace(hour=6, minute=0, second=0, microsecond=0)
-    
-    airlines = ["KE", "OZ", "7C", "BX", "LJ", "JL", "NH", "CA", "MU"]
-    statuses = ["ON TIME", "DELAYED", "BOARDING", "DEPARTED", "ARRIVED"]
-    
-    for i in range(25):  # 25개 항공편 생성
-        dep_time = base_time.replace(hour=(6 + i) % 24)
-        arr_time = dep_time.replace(hour=(dep_time.hour + 2) % 24)
-        
-        flight = FlightSchedule(
-            flightNo=f"{airlines[i % len(airlines)]}{100 + i * 17}",
-            airline=airlines[i % len(airlines)],
-            departure=dep or "ICN",
-            arrival=arr or "NRT",
-            scheduledDep=dep_time.strftime("%Y-%m-%d %H:%M"),
-            scheduledArr=arr_time.strftime("%Y-%m-%d %H:%M"),
-            avgDelay=i % 5 * 5,  # 0, 5, 10, 15, 20분 지연
-            status=statuses[i % len(statuses)],
-            aircraft="B737" if i % 3 == 0 else "A320"
-        )
-        schedules.append(flight)
+    for s in matched:
+        status = statuses.get(s["flightNo"], {})
+        arrival_day = target_date
+        if s["depTime"] and s["arrTime"] and s["arrTime"] < s["depTime"]:
+            arrival_day += timedelta(days=1)
+        schedules.append(FlightSchedule(
+            flightNo=s["flightNo"],
+            airline=s["airline"],
+            departure=s["departure"],
+            arrival=s["arrival"],
+            scheduledDep=f"{day_text} {s['depTime']}" if s["depTime"] else day_text,
+            scheduledArr=f"{arrival_day.isoformat()} {s['arrTime']}" if s["arrTime"] else day_text,
+            status=status.get("rmkKor") or status.get("rmkEng") or None,
+            aircraft=s["aircraft"]
+        ))
     
     return schedules
 
 @router.get("/delay/{flight_no}")
 async def get_flight_delay(flight_no: str):
-    """특정 항공편의 평균 지연 시간"""
-    # 임시 데이터
-    delay_data = {
-        "flightNo": flight_no.upper(),
-        "avgDelay": 12,  # minutes
-        "delayRate": 0.23,  # 23%
-        "onTimeRate": 0.77,
-        "samples": 145,
+    """특정 항공편의 평균 지연 시간 (최근 DELAY_WINDOW_DAYS일 KAC 운항 현황 기준)"""
+    flight_no = flight_no.upper()
+    today = datetime.now().date()
+    days = [today - timedelta(days=offset) for offset in range(1, DELAY_WINDOW_DAYS + 1)]
+    
+    # 날짜별 목록은 캐시/병합되므로 다른 편명 요청과 업스트림 호출을 공유
+    results = await asyncio.gather(
+        *(flight_status_list(day, ttl=HISTORY_TTL) for day in days),
+        return_exceptions=True
+    )
+    delays = []
+    for result in results:
+        if isinstance(result, UpstreamError):
+            logger.warning(f"Flight status upstream failed: {str(result)}")
+            continue
+        if isinstance(result, BaseException):
+            raise result
+        for item in result:
+            if item.get("airFln", "").upper() == flight_no and item.get("io", "O") == "O":
+                delay = _status_delay(item)
+                if delay is not None:
+                    delays.append(max(delay, 0))
+    
+    if not delays and all(isinstance(result, BaseException) for result in results):
+        raise HTTPException(status_code=502, detail="Flight status upstream unavailable")
+    
+    delayed = sum(1 for delay in delays if delay >= DELAY_THRESHOLD)
+    return {
+        "flightNo": flight_no,
+        "avgDelay": round(sum(delays) / len(delays)) if delays else None,  # minutes
+        "delayRate": round(delayed / len(delays), 2) if delays else None,
+        "onTimeRate": round(1 - delayed / len(delays), 2) if delays else None,
+        "samples": len(delays),
         "lastUpdated": datetime.now().isoformat()
     }
-    return delay_data
 
 @router.get("/status/{flight_no}", response_model=FlightStatus)
 async def get_flight_status(flight_no: str):
-    """특정 항공편의 실시간 상태"""
-    # 임시 실시간 상태
-    now = datetime.now()
-    status_options = ["SCHEDULED", "BOARDING", "DEPARTED", "IN FLIGHT", "ARRIVED", "DELAYED", "CANCELLED"]
-    
-    status = FlightStatus(
-        flightNo=flight_no.upper(),
-        status=status_options[hash(flight_no) % len(status_options)],
-        actualDep=now.strftime("%Y-%m-%d %H:%M") if hash(flight_no) % 3 == 0 else None,
-        actualArr=(now.replace(hour=(now.hour + 2) % 24)).strftime("%Y-%m-%d %H:%M") if hash(flight_no) % 3 == 1 else None,
-        gate=f"G{(hash(flight_no) % 20) + 1}",
-        delay=hash(flight_no) % 30 if hash(flight_no) % 4 == 0 else None
-    )
+    """특정 항공편의 실시간 상태 (오늘 KAC 운항 현황, 출발/도착 공항 행을 합침)"""
+    flight_no = flight_no.upper()
+    today = datetime.now().date()
+    
+    try:
+        items = await flight_status_list(today, ttl=STATUS_TTL)
+    except UpstreamError as e:
+        logger.error(f"Flight status upstream failed: {str(e)}")
+        raise HTTPException(status_code=502, detail="Flight status upstream unavailable")
+    
+    rows = [item for item in items if item.get("airFln", "").upper() == flight_no]
+    if not rows:
+        raise HTTPException(status_code=404, detail=f"Flight {flight_no} not found for {today.isoformat()}")
     
-    return status
\ No newline at end of file
+    departure_row = next((row for row in rows if row.get("io") == "O"), None)
+    arrival_row = next((row for row in rows if row.get("io") == "I"), None)
+    latest = arrival_row or departure_row or rows[0]
+    
+    def actual(row: Optional[Dict[str, str]]) -> Optional[str]:
+        time_text = _hhmm(row.get("etd", "")) if row else None
+        return f"{today.isoformat()} {time_text}" if time_text else None
+    
+    delay = _status_delay(departure_row or rows[0])
+    return FlightStatus(
+        flightNo=flight_no,
+        status=latest.get("rmkKor") or latest.get("rmkEng") or "SCHEDULED",
+        actualDep=actual(departure_row),
+        actualArr=actual(arrival_row),
+        gate=(departure_row or rows[0]).get("gate") or None,
+        delay=delay if delay and delay > 0 else None
+    )
@@ -0,0 +1,201 @@
+"""
+ODcloud / 한국공항공사(KAC) 업스트림 클라이언트
+- httpx.AsyncClient 하나를 공유 (keep-alive, 커넥션 수 제한, h2 패키지가 있으면 HTTP/2)
+- ODcloud: 첫 페이지로 totalCount를 확인한 뒤 나머지 페이지를 동시에 조회
+- KAC: XML 응답을 스트리밍으로 받으며 <item> 단위로 파싱 (응답 전체를 메모리에 올리지 않음)
+- TTL 캐시 + 요청 병합: 같은 키를 동시에 요청하면 업스트림 호출은 한 번만 수행
+기본 주소/키는 환경변수로 바꿀 수 있어 로컬 가짜 업스트림 서버로 테스트 가능
+"""
+
+import asyncio
+import importlib.util
+import logging
+import time
+import xml.etree.ElementTree as ET
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# HTTP/2는 h2 패키지가 필요 (requirements.txt의 httpx[http2]로 설치, 없는 환경에서는 HTTP/1.1)
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# ODcloud 페이지 크기 (API 최대값)
+OD_PER_PAGE = 1000
+
+# KAC 페이지 크기
+KAC_ROWS_PER_PAGE = 500
+
+
+class UpstreamError(Exception):
+    """업스트림 API 호출 실패 (HTTP 오류, 결과 코드 오류, 응답 형식 오류)"""
+
+
+class TTLCache:
+    """만료 시간이 있는 비동기 캐시 (같은 키의 동시 요청은 진행 중인 호출 하나를 함께 기다림)"""
+
+    def __init__(self, ttl: float, max_entries: int = 1024):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self.stats = {"hits": 0, "misses": 0, "coalesced": 0}
+
+    async def get(self, key: Hashable, fetch: Callable[[], Awaitable[Any]], ttl: Optional[float] = None) -> Any:
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            self.stats["hits"] += 1
+            return entry[1]
+
+        task = self._inflight.get(key)
+        if task is None:
+            self.stats["misses"] += 1
+            task = asyncio.ensure_future(self._fill(key, fetch, self.ttl if ttl is None else ttl))
+            self._inflight[key] = task
+        else:
+            self.stats["coalesced"] += 1
+        # 기다리던 요청 하나가 취소되어도 공유 중인 호출은 계속 진행
+        return await asyncio.shield(task)
+
+    async def _fill(self, key: Hashable, fetch: Callable[[], Awaitable[Any]], ttl: float) -> Any:
+        try:
+            value = await fetch()
+            # 실패한 호출은 캐시하지 않음 (예외는 기다리던 요청 모두에 전달)
+            self._store(key, value, ttl)
+            return value
+        finally:
+            self._inflight.pop(key, None)
+
+    def _store(self, key: Hashable, value: Any, ttl: float):
+        now = time.monotonic()
+        if len(self._entries) >= self.max_entries:
+            self._entries = {k: e for k, e in self._entries.items() if e[0] > now}
+            while len(self._entries) >= self.max_entries:
+                # 가장 먼저 들어온 항목부터 제거
+                del self._entries[next(iter(self._entries))]
+        self._entries[key] = (now + ttl, value)
+
+    def clear(self):
+        self._entries = {}
+
+
+def _element_to_dict(element: ET.Element) -> Dict[str, str]:
+    return {child.tag: (child.text or "").strip() for child in element}
+
+
+class FlightUpstream:
+    def __init__(self, od_base: str, kac_base: str, od_key: str, kac_key: str,
+                 ttl: float = 600, max_connections: int = 20, timeout: float = 10.0,
+                 transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.od_base = od_base.rstrip("/")
+        self.kac_base = kac_base.rstrip("/")
+        self.od_key = od_key
+        self.kac_key = kac_key
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.transport = transport
+        self.cache = TTLCache(ttl)
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """공유 클라이언트 (처음 사용할 때 생성)"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                http2=HTTP2_AVAILABLE and self.transport is None,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                    keepalive_expiry=30
+                ),
+                timeout=self.timeout,
+                transport=self.transport
+            )
+        return self._client
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    # ODcloud
+
+    async def _od_page(self, path: str, page: int, params: Dict[str, Any]) -> Dict:
+        try:
+            response = await self.client.get(
+                f"{self.od_base}/{path}",
+                params={**params, "page": page, "perPage": OD_PER_PAGE, "serviceKey": self.od_key}
+            )
+            response.raise_for_status()
+            body = response.json()
+        except (httpx.HTTPError, ValueError) as e:
+            raise UpstreamError(f"ODcloud {path} page {page}: {str(e)}") from e
+        if not isinstance(body, dict) or not isinstance(body.get("data"), list):
+            raise UpstreamError(f"ODcloud {path} page {page}: unexpected response")
+        return body
+
+    async def odcloud_records(self, path: str, params: Optional[Dict[str, Any]] = None) -> List[Dict]:
+        """ODcloud 데이터셋 전체 레코드 (첫 페이지 이후는 동시 조회)"""
+        params = params or {}
+        first = await self._od_page(path, 1, params)
+        records = list(first["data"])
+
+        total = int(first.get("matchCount") or first.get("totalCount") or len(records))
+        pages = -(-total // OD_PER_PAGE)
+        if pages > 1:
+            rest = await asyncio.gather(*(self._od_page(path, page, params) for page in range(2, pages + 1)))
+            for body in rest:
+                records.extend(body["data"])
+        return records
+
+    async def cached_odcloud(self, path: str, params: Optional[Dict[str, Any]] = None) -> List[Dict]:
+        key = ("odcloud", path, tuple(sorted((params or {}).items())))
+        return await self.cache.get(key, lambda: self.odcloud_records(path, params))
+
+    # KAC (XML)
+
+    async def _kac_page(self, path: str, page: int, params: Dict[str, Any]) -> Tuple[List[Dict], int]:
+        """KAC XML 한 페이지를 스트리밍 파싱 (<item> 목록, totalCount)"""
+        parser = ET.XMLPullParser(events=("end",))
+        items: List[Dict] = []
+        total = 0
+        result_code = None
+        try:
+            async with self.client.stream(
+                "GET", f"{self.kac_base}/{path}",
+                params={**params, "pageNo": page, "numOfRows": KAC_ROWS_PER_PAGE, "serviceKey": self.kac_key}
+            ) as response:
+                response.raise_for_status()
+                async for chunk in response.aiter_bytes():
+                    parser.feed(chunk)
+                    for _, element in parser.read_events():
+                        if element.tag == "item":
+                            items.append(_element_to_dict(element))
+                            element.clear()
+                        elif element.tag == "totalCount":
+                            total = int(element.text or 0)
+                        elif element.tag == "resultCode":
+                            result_code = (element.text or "").strip()
+            parser.close()
+        except (httpx.HTTPError, ET.ParseError, ValueError) as e:
+            raise UpstreamError(f"KAC {path} page {page}: {str(e)}") from e
+        if result_code not in (None, "00"):
+            raise UpstreamError(f"KAC {path} page {page}: resultCode {result_code}")
+        return items, total
+
+    async def kac_items(self, path: str, params: Optional[Dict[str, Any]] = None) -> List[Dict]:
+        """KAC 목록 전체 (첫 페이지 이후는 동시 조회)"""
+        params = params or {}
+        items, total = await self._kac_page(path, 1, params)
+        pages = -(-total // KAC_ROWS_PER_PAGE)
+        if pages > 1:
+            rest = await asyncio.gather(*(self._kac_page(path, page, params) for page in range(2, pages + 1)))
+            for page_items, _ in rest:
+                items.extend(page_items)
+        return items
+
+    async def cached_kac(self, path: str, params: Optional[Dict[str, Any]] = None,
+                         ttl: Optional[float] = None) -> List[Dict]:
+        key = ("kac", path, tuple(sorted((params or {}).items())))
+        return await self.cache.get(key, lambda: self.kac_items(path, params), ttl=ttl)